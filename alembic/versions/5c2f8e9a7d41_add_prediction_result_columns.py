@@ -0,0 +1,188 @@
+"""Add prediction result, tuning, precompute, accuracy and sentiment tables
+
+Revision ID: 5c2f8e9a7d41
+Revises: 1ae3bd15b559
+Create Date: 2026-10-19 10:12:44.310581
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2f8e9a7d41'
+down_revision = '1ae3bd15b559'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return None
+    return [column['name'] for column in inspector.get_columns(table)]
+
+
+def _create_tables():
+    # Tables are created here for databases managed only by alembic; create_all
+    # may already have built them on others
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'prediction_results' not in tables:
+        op.create_table(
+            'prediction_results',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('request_key', sa.String(), nullable=True),
+            sa.Column('symbol', sa.String(), nullable=True),
+            sa.Column('model_used', sa.String(), nullable=True),
+            sa.Column('days_forecasted', sa.Integer(), nullable=True),
+            sa.Column('training_days', sa.Integer(), nullable=True),
+            sa.Column('feature_set', sa.String(), nullable=True),
+            sa.Column('last_bar_date', sa.Date(), nullable=True),
+            sa.Column('snapshot_hash', sa.String(), nullable=True),
+            sa.Column('result_json', sa.String(), nullable=True),
+            sa.Column('r2_score', sa.String(), nullable=True),
+            sa.Column('mae', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_prediction_results_id'), 'prediction_results', ['id'], unique=False)
+        op.create_index(op.f('ix_prediction_results_request_key'), 'prediction_results', ['request_key'], unique=True)
+        op.create_index(op.f('ix_prediction_results_symbol'), 'prediction_results', ['symbol'], unique=False)
+
+    if 'model_tuning' not in tables:
+        op.create_table(
+            'model_tuning',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('symbol', sa.String(), nullable=True),
+            sa.Column('model_name', sa.String(), nullable=True),
+            sa.Column('params_json', sa.String(), nullable=True),
+            sa.Column('score', sa.Float(), nullable=True),
+            sa.Column('feature_set', sa.String(), nullable=True),
+            sa.Column('candidates_evaluated', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('symbol', 'model_name', name='uq_model_tuning_symbol_model')
+        )
+        op.create_index(op.f('ix_model_tuning_id'), 'model_tuning', ['id'], unique=False)
+        op.create_index(op.f('ix_model_tuning_symbol'), 'model_tuning', ['symbol'], unique=False)
+
+    if 'precomputed_forecasts' not in tables:
+        op.create_table(
+            'precomputed_forecasts',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('symbol', sa.String(), nullable=True),
+            sa.Column('model_name', sa.String(), nullable=True),
+            sa.Column('days_forecast', sa.Integer(), nullable=True),
+            sa.Column('training_days', sa.Integer(), nullable=True),
+            sa.Column('feature_set', sa.String(), nullable=True),
+            sa.Column('last_bar_date', sa.Date(), nullable=True),
+            sa.Column('result_id', sa.Integer(), nullable=True),
+            sa.Column('computed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['result_id'], ['prediction_results.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint(
+                'symbol', 'model_name', 'days_forecast', 'training_days', 'feature_set',
+                name='uq_precomputed_forecast_request'
+            )
+        )
+        op.create_index(op.f('ix_precomputed_forecasts_id'), 'precomputed_forecasts', ['id'], unique=False)
+        op.create_index(op.f('ix_precomputed_forecasts_symbol'), 'precomputed_forecasts', ['symbol'], unique=False)
+        op.create_index('ix_precomputed_forecasts_computed_at', 'precomputed_forecasts', ['computed_at'], unique=False)
+
+    if 'forecast_accuracy' not in tables:
+        op.create_table(
+            'forecast_accuracy',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('symbol', sa.String(), nullable=True),
+            sa.Column('model_name', sa.String(), nullable=True),
+            sa.Column('predictions_evaluated', sa.Integer(), nullable=True),
+            sa.Column('points_evaluated', sa.Integer(), nullable=True),
+            sa.Column('sum_abs_error', sa.Float(), nullable=True),
+            sa.Column('sum_abs_pct_error', sa.Float(), nullable=True),
+            sa.Column('sum_sq_error', sa.Float(), nullable=True),
+            sa.Column('sum_error', sa.Float(), nullable=True),
+            sa.Column('interval_points', sa.Integer(), nullable=True),
+            sa.Column('interval_hits', sa.Integer(), nullable=True),
+            sa.Column('mae', sa.Float(), nullable=True),
+            sa.Column('mape', sa.Float(), nullable=True),
+            sa.Column('rmse', sa.Float(), nullable=True),
+            sa.Column('bias', sa.Float(), nullable=True),
+            sa.Column('interval_coverage', sa.Float(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('symbol', 'model_name', name='uq_forecast_accuracy_symbol_model')
+        )
+        op.create_index(op.f('ix_forecast_accuracy_id'), 'forecast_accuracy', ['id'], unique=False)
+        op.create_index(op.f('ix_forecast_accuracy_symbol'), 'forecast_accuracy', ['symbol'], unique=False)
+
+    if 'headline_sentiments' not in tables:
+        op.create_table(
+            'headline_sentiments',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('text_hash', sa.String(length=64), nullable=True),
+            sa.Column('scorer', sa.String(), nullable=True),
+            sa.Column('polarity', sa.Float(), nullable=True),
+            sa.Column('subjectivity', sa.Float(), nullable=True),
+            sa.Column('category', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('text_hash', 'scorer', name='uq_headline_sentiment_hash_scorer')
+        )
+        op.create_index(op.f('ix_headline_sentiments_id'), 'headline_sentiments', ['id'], unique=False)
+        op.create_index(op.f('ix_headline_sentiments_text_hash'), 'headline_sentiments', ['text_hash'], unique=False)
+
+
+def upgrade():
+    _create_tables()
+
+    # init-db.sh adds these columns before migrating and create_all builds new
+    # tables with them, so only add what is missing
+    history_columns = _columns('prediction_history')
+    if history_columns is not None:
+        if 'request_key' not in history_columns:
+            op.add_column('prediction_history', sa.Column('request_key', sa.String(), nullable=True))
+            op.create_index(op.f('ix_prediction_history_request_key'), 'prediction_history', ['request_key'], unique=False)
+        if 'result_id' not in history_columns:
+            op.add_column('prediction_history', sa.Column('result_id', sa.Integer(), nullable=True))
+            op.create_index(op.f('ix_prediction_history_result_id'), 'prediction_history', ['result_id'], unique=False)
+            # batch mode so sqlite rebuilds the table to add the constraint
+            with op.batch_alter_table('prediction_history') as batch_op:
+                batch_op.create_foreign_key('fk_prediction_history_result_id', 'prediction_results', ['result_id'], ['id'])
+        if 'snapshot_hash' not in history_columns:
+            op.add_column('prediction_history', sa.Column('snapshot_hash', sa.String(), nullable=True))
+            op.create_index(op.f('ix_prediction_history_snapshot_hash'), 'prediction_history', ['snapshot_hash'], unique=False)
+        if 'evaluated_at' not in history_columns:
+            op.add_column('prediction_history', sa.Column('evaluated_at', sa.DateTime(), nullable=True))
+            op.create_index(op.f('ix_prediction_history_evaluated_at'), 'prediction_history', ['evaluated_at'], unique=False)
+
+    result_columns = _columns('prediction_results')
+    if result_columns is not None and 'snapshot_hash' not in result_columns:
+        op.add_column('prediction_results', sa.Column('snapshot_hash', sa.String(), nullable=True))
+
+
+def downgrade():
+    history_columns = _columns('prediction_history') or []
+    if 'evaluated_at' in history_columns:
+        op.drop_index(op.f('ix_prediction_history_evaluated_at'), table_name='prediction_history')
+        with op.batch_alter_table('prediction_history') as batch_op:
+            batch_op.drop_column('evaluated_at')
+    if 'snapshot_hash' in history_columns:
+        op.drop_index(op.f('ix_prediction_history_snapshot_hash'), table_name='prediction_history')
+        with op.batch_alter_table('prediction_history') as batch_op:
+            batch_op.drop_column('snapshot_hash')
+    if 'result_id' in history_columns:
+        op.drop_index(op.f('ix_prediction_history_result_id'), table_name='prediction_history')
+        with op.batch_alter_table('prediction_history') as batch_op:
+            batch_op.drop_column('result_id')
+    if 'request_key' in history_columns:
+        op.drop_index(op.f('ix_prediction_history_request_key'), table_name='prediction_history')
+        with op.batch_alter_table('prediction_history') as batch_op:
+            batch_op.drop_column('request_key')
+
+    # precomputed_forecasts references prediction_results, so it goes first
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    for table in ('headline_sentiments', 'forecast_accuracy', 'precomputed_forecasts', 'model_tuning', 'prediction_results'):
+        if table in tables:
+            op.drop_table(table)
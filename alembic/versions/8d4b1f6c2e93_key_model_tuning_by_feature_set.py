@@ -0,0 +1,42 @@
+"""Key model tuning by feature set
+
+Revision ID: 8d4b1f6c2e93
+Revises: 5c2f8e9a7d41
+Create Date: 2026-10-19 14:02:17.904216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4b1f6c2e93'
+down_revision = '5c2f8e9a7d41'
+branch_labels = None
+depends_on = None
+
+
+def _unique_constraints(table):
+    return [constraint['name'] for constraint in sa.inspect(op.get_bind()).get_unique_constraints(table)]
+
+
+def upgrade():
+    op.execute("UPDATE model_tuning SET feature_set = 'close' WHERE feature_set IS NULL")
+    # create_all may already have built the table with the new key
+    if 'uq_model_tuning_symbol_model' in _unique_constraints('model_tuning'):
+        with op.batch_alter_table('model_tuning') as batch_op:
+            batch_op.drop_constraint('uq_model_tuning_symbol_model', type_='unique')
+            batch_op.create_unique_constraint(
+                'uq_model_tuning_symbol_model_features', ['symbol', 'model_name', 'feature_set']
+            )
+
+
+def downgrade():
+    # Only one tuned configuration per (symbol, model) fits the old key: keep the latest
+    op.execute(
+        "DELETE FROM model_tuning WHERE id NOT IN ("
+        "SELECT MAX(id) FROM model_tuning GROUP BY symbol, model_name)"
+    )
+    with op.batch_alter_table('model_tuning') as batch_op:
+        batch_op.drop_constraint('uq_model_tuning_symbol_model_features', type_='unique')
+        batch_op.create_unique_constraint('uq_model_tuning_symbol_model', ['symbol', 'model_name'])
@@ -0,0 +1,239 @@
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+
+# Optional encoders - fall back to gzip when the libraries are not installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Per route class settings. min_size is in bytes; levels are per encoding.
+# Routes are matched by path prefix (relative to API_V1_STR), first match wins.
+ROUTE_CLASSES = {
+    "auth": {"min_size": None, "levels": {}},  # tiny token payloads, never compressed
+    "bulk": {"min_size": 512, "levels": {"zstd": 6, "br": 5, "gzip": 6}},
+    "default": {"min_size": settings.COMPRESSION_MIN_SIZE, "levels": {"zstd": 3, "br": 4, "gzip": 5}},
+}
+
+ROUTE_PREFIXES = [
+    ("/auth", "auth"),
+    ("/health", "auth"),
+    ("/predictions", "bulk"),
+    ("/portfolio", "bulk"),
+    ("/news", "bulk"),
+    ("/sentiment", "bulk"),
+]
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+# Server-sent events must reach the client as each event is written
+STREAMING_TYPES = ("text/event-stream",)
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.finish()
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+def available_encoders() -> Dict:
+    """Return the encoders usable in this process, in server preference order"""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = _ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = _BrotliEncoder
+    encoders["gzip"] = _GzipEncoder
+    return encoders
+
+def route_class(path: str) -> str:
+    """Map a request path to its compression route class"""
+    if path.startswith(settings.API_V1_STR):
+        path = path[len(settings.API_V1_STR):]
+    for prefix, name in ROUTE_PREFIXES:
+        if path.startswith(prefix):
+            return name
+    return "default"
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {encoding: q}"""
+    accepted = {}
+    for part in header.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+def negotiate(header: str, levels: Dict[str, int]) -> Optional[str]:
+    """Pick the best encoding supported by both the client and the server"""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in available_encoders():
+        if name not in levels:
+            continue
+        q = accepted.get(name, wildcard)
+        # Ties keep server preference order (zstd > br > gzip)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+class CompressionMiddleware:
+    """
+    ASGI middleware negotiating zstd/br/gzip response compression with
+    per route class size thresholds and levels
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        accept = headers.get(b"accept-encoding", b"").decode("latin-1")
+        route = ROUTE_CLASSES[route_class(scope["path"])]
+        encoding = negotiate(accept, route["levels"]) if route["min_size"] is not None else None
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, route["levels"][encoding], route["min_size"])
+        await self.app(scope, receive, responder)
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, level: int, min_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.min_size = min_size
+        self.start_message = None
+        self.encoder = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_time = 0.0
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            response_headers = dict(message.get("headers") or [])
+            content_type = response_headers.get(b"content-type", b"").decode("latin-1")
+            if (
+                b"content-encoding" in response_headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or content_type.startswith(STREAMING_TYPES)
+            ):
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None and not more_body:
+            # Whole body in one message: compress only above the threshold
+            if len(body) < self.min_size:
+                metrics.increment("compression", "below_threshold")
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            compressed = self._compress(body, final=True)
+            await self.send(self._start_headers(len(compressed)))
+            await self.send({"type": "http.response.body", "body": compressed})
+            self._record()
+            return
+
+        if self.encoder is None:
+            # Streaming response: length is unknown, compress chunk by chunk
+            await self.send(self._start_headers(None))
+
+        compressed = self._compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+        if not more_body:
+            self._record()
+
+    def _compress(self, body: bytes, final: bool) -> bytes:
+        if self.encoder is None:
+            self.encoder = available_encoders()[self.encoding](self.level)
+        started = time.thread_time()
+        data = self.encoder.compress(body)
+        if final:
+            data += self.encoder.flush()
+        self.cpu_time += time.thread_time() - started
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+        return data
+
+    def _start_headers(self, content_length: Optional[int]):
+        headers: List[Tuple[bytes, bytes]] = [
+            (k, v) for k, v in self.start_message.get("headers", [])
+            if k.lower() != b"content-length"
+        ]
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        headers.append((b"vary", b"Accept-Encoding"))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+            headers.append((b"x-uncompressed-length", str(self.bytes_in).encode("latin-1")))
+            headers.append((b"server-timing", f"compress;dur={self.cpu_time * 1000:.3f}".encode("latin-1")))
+        return {**self.start_message, "headers": headers}
+
+    def _record(self):
+        metrics.increment("compression", f"{self.encoding}_responses")
+        metrics.increment("compression", f"{self.encoding}_bytes_in", self.bytes_in)
+        metrics.increment("compression", f"{self.encoding}_bytes_out", self.bytes_out)
+        metrics.observe("compression", f"{self.encoding}_cpu_seconds", self.cpu_time)
@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "StockPredictPro SaaS"
@@ -32,8 +32,73 @@ class Settings(BaseSettings):
     # Yahoo Finance API settings
     YF_API_RATE_LIMIT: int = 2000  # Requests per hour, adjust as needed
 
+    # Shared async HTTP client for news scraping (keep-alive pool, HTTP/2 when h2 is installed)
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "10"))  # seconds
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # seconds
+    HTTP_PER_HOST_LIMIT: int = int(os.getenv("HTTP_PER_HOST_LIMIT", "10"))  # concurrent requests per host
+    HTTP_RETRIES: int = int(os.getenv("HTTP_RETRIES", "2"))
+    HTTP_RETRY_BACKOFF: float = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))  # seconds, doubled per retry, jittered
+
+    # Symbols fetched at once by the news/sentiment batch endpoints (HTTP_PER_HOST_LIMIT still applies)
+    NEWS_BATCH_CONCURRENCY: int = int(os.getenv("NEWS_BATCH_CONCURRENCY", "10"))
+
+    # Headline sentiment scores kept in memory in front of the headline_sentiments table
+    SENTIMENT_MEMORY_ITEMS: int = int(os.getenv("SENTIMENT_MEMORY_ITEMS", "50000"))
+
     # Redis for caching and rate limiting
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+
+    # Response compression (zstd/br/gzip negotiated per request)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+
+    # Trained model cache (memory LRU + joblib artifacts on disk)
+    MODEL_CACHE_DIR: str = os.getenv("MODEL_CACHE_DIR", "./model_cache")
+    MODEL_CACHE_MEMORY_ITEMS: int = int(os.getenv("MODEL_CACHE_MEMORY_ITEMS", "64"))
+    MODEL_CACHE_MAX_DISK_MB: int = int(os.getenv("MODEL_CACHE_MAX_DISK_MB", "1024"))
+
+    # Content-addressed training bar snapshots recorded with each prediction
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "./snapshots")
+
+    # Global cross-symbol model served from MODEL_CACHE_DIR/global ("" = latest trained version)
+    GLOBAL_MODEL_VERSION: str = os.getenv("GLOBAL_MODEL_VERSION", "")
+
+    # Nightly precomputed forecasts for the most requested symbols (python -m app.precompute)
+    PRECOMPUTE_TOP_SYMBOLS: int = int(os.getenv("PRECOMPUTE_TOP_SYMBOLS", "50"))
+    PRECOMPUTE_LOOKBACK_DAYS: int = int(os.getenv("PRECOMPUTE_LOOKBACK_DAYS", "7"))
+    PRECOMPUTE_TRAINING_DAYS: int = int(os.getenv("PRECOMPUTE_TRAINING_DAYS", "100"))
+    PRECOMPUTE_HORIZONS: List[int] = []  # empty = every horizon a tier allows
+    PRECOMPUTE_WORKERS: int = int(os.getenv("PRECOMPUTE_WORKERS", "4"))
+    PRECOMPUTE_MAX_AGE_HOURS: float = float(os.getenv("PRECOMPUTE_MAX_AGE_HOURS", "24"))
+    PRECOMPUTE_AT: str = os.getenv("PRECOMPUTE_AT", "21:30")  # UTC, after the US close
+
+    # Background prediction jobs ("memory" or "redis" backend)
+    JOB_BACKEND: str = os.getenv("JOB_BACKEND", "memory")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))  # in-process workers started with the API
+    JOB_RESULT_TTL: int = int(os.getenv("JOB_RESULT_TTL", "86400"))  # seconds
+
+    # Import the deferred ML/data libraries and pre-fork the training pool in the background after startup
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+
+    # Process pool for CPU-bound model training (0 = train on the request thread)
+    TRAINING_POOL_WORKERS: int = int(os.getenv("TRAINING_POOL_WORKERS", str(os.cpu_count() or 1)))
+    TRAINING_CONCURRENCY: Dict[str, int] = {"free": 1, "basic": 2, "pro": 4, "enterprise": 8}  # per tier
+    TRAINING_MAX_QUEUE: int = int(os.getenv("TRAINING_MAX_QUEUE", "32"))  # waiting requests before 503
+    TRAINING_QUEUE_TIMEOUT: float = float(os.getenv("TRAINING_QUEUE_TIMEOUT", "30"))  # seconds
+
+    # CPU governance: threads per training run (n_jobs / XGBoost nthread) and process-wide BLAS cap
+    CPU_BUDGET: int = int(os.getenv("CPU_BUDGET", "0"))  # total training threads per node, 0 = cpu_count
+    TRAINING_THREAD_CAPS: Dict[str, int] = {"free": 1, "basic": 1, "pro": 2, "enterprise": 4}  # per tier
+    BLAS_THREADS: int = int(os.getenv("BLAS_THREADS", "1"))
+
+    # Bootstrap forecast intervals: resamples per forecast by tier, and threads evaluating them
+    INTERVAL_RESAMPLES: Dict[str, int] = {"free": 200, "basic": 500, "pro": 1000, "enterprise": 2000}
+    INTERVAL_WORKERS: int = int(os.getenv("INTERVAL_WORKERS", "4"))
+
+    # Walk-forward backtests
+    BACKTEST_MAX_SECONDS: float = float(os.getenv("BACKTEST_MAX_SECONDS", "120"))  # upper bound for time_budget
     
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=True)
 
@@ -0,0 +1,150 @@
+"""
+Deferred imports for heavy libraries.
+
+`lazy_import("sklearn.ensemble")` returns a stand-in that imports the module on
+first attribute access, so starting the API does not pay for scikit-learn,
+xgboost, ta, yfinance, TextBlob or joblib until a request needs them.
+`warmup()` imports every deferred module ahead of time; the API runs it in a
+background thread after startup when STARTUP_WARMUP is on.
+
+Report what the API import costs and what each deferred module adds with:
+
+    python -m app.core.lazy
+"""
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+from app.core import metrics
+
+_registry: Dict[str, "LazyModule"] = {}
+_registry_lock = threading.Lock()
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access. Looked-up
+    attributes are kept on the stand-in, so later accesses cost a dict lookup.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(self._name)
+            if self.__dict__["_module"] is None:
+                self.__dict__["_module"] = module
+                metrics.observe("lazy_import", self._name, time.perf_counter() - started)
+        return module
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._load(), attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __setattr__(self, attr: str, value) -> None:
+        setattr(self._load(), attr, value)
+        self.__dict__[attr] = value
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    """Stand-in for module `name`, imported the first time one of its attributes is used"""
+    with _registry_lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name)
+        return module
+
+def loaded(name: str) -> bool:
+    """Whether the deferred module `name` has been imported yet"""
+    module = _registry.get(name)
+    return module is not None and module.__dict__["_module"] is not None
+
+def warmup(names: Optional[List[str]] = None) -> Dict[str, float]:
+    """Import deferred modules now; returns seconds spent on each (0 if it was already loaded)"""
+    timings = {}
+    for name in names or sorted(_registry):
+        started = time.perf_counter()
+        try:
+            lazy_import(name)._load()
+        except ImportError:
+            metrics.increment("lazy_import", "warmup_errors")
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+def start_warmup(tasks: Optional[List[Callable[[], None]]] = None) -> threading.Thread:
+    """Run tasks, then import every deferred module, on a background thread"""
+    def run() -> None:
+        started = time.perf_counter()
+        for task in tasks or []:
+            try:
+                task()
+            except Exception:
+                metrics.increment("lazy_import", "warmup_errors")
+        warmup()
+        metrics.observe("lazy_import", "warmup_seconds", time.perf_counter() - started)
+
+    thread = threading.Thread(target=run, name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def _import_times(module: str) -> Dict[str, float]:
+    # Cumulative import seconds per top-level package, from a fresh interpreter
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"import {module} failed")
+
+    packages = defaultdict(float)
+    total = 0.0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        packages[name.strip().split(".")[0]] += int(self_us) / 1e6
+        if name.strip() == module:
+            total = int(cumulative_us) / 1e6
+    packages["__total__"] = total
+    return dict(packages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Report API import time and the cost of deferred modules")
+    parser.add_argument("--module", default="app.main", help="Module whose import is measured")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    args = parser.parse_args()
+
+    packages = _import_times(args.module)
+    total = packages.pop("__total__")
+    print(f"import {args.module}: {total:.2f}s")
+    print("Heaviest packages at import:")
+    for name, seconds in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<24} {seconds:.3f}s")
+
+    # Run as a script this file is __main__; the app registers with the imported module
+    registry = importlib.import_module("app.core.lazy")
+    importlib.import_module(args.module)
+    deferred = sorted(name for name in registry._registry if not registry.loaded(name))
+    print(f"Deferred until first use ({len(deferred)} modules, in warmup order, each after the ones above):")
+    for name, seconds in registry.warmup(deferred).items():
+        print(f"  {name:<24} {seconds:.3f}s")
+
+if __name__ == "__main__":
+    main()
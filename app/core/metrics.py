@@ -0,0 +1,38 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+# In-process metrics, grouped by subsystem (e.g. "compression", "model_cache")
+_lock = threading.Lock()
+_counters = defaultdict(lambda: defaultdict(float))
+_timers = defaultdict(dict)
+
+def increment(group: str, name: str, value: float = 1) -> None:
+    """Add value to a counter"""
+    with _lock:
+        _counters[group][name] += value
+
+def observe(group: str, name: str, value: float) -> None:
+    """Record a timing/size observation (count, total, max)"""
+    with _lock:
+        stats = _timers[group].get(name)
+        if stats is None:
+            stats = {"count": 0, "total": 0.0, "max": 0.0}
+            _timers[group][name] = stats
+        stats["count"] += 1
+        stats["total"] += value
+        stats["max"] = max(stats["max"], value)
+
+def snapshot() -> Dict:
+    """Return a copy of all metrics for this process"""
+    with _lock:
+        result = {}
+        for group, counters in _counters.items():
+            result.setdefault(group, {}).update(dict(counters))
+        for group, timers in _timers.items():
+            for name, stats in timers.items():
+                result.setdefault(group, {})[name] = {
+                    **stats,
+                    "avg": stats["total"] / stats["count"] if stats["count"] else 0.0
+                }
+        return result
@@ -4,9 +4,12 @@ import os
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core import lazy
 from app.db.database import engine, Base, get_db
 from app.routers import auth, users, predictions, payments, news, sentiment, alerts, portfolio, health
 from app.models.user import User
+from app.services import governor, http_client, jobs, lexicon_sentiment, training_pool
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -26,6 +29,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (indicator series, portfolios, predictions)
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"])
 app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
@@ -44,7 +50,22 @@ Base.metadata.create_all(bind=engine)
 # Simplified startup event
 @app.on_event("startup")
 async def startup_event():
-    pass
+    # Cap BLAS/OpenMP threads so concurrent requests do not oversubscribe the CPU
+    governor.apply_process_limits()
+    # Pre-fork the training pool, compile the sentiment lexicon and import sklearn/xgboost/yfinance
+    # off the startup path, so the API answers immediately; otherwise each happens on first use
+    if settings.STARTUP_WARMUP:
+        lazy.start_warmup([training_pool.start, lexicon_sentiment.get_lexicon])
+    # Pooled keep-alive HTTP client for news scraping
+    await http_client.start()
+    # Run prediction jobs in-process unless dedicated workers are deployed (JOB_WORKERS=0)
+    jobs.start_workers(settings.JOB_WORKERS)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    jobs.stop_workers()
+    training_pool.shutdown()
+    await http_client.close()
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from datetime import datetime
+
+from app.db.database import Base
+
+class ForecastAccuracy(Base):
+    """
+    Realized error of matured forecasts per (symbol, model), accumulated
+    incrementally by the accuracy tracker. Sums are kept so new forecasts can
+    be folded in without rescanning history.
+    """
+    __tablename__ = "forecast_accuracy"
+    __table_args__ = (UniqueConstraint("symbol", "model_name", name="uq_forecast_accuracy_symbol_model"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, index=True)
+    model_name = Column(String)
+    predictions_evaluated = Column(Integer, default=0)  # matured forecasts folded in
+    points_evaluated = Column(Integer, default=0)  # forecast days with a realized close
+    sum_abs_error = Column(Float, default=0.0)
+    sum_abs_pct_error = Column(Float, default=0.0)
+    sum_sq_error = Column(Float, default=0.0)
+    sum_error = Column(Float, default=0.0)
+    interval_points = Column(Integer, default=0)  # points that carried an 80% interval
+    interval_hits = Column(Integer, default=0)  # of those, realized close inside it
+    mae = Column(Float, nullable=True)
+    mape = Column(Float, nullable=True)
+    rmse = Column(Float, nullable=True)
+    bias = Column(Float, nullable=True)  # mean forecast - realized
+    interval_coverage = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.db.database import Base
+
+class PrecomputedForecast(Base):
+    """
+    Forecast computed ahead of time by the nightly precompute worker for a
+    popular symbol; points at the shared PredictionResult it produced.
+    """
+    __tablename__ = "precomputed_forecasts"
+    __table_args__ = (
+        UniqueConstraint(
+            "symbol", "model_name", "days_forecast", "training_days", "feature_set",
+            name="uq_precomputed_forecast_request"
+        ),
+        Index("ix_precomputed_forecasts_computed_at", "computed_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, index=True)
+    model_name = Column(String)
+    days_forecast = Column(Integer)
+    training_days = Column(Integer)
+    feature_set = Column(String, default="close")
+    last_bar_date = Column(Date)
+    result_id = Column(Integer, ForeignKey("prediction_results.id"))
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    result = relationship("PredictionResult", lazy="joined")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from datetime import datetime
+
+from app.db.database import Base
+
+class HeadlineSentiment(Base):
+    """
+    Sentiment of one headline text, keyed by the SHA-256 of the text and the
+    scorer that produced it. Headlines repeat across market and symbol feeds,
+    so each distinct text is scored once and reused from here.
+    """
+    __tablename__ = "headline_sentiments"
+    __table_args__ = (UniqueConstraint("text_hash", "scorer", name="uq_headline_sentiment_hash_scorer"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    text_hash = Column(String(64), index=True)
+    scorer = Column(String)
+    polarity = Column(Float)
+    subjectivity = Column(Float)
+    category = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from datetime import datetime
+
+from app.db.database import Base
+
+class ModelTuning(Base):
+    """
+    Best hyperparameters found for a (symbol, model, feature set) by the tuning subsystem.
+    """
+    __tablename__ = "model_tuning"
+    __table_args__ = (
+        UniqueConstraint("symbol", "model_name", "feature_set", name="uq_model_tuning_symbol_model_features"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, index=True)
+    model_name = Column(String)
+    params_json = Column(String)  # JSON encoded constructor kwargs
+    score = Column(Float)  # mean time-series CV MAE of the best candidate
+    feature_set = Column(String, default="close")
+    candidates_evaluated = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Date, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -68,12 +68,51 @@ class PredictionHistory(Base):
     model_used = Column(String)
     days_forecasted = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
-    result_json = Column(String)  # JSON string containing prediction results
+    own_result_json = Column("result_json", String, nullable=True)  # JSON string containing prediction results
     r2_score = Column(String, nullable=True)
     mae = Column(String, nullable=True)
+    request_key = Column(String, index=True, nullable=True)  # identity of the request, for idempotent retries
+    result_id = Column(Integer, ForeignKey("prediction_results.id"), nullable=True, index=True)
+    snapshot_hash = Column(String, nullable=True, index=True)  # content hash of the training bars
+    evaluated_at = Column(DateTime, nullable=True, index=True)  # folded into forecast_accuracy
     
     # Many-to-one relationship with User model
     user = relationship("User", back_populates="prediction_history")
+    
+    # Shared result this row points to instead of storing its own copy
+    result = relationship("PredictionResult", lazy="joined")
+    
+    @property
+    def result_json(self):
+        if self.own_result_json is None and self.result is not None:
+            return self.result.result_json
+        return self.own_result_json
+    
+    @result_json.setter
+    def result_json(self, value):
+        self.own_result_json = value
+
+
+class PredictionResult(Base):
+    """
+    Computed prediction shared by every user who makes the same request on the
+    same market data; PredictionHistory rows reference it instead of copying it.
+    """
+    __tablename__ = "prediction_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    request_key = Column(String, unique=True, index=True)
+    symbol = Column(String, index=True)
+    model_used = Column(String)
+    days_forecasted = Column(Integer)
+    training_days = Column(Integer)
+    feature_set = Column(String, default="close")
+    last_bar_date = Column(Date)
+    snapshot_hash = Column(String, nullable=True)
+    result_json = Column(String)
+    r2_score = Column(String, nullable=True)
+    mae = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 
 class UserSubscription(Base):
@@ -0,0 +1,81 @@
+"""
+Nightly forecast precompute worker.
+
+Folds newly matured forecasts into the realized accuracy table, then ranks
+symbols by recent prediction requests and trains every model/horizon
+combination the subscription tiers allow, storing the results so the
+predict endpoint can serve them without training. Run once (e.g. from cron)
+with `python -m app.precompute`, or keep it running with `--daily` to run
+every day at PRECOMPUTE_AT (UTC).
+"""
+import argparse
+import json
+import signal
+import threading
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services import accuracy, governor, model_registry, precompute, training_pool
+
+def run_once(args) -> None:
+    symbols = [symbol.upper() for symbol in args.symbols or []]
+    db = SessionLocal()
+    try:
+        # Score forecasts that matured since the last run before making new ones
+        print(f"Realized accuracy update: {accuracy.update(db)}")
+        if not symbols:
+            symbols = precompute.popular_symbols(db, args.lookback_days, args.top)
+    finally:
+        db.close()
+    if not symbols:
+        print("No prediction requests in the lookback window, nothing to precompute")
+        return
+
+    print(f"Precomputing forecasts for {len(symbols)} symbol(s): {', '.join(symbols)}")
+    summary = precompute.run(symbols, model_registry.TIER_LIMITS, model_registry.trainable_models(), workers=args.workers)
+    print(json.dumps(summary, indent=2))
+
+def seconds_until(at: str) -> float:
+    """Seconds from now until the next HH:MM (UTC)"""
+    hour, minute = (int(part) for part in at.split(":"))
+    now = datetime.utcnow()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute forecasts for the most requested symbols")
+    parser.add_argument("--symbols", nargs="*", help="Symbols to precompute instead of the most requested ones")
+    parser.add_argument("--top", type=int, default=settings.PRECOMPUTE_TOP_SYMBOLS,
+                        help="Number of most requested symbols")
+    parser.add_argument("--lookback-days", type=int, default=settings.PRECOMPUTE_LOOKBACK_DAYS,
+                        help="Days of prediction history used to rank symbols")
+    parser.add_argument("--workers", type=int, default=settings.PRECOMPUTE_WORKERS,
+                        help="Symbols processed in parallel")
+    parser.add_argument("--daily", action="store_true",
+                        help=f"Keep running and precompute every day at PRECOMPUTE_AT ({settings.PRECOMPUTE_AT} UTC)")
+    args = parser.parse_args()
+
+    governor.apply_process_limits()
+    training_pool.start()
+    try:
+        if not args.daily:
+            run_once(args)
+            return
+
+        stopped = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+        signal.signal(signal.SIGINT, lambda *_: stopped.set())
+        while True:
+            wait = seconds_until(settings.PRECOMPUTE_AT)
+            print(f"Next precompute run in {wait / 3600:.1f} hours")
+            if stopped.wait(wait):
+                break
+            run_once(args)
+    finally:
+        training_pool.shutdown()
+
+if __name__ == "__main__":
+    main()
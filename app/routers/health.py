@@ -3,6 +3,8 @@ from datetime import datetime
 import psutil
 import os
 
+from app.core import metrics
+
 router = APIRouter()
 
 @router.get("")
@@ -20,3 +22,14 @@ async def health_check():
             "memory_usage": psutil.virtual_memory().percent
         }
     }
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    In-process performance metrics (compression ratios, CPU time, ...)
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "pid": os.getpid(),
+        "metrics": metrics.snapshot()
+    }
@@ -1,13 +1,15 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-import requests
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
 from bs4 import BeautifulSoup
+import asyncio
 import json
 from datetime import datetime, timedelta
 
 from app.auth.jwt import get_current_active_user
 from app.models.user import User
 from app.core.config import settings
+from app.services import http_client
 
 router = APIRouter()
 
@@ -15,6 +17,83 @@ router = APIRouter()
 news_cache = {}
 cache_time = {}
 
+# Largest watchlist a batch request may cover
+MAX_BATCH_SYMBOLS = 50
+
+class NewsBatchRequest(BaseModel):
+    symbols: List[str]
+    limit: int = Field(10, ge=1, le=50)
+
+class SymbolBatchResult(BaseModel):
+    symbol: str
+    status: str  # ok, error
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+async def run_symbol_batch(symbols: List[str], fetch: Callable[[str], Awaitable[Dict]]) -> List[SymbolBatchResult]:
+    """
+    Run fetch for every distinct symbol, at most NEWS_BATCH_CONCURRENCY at a time.
+    A failing symbol is reported with its error and does not fail the batch.
+    """
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SYMBOLS} symbols per batch")
+    
+    slots = asyncio.Semaphore(settings.NEWS_BATCH_CONCURRENCY)
+    
+    async def run(symbol: str) -> SymbolBatchResult:
+        async with slots:
+            try:
+                return SymbolBatchResult(symbol=symbol, status="ok", data=await fetch(symbol))
+            except HTTPException as e:
+                return SymbolBatchResult(symbol=symbol, status="error", error=str(e.detail))
+            except Exception as e:
+                return SymbolBatchResult(symbol=symbol, status="error", error=str(e))
+    
+    return await asyncio.gather(*[run(symbol) for symbol in symbols])
+
+def parse_articles(html: str, limit: int, symbol: Optional[str] = None) -> List[dict]:
+    """Extract up to limit articles from a Yahoo Finance news stream page"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    articles = []
+    for article in soup.find_all('div', attrs={'data-test': 'stream-item'})[:limit]:
+        try:
+            title_elem = article.find('h3')
+            if not title_elem:
+                continue
+                
+            title = title_elem.text
+            
+            link_elem = article.find('a')
+            link = f"https://finance.yahoo.com{link_elem['href']}" if link_elem and 'href' in link_elem.attrs else None
+            
+            time_elem = article.find('div', attrs={'class': 'C(#959595)'})
+            pub_time = time_elem.text if time_elem else "Unknown"
+            
+            source_elem = article.find('div', attrs={'class': 'C(#959595)'}).find_all('span')
+            source = source_elem[0].text if source_elem and len(source_elem) > 0 else "Yahoo Finance"
+            
+            item = {
+                "title": title,
+                "source": source,
+                "published": pub_time,
+                "url": link
+            }
+            if symbol:
+                item["symbol"] = symbol
+            articles.append(item)
+        except Exception as e:
+            continue
+    return articles
+
+async def fetch_articles(url: str, limit: int, symbol: Optional[str] = None) -> List[dict]:
+    """Fetch a news page over the shared client and parse it off the event loop"""
+    response = await http_client.get(url)
+    return await asyncio.to_thread(parse_articles, response.text, limit, symbol)
+
 @router.get("/market-news")
 async def get_market_news(
     limit: int = Query(10, ge=1, le=50),
@@ -29,40 +108,7 @@ async def get_market_news(
     
     try:
         # Using Yahoo Finance for market news
-        url = "https://finance.yahoo.com/news/"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        articles = []
-        for article in soup.find_all('div', attrs={'data-test': 'stream-item'})[:limit]:
-            try:
-                title_elem = article.find('h3')
-                if not title_elem:
-                    continue
-                    
-                title = title_elem.text
-                
-                link_elem = article.find('a')
-                link = f"https://finance.yahoo.com{link_elem['href']}" if link_elem and 'href' in link_elem.attrs else None
-                
-                time_elem = article.find('div', attrs={'class': 'C(#959595)'})
-                pub_time = time_elem.text if time_elem else "Unknown"
-                
-                source_elem = article.find('div', attrs={'class': 'C(#959595)'}).find_all('span')
-                source = source_elem[0].text if source_elem and len(source_elem) > 0 else "Yahoo Finance"
-                
-                articles.append({
-                    "title": title,
-                    "source": source,
-                    "published": pub_time,
-                    "url": link
-                })
-            except Exception as e:
-                continue
+        articles = await fetch_articles("https://finance.yahoo.com/news/", limit)
         
         result = {"news": articles}
         
@@ -75,13 +121,8 @@ async def get_market_news(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch market news: {str(e)}")
 
-@router.get("/stock-news/{symbol}")
-async def get_stock_news(
-    symbol: str,
-    limit: int = Query(10, ge=1, le=50),
-    current_user: User = Depends(get_current_active_user)
-):
-    """Get news for a specific stock"""
+async def stock_news(symbol: str, limit: int = 10) -> Dict:
+    """News for one stock, served from the shared cache when fresh"""
     cache_key = f"{symbol}_{limit}"
     
     # Return cached results if available and fresh
@@ -90,41 +131,7 @@ async def get_stock_news(
     
     try:
         # Using Yahoo Finance for stock-specific news
-        url = f"https://finance.yahoo.com/quote/{symbol}/news"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        articles = []
-        for article in soup.find_all('div', attrs={'data-test': 'stream-item'})[:limit]:
-            try:
-                title_elem = article.find('h3')
-                if not title_elem:
-                    continue
-                    
-                title = title_elem.text
-                
-                link_elem = article.find('a')
-                link = f"https://finance.yahoo.com{link_elem['href']}" if link_elem and 'href' in link_elem.attrs else None
-                
-                time_elem = article.find('div', attrs={'class': 'C(#959595)'})
-                pub_time = time_elem.text if time_elem else "Unknown"
-                
-                source_elem = article.find('div', attrs={'class': 'C(#959595)'}).find_all('span')
-                source = source_elem[0].text if source_elem and len(source_elem) > 0 else "Yahoo Finance"
-                
-                articles.append({
-                    "title": title,
-                    "source": source,
-                    "published": pub_time,
-                    "url": link,
-                    "symbol": symbol
-                })
-            except Exception as e:
-                continue
+        articles = await fetch_articles(f"https://finance.yahoo.com/quote/{symbol}/news", limit, symbol)
         
         result = {"symbol": symbol, "news": articles}
         
@@ -136,3 +143,23 @@ async def get_stock_news(
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch news for {symbol}: {str(e)}")
+
+@router.get("/stock-news/{symbol}")
+async def get_stock_news(
+    symbol: str,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get news for a specific stock"""
+    return await stock_news(symbol, limit)
+
+@router.post("/batch", response_model=List[SymbolBatchResult])
+async def get_news_batch(
+    request: NewsBatchRequest = Body(...),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    News for a whole watchlist in one request. Symbols are fetched concurrently
+    and share the per-symbol cache; each result carries its own status.
+    """
+    return await run_symbol_batch(request.symbols, lambda symbol: stock_news(symbol, request.limit))
@@ -3,16 +3,18 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Body
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from pydantic import BaseModel
-import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 import uuid
 
 from app.auth.jwt import get_current_active_user
+from app.core.lazy import lazy_import
 from app.db.database import get_db
 from app.models.user import User
 from app.models.portfolio import Portfolio, PortfolioStock
 
+yf = lazy_import("yfinance")
+
 router = APIRouter()
 
 class PortfolioCreate(BaseModel):
@@ -1,47 +1,62 @@
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import yfinance as yf
+import asyncio
 import json
 from datetime import datetime, timedelta
-from ta.volatility import BollingerBands
-from ta.trend import MACD, EMAIndicator, SMAIndicator
-from ta.momentum import RSIIndicator
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.neighbors import KNeighborsRegressor
-from xgboost import XGBRegressor
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.ensemble import ExtraTreesRegressor
-from sklearn.metrics import r2_score, mean_absolute_error
 
 from app.auth.jwt import get_current_active_user
 from app.db.database import get_db
-from app.models.user import User, PredictionHistory
+from app.models.user import User
 from app.schemas.user import PredictionHistory as PredictionHistorySchema
 from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.services import jobs, model_registry, precompute, result_cache
+from app.services.backtest import run_backtest
+from app.services.incremental import INCREMENTAL_MODELS, update_and_forecast
+from app.services.model_registry import TIER_LIMITS
+from app.services.tuning import load_tuned_params, save_best_params, successive_halving
+from app.services.prediction import (
+    get_stock_data, get_bulk_stock_data, history_days, build_xy, run_prediction, run_multi_horizon_prediction,
+    compare_models, save_prediction, save_predictions
+)
+from app.services.features import FEATURE_SETS
+from app.services.snapshots import load_snapshot
+
+yf = lazy_import("yfinance")
+ta_volatility = lazy_import("ta.volatility")
+ta_trend = lazy_import("ta.trend")
+ta_momentum = lazy_import("ta.momentum")
 
 router = APIRouter()
 
-# Define subscription tiers with their limits
-TIER_LIMITS = {
-    "free": {"predictions_per_day": 5, "max_days_forecast": 7, "models": ["LinearRegression"]},
-    "basic": {"predictions_per_day": 20, "max_days_forecast": 14, "models": ["LinearRegression", "RandomForestRegressor"]},
-    "pro": {"predictions_per_day": 50, "max_days_forecast": 30, "models": ["LinearRegression", "RandomForestRegressor", "KNeighborsRegressor", "ExtraTreesRegressor"]},
-    "enterprise": {"predictions_per_day": 200, "max_days_forecast": 60, "models": ["LinearRegression", "RandomForestRegressor", "KNeighborsRegressor", "ExtraTreesRegressor", "XGBRegressor"]}
-}
-
-def get_stock_data(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-    """Get stock data from Yahoo Finance API"""
-    try:
-        df = yf.download(symbol, start=start_date, end=end_date, progress=False)
-        if df.empty:
-            raise HTTPException(status_code=404, detail=f"No data found for symbol {symbol}")
-        return df
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching data: {str(e)}")
+# Models trained per request, and every model a forecast can be requested from
+# (including the pretrained global model); both come from the model registry
+MODEL_NAMES = model_registry.trainable_models()
+PREDICT_MODEL_NAMES = model_registry.model_names()
+
+class BatchPredictionItem(BaseModel):
+    symbol: str
+    model_name: str
+    days_forecast: int = Field(5, ge=1, le=60)
+    training_days: int = Field(100, ge=30, le=3650)
+    feature_set: str = "close"
+
+class BatchPredictionRequest(BaseModel):
+    items: List[BatchPredictionItem]
+
+class BatchPredictionResult(BaseModel):
+    index: int
+    symbol: str
+    model_name: str
+    days_forecast: int
+    status: str  # ok, error
+    prediction: Optional[PredictionHistorySchema] = None
+    error: Optional[str] = None
 
 def check_user_limits(user: User, model: str, days_forecast: int) -> None:
     """Check if user has exceeded their subscription tier limits"""
@@ -61,6 +76,18 @@ def check_user_limits(user: User, model: str, days_forecast: int) -> None:
             detail=f"Maximum forecast days for {tier} subscription is {TIER_LIMITS[tier]['max_days_forecast']}. Please upgrade."
         )
 
+@router.get("/models")
+def list_models(current_user: User = Depends(get_current_active_user)) -> Dict:
+    """
+    Every registered model, with whether the user's tier may use it
+    """
+    tier = current_user.subscription_tier
+    return {
+        "tier": tier,
+        "max_days_forecast": TIER_LIMITS[tier]["max_days_forecast"],
+        "models": model_registry.describe(tier)
+    }
+
 @router.get("/stock/{symbol}")
 def get_stock_info(
     symbol: str,
@@ -107,7 +134,7 @@ def get_technical_indicators(
     
     elif indicator == "bb":
         # Bollinger bands
-        bb_indicator = BollingerBands(data.Close)
+        bb_indicator = ta_volatility.BollingerBands(data.Close)
         bb = data.copy()
         bb["bb_h"] = bb_indicator.bollinger_hband()
         bb["bb_l"] = bb_indicator.bollinger_lband()
@@ -116,7 +143,7 @@ def get_technical_indicators(
     
     elif indicator == "macd":
         # MACD
-        macd_data = MACD(data.Close)
+        macd_data = ta_trend.MACD(data.Close)
         result = pd.DataFrame({
             "Date": data.index,
             "MACD": macd_data.macd(),
@@ -129,7 +156,7 @@ def get_technical_indicators(
         # RSI
         rsi = pd.DataFrame({
             "Date": data.index,
-            "RSI": RSIIndicator(data.Close).rsi()
+            "RSI": ta_momentum.RSIIndicator(data.Close).rsi()
         }).to_dict(orient="records")
         return {"indicator": "RSI", "data": rsi}
     
@@ -137,7 +164,7 @@ def get_technical_indicators(
         # SMA
         sma = pd.DataFrame({
             "Date": data.index,
-            "SMA": SMAIndicator(data.Close, window=14).sma_indicator()
+            "SMA": ta_trend.SMAIndicator(data.Close, window=14).sma_indicator()
         }).to_dict(orient="records")
         return {"indicator": "SMA", "data": sma}
     
@@ -145,16 +172,144 @@ def get_technical_indicators(
         # EMA
         ema = pd.DataFrame({
             "Date": data.index,
-            "EMA": EMAIndicator(data.Close).ema_indicator()
+            "EMA": ta_trend.EMAIndicator(data.Close).ema_indicator()
         }).to_dict(orient="records")
         return {"indicator": "EMA", "data": ema}
 
+@router.post("/predict/batch", response_model=List[BatchPredictionResult])
+def predict_batch(
+    request: BatchPredictionRequest = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Predict many (symbol, model, days_forecast) items in one request.
+    Tier limits are checked per item; failed items do not fail the batch.
+    """
+    tier = current_user.subscription_tier
+    items = request.items
+    max_items = TIER_LIMITS[tier]["max_batch_items"]
+    if not items:
+        raise HTTPException(status_code=400, detail="No prediction items provided")
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Maximum batch size for {tier} subscription is {max_items}. Please upgrade."
+        )
+    
+    results: List[Optional[BatchPredictionResult]] = [None] * len(items)
+    accepted = []
+    for index, item in enumerate(items):
+        item.symbol = item.symbol.upper()
+        try:
+            if item.model_name not in PREDICT_MODEL_NAMES:
+                raise HTTPException(status_code=400, detail="Invalid model name")
+            if item.feature_set not in FEATURE_SETS:
+                raise HTTPException(status_code=400, detail="Invalid feature set")
+            check_user_limits(current_user, item.model_name, item.days_forecast)
+            accepted.append((index, item))
+        except HTTPException as e:
+            results[index] = BatchPredictionResult(
+                index=index, symbol=item.symbol, model_name=item.model_name,
+                days_forecast=item.days_forecast, status="error", error=e.detail
+            )
+    
+    # One bulk download covering the longest window requested
+    end_date = datetime.now()
+    if accepted:
+        longest = max(history_days(item.training_days, item.days_forecast, item.feature_set) for _, item in accepted)
+        frames = get_bulk_stock_data([item.symbol for _, item in accepted], end_date - timedelta(days=longest), end_date)
+        tuned = load_tuned_params(
+            db, [item.symbol for _, item in accepted], [item.model_name for _, item in accepted],
+            [item.feature_set for _, item in accepted]
+        )
+    
+    # Slice each item's window and derive its request key from the last bar
+    windows = {}
+    for index, item in list(accepted):
+        data = frames.get(item.symbol)
+        if data is not None:
+            window_start = end_date - timedelta(days=history_days(item.training_days, item.days_forecast, item.feature_set))
+            data = data[data.index >= pd.Timestamp(window_start.date())]
+        if data is None or data.empty:
+            accepted.remove((index, item))
+            results[index] = BatchPredictionResult(
+                index=index, symbol=item.symbol, model_name=item.model_name,
+                days_forecast=item.days_forecast, status="error",
+                error=f"No data found for symbol {item.symbol}"
+            )
+            continue
+        last_bar = result_cache.last_bar_date(data)
+        key = result_cache.request_key(
+            item.symbol, item.model_name, item.days_forecast, item.training_days, item.feature_set,
+            tuned.get((item.symbol, item.model_name, item.feature_set)), last_bar
+        )
+        windows[index] = (data, key, last_bar)
+    
+    # Items the user already ran return their row; items someone else ran are referenced
+    existing, shared = result_cache.resolve(db, current_user.id, [key for _, key, _ in windows.values()])
+    
+    def run_item(entry):
+        index, item = entry
+        data = windows[index][0]
+        return run_prediction(
+            data, item.symbol, item.model_name, item.days_forecast, item.training_days, end_date,
+            tier=tier, feature_set=item.feature_set, params=tuned.get((item.symbol, item.model_name, item.feature_set))
+        )
+    
+    # Fan out up to the tier's training concurrency; fit itself runs in the process pool.
+    # Duplicate items within the batch are computed once
+    to_compute = {}
+    for index, item in accepted:
+        key = windows[index][1]
+        if key not in existing and key not in shared:
+            to_compute.setdefault(key, (index, item))
+    computed = {}
+    with ThreadPoolExecutor(max_workers=max(1, settings.TRAINING_CONCURRENCY.get(tier, 1))) as executor:
+        futures = {key: executor.submit(run_item, entry) for key, entry in to_compute.items()}
+        for key, future in futures.items():
+            try:
+                computed[key] = future.result()
+            except Exception as e:
+                computed[key] = e
+    
+    # Store new results, then add one history row per distinct key in a single bulk insert
+    shared.update(result_cache.store_results(db, [
+        (key, result, to_compute[key][1].training_days, windows[to_compute[key][0]][2])
+        for key, result in computed.items() if not isinstance(result, Exception)
+    ]))
+    new_keys = list(dict.fromkeys(
+        windows[index][1] for index, _ in accepted
+        if windows[index][1] not in existing and windows[index][1] in shared
+    ))
+    if new_keys:
+        saved = result_cache.save_references(db, current_user.id, [shared[key] for key in new_keys])
+        existing.update(zip(new_keys, saved))
+    
+    for index, item in accepted:
+        key = windows[index][1]
+        if key in existing:
+            results[index] = BatchPredictionResult(
+                index=index, symbol=item.symbol, model_name=item.model_name,
+                days_forecast=item.days_forecast, status="ok", prediction=existing[key]
+            )
+        else:
+            error = computed[key]
+            results[index] = BatchPredictionResult(
+                index=index, symbol=item.symbol, model_name=item.model_name,
+                days_forecast=item.days_forecast, status="error",
+                error=error.detail if isinstance(error, HTTPException) else str(error)
+            )
+    
+    return results
+
 @router.post("/predict/{symbol}", response_model=PredictionHistorySchema)
 def predict_stock_price(
     symbol: str,
-    model_name: str = Query(..., enum=["LinearRegression", "RandomForestRegressor", "ExtraTreesRegressor", "KNeighborsRegressor", "XGBRegressor"]),
+    model_name: str = Query(..., enum=PREDICT_MODEL_NAMES),
     days_forecast: int = Query(5, ge=1, le=60),
     training_days: int = Query(100, ge=30, le=3650),
+    feature_set: str = Query("close", enum=FEATURE_SETS),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
@@ -164,83 +319,286 @@ def predict_stock_price(
     # Check if user has exceeded their subscription tier limits
     check_user_limits(current_user, model_name, days_forecast)
     
+    # Hyperparameters found by /tune for this symbol, model and feature set, if any
+    params = load_tuned_params(db, [symbol], [model_name], [feature_set]).get((symbol.upper(), model_name, feature_set))
+    
+    # Popular symbols are precomputed nightly: serve that forecast while it is fresh
+    fresh = precompute.find_fresh(db, symbol, model_name, days_forecast, training_days, feature_set, params)
+    if fresh is not None:
+        return result_cache.get_or_reference(db, current_user.id, fresh)
+    
     # Get stock data
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=training_days + days_forecast)  # Extra data for training
+    start_date = end_date - timedelta(days=history_days(training_days, days_forecast, feature_set))  # Extra data for training
     
     data = get_stock_data(symbol, start_date, end_date)
     
-    # Model selection
-    if model_name == "LinearRegression":
-        model = LinearRegression()
-    elif model_name == "RandomForestRegressor":
-        model = RandomForestRegressor()
-    elif model_name == "ExtraTreesRegressor":
-        model = ExtraTreesRegressor()
-    elif model_name == "KNeighborsRegressor":
-        model = KNeighborsRegressor()
-    elif model_name == "XGBRegressor":
-        model = XGBRegressor()
-    else:
-        raise HTTPException(status_code=400, detail="Invalid model name")
+    # Same request on the same last bar: reuse the user's row or the shared result
+    last_bar = result_cache.last_bar_date(data)
+    key = result_cache.request_key(symbol, model_name, days_forecast, training_days, feature_set, params, last_bar)
     
-    # Prepare data for prediction
-    df = data[["Close"]].copy()
-    df["preds"] = data.Close.shift(-days_forecast)
+    return result_cache.get_or_compute(
+        db, current_user.id, key, training_days, last_bar,
+        lambda: run_prediction(
+            data, symbol, model_name, days_forecast, training_days, end_date,
+            tier=current_user.subscription_tier, feature_set=feature_set, params=params
+        )
+    )
+
+@router.post("/forecast-curve/{symbol}", response_model=PredictionHistorySchema)
+def predict_forecast_curve(
+    symbol: str,
+    model_name: str = Query(..., enum=MODEL_NAMES),
+    max_horizon: int = Query(30, ge=1, le=60),
+    training_days: int = Query(365, ge=30, le=3650),
+    feature_set: str = Query("close", enum=FEATURE_SETS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Forecast every horizon from 1 to max_horizon days with a single multi-output model fit
+    """
+    check_user_limits(current_user, model_name, max_horizon)
     
-    # Scale the data
-    scaler = StandardScaler()
-    x = df.drop(["preds"], axis=1).values
-    x = scaler.fit_transform(x)
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=history_days(training_days, max_horizon, feature_set))
     
-    # Store last days_forecast data for prediction
-    x_forecast = x[-days_forecast:]
+    data = get_stock_data(symbol, start_date, end_date)
     
-    # Select data for training
-    x = x[:-days_forecast]
-    y = df.preds.values[:-days_forecast]
+    result = run_multi_horizon_prediction(
+        data, symbol, model_name, max_horizon, training_days, end_date,
+        tier=current_user.subscription_tier, feature_set=feature_set
+    )
     
-    # Split data
-    x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=.2, random_state=7)
+    return save_prediction(db, current_user.id, result)
+
+@router.post("/incremental/{symbol}", response_model=PredictionHistorySchema)
+def predict_incremental(
+    symbol: str,
+    model_name: str = Query(..., enum=INCREMENTAL_MODELS),
+    days_forecast: int = Query(5, ge=1, le=60),
+    training_days: int = Query(365, ge=30, le=3650),
+    feature_set: str = Query("close", enum=FEATURE_SETS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Forecast with a persistent model that is updated only with bars it has not
+    seen yet (SGD partial_fit for LinearRegression, batched extra boosting rounds for XGBRegressor),
+    trained in the pool under the user's tier caps
+    """
+    check_user_limits(current_user, model_name, days_forecast)
     
-    # Train model
-    model.fit(x_train, y_train)
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=history_days(training_days, days_forecast, feature_set))
     
-    # Evaluate model
-    preds = model.predict(x_test)
-    r2 = r2_score(y_test, preds)
-    mae = mean_absolute_error(y_test, preds)
+    data = get_stock_data(symbol, start_date, end_date)
     
-    # Predict future prices
-    forecast_pred = model.predict(x_forecast)
+    result = update_and_forecast(
+        data, symbol, model_name, days_forecast, end_date,
+        feature_set=feature_set, tier=current_user.subscription_tier
+    )
     
-    # Format predictions
-    prediction_dates = [(end_date + timedelta(days=i+1)).strftime("%Y-%m-%d") for i in range(days_forecast)]
-    predictions = [{"date": date, "price": float(price)} for date, price in zip(prediction_dates, forecast_pred)]
+    return save_prediction(db, current_user.id, result)
+
+@router.post("/compare/{symbol}")
+def compare_prediction_models(
+    symbol: str,
+    models: List[str] = Query(..., description="Models to compare, e.g. models=LinearRegression&models=XGBRegressor"),
+    days_forecast: int = Query(5, ge=1, le=60),
+    training_days: int = Query(100, ge=30, le=3650),
+    feature_set: str = Query("close", enum=FEATURE_SETS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict:
+    """
+    Train several models on one data fetch and feature matrix and return a leaderboard
+    """
+    models = list(dict.fromkeys(models))
+    for model_name in models:
+        if model_name not in PREDICT_MODEL_NAMES:
+            raise HTTPException(status_code=400, detail=f"Invalid model name {model_name}")
+        check_user_limits(current_user, model_name, days_forecast)
     
-    # Create result JSON
-    result_json = json.dumps({
+    # Get stock data once for all models
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=history_days(training_days, days_forecast, feature_set))
+    
+    data = get_stock_data(symbol, start_date, end_date)
+    
+    tuned = load_tuned_params(db, [symbol], models, [feature_set])
+    
+    results = compare_models(
+        data, symbol, models, days_forecast, training_days, end_date,
+        tier=current_user.subscription_tier, feature_set=feature_set,
+        tuned_params={model_name: params for (_, model_name, _), params in tuned.items()}
+    )
+    
+    # Every compared model is recorded in the prediction history
+    saved = save_predictions(db, current_user.id, results)
+    
+    leaderboard = [
+        {
+            "rank": rank + 1,
+            "model": result["model"],
+            "r2_score": result["r2_score"],
+            "mae": result["mae"],
+            "predictions": result["predictions"],
+            "prediction_id": prediction.id
+        }
+        for rank, (result, prediction) in enumerate(zip(results, saved))
+    ]
+    
+    return {
         "symbol": symbol,
-        "model": model_name,
         "days_forecast": days_forecast,
-        "predictions": predictions,
-        "r2_score": r2,
-        "mae": mae
-    })
-    
-    # Save prediction to history
-    prediction_history = PredictionHistory(
-        user_id=current_user.id,
-        symbol=symbol,
-        model_used=model_name,
-        days_forecasted=days_forecast,
-        result_json=result_json,
-        r2_score=str(r2),
-        mae=str(mae)
+        "training_days": training_days,
+        "leaderboard": leaderboard
+    }
+
+@router.get("/backtest/{symbol}")
+def backtest_models(
+    symbol: str,
+    models: List[str] = Query(["LinearRegression"]),
+    days_forecast: int = Query(5, ge=1, le=60),
+    training_days: int = Query(730, ge=90, le=3650),
+    n_folds: int = Query(5, ge=2, le=20),
+    window: str = Query("expanding", enum=["expanding", "rolling"]),
+    feature_set: str = Query("close", enum=FEATURE_SETS),
+    time_budget: float = Query(30, gt=0),
+    snapshot: Optional[str] = Query(None, description="Backtest on stored training bars instead of downloading them"),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict:
+    """
+    Walk-forward backtest: chronological folds trained in parallel, with
+    per-fold and aggregate error metrics. Folds not finished within
+    time_budget seconds are reported as skipped. With snapshot, the bars
+    recorded with an earlier prediction are replayed offline.
+    """
+    models = list(dict.fromkeys(models))
+    for model_name in models:
+        if model_name not in MODEL_NAMES:
+            raise HTTPException(status_code=400, detail=f"Invalid model name {model_name}")
+        check_user_limits(current_user, model_name, days_forecast)
+    
+    if snapshot:
+        data = load_snapshot(snapshot)
+    else:
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=history_days(training_days, days_forecast, feature_set))
+        data = get_stock_data(symbol, start_date, end_date)
+    
+    return run_backtest(
+        data, symbol, models, days_forecast, n_folds,
+        time_budget=min(time_budget, settings.BACKTEST_MAX_SECONDS),
+        feature_set=feature_set,
+        expanding=window == "expanding",
+        tier=current_user.subscription_tier
     )
+
+@router.post("/tune/{symbol}")
+def tune_model(
+    symbol: str,
+    model_name: str = Query(..., enum=model_registry.tunable_models()),
+    days_forecast: int = Query(5, ge=1, le=60),
+    training_days: int = Query(730, ge=90, le=3650),
+    feature_set: str = Query("close", enum=FEATURE_SETS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict:
+    """
+    Successive-halving hyperparameter search with time-series CV. The best
+    configuration is stored and reused by later predictions for this symbol, model and feature set.
+    """
+    tier = current_user.subscription_tier
+    check_user_limits(current_user, model_name, days_forecast)
+    budget = TIER_LIMITS[tier]["tuning_candidates"]
+    if budget <= 0:
+        raise HTTPException(status_code=403, detail=f"Hyperparameter tuning is not available in your {tier} subscription. Please upgrade.")
+    
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=history_days(training_days, days_forecast, feature_set))
+    
+    data = get_stock_data(symbol, start_date, end_date)
+    
+    x, target = build_xy(data, days_forecast, feature_set, symbol)
+    search = successive_halving(
+        x[:-days_forecast], target[:-days_forecast], model_name,
+        n_candidates=budget, time_budget=TIER_LIMITS[tier]["tuning_seconds"], tier=tier
+    )
+    
+    tuning = save_best_params(
+        db, symbol, model_name, search["best_params"], search["best_mae"],
+        feature_set, search["candidates_evaluated"]
+    )
+    
+    return {
+        "symbol": tuning.symbol,
+        "model": model_name,
+        "updated_at": tuning.updated_at,
+        **search
+    }
+
+@router.post("/jobs/{symbol}")
+def submit_prediction_job(
+    symbol: str,
+    model_name: str = Query(..., enum=PREDICT_MODEL_NAMES),
+    days_forecast: int = Query(5, ge=1, le=60),
+    training_days: int = Query(100, ge=30, le=3650),
+    feature_set: str = Query("close", enum=FEATURE_SETS),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict:
+    """
+    Queue a prediction to run in the background and return its job id
+    """
+    check_user_limits(current_user, model_name, days_forecast)
+    
+    job = jobs.submit_prediction_job(
+        current_user.id, current_user.subscription_tier, symbol, model_name, days_forecast, training_days, feature_set
+    )
+    
+    return {"job_id": job["id"], "status": job["status"], "progress": job["progress"]}
+
+def get_user_job(job_id: str, user: User) -> Dict:
+    """Load a job owned by user or raise 404"""
+    job = jobs.get_backend().get(job_id)
+    if job is None or job["user_id"] != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}")
+def get_prediction_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+) -> Dict:
+    """
+    Poll the status of a queued prediction job
+    """
+    return get_user_job(job_id, current_user)
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_prediction_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream job progress as server-sent events until the job finishes
+    """
+    # Backend lookups can be network calls (redis): keep them off the event loop
+    await asyncio.to_thread(get_user_job, job_id, current_user)
+    backend = jobs.get_backend()
     
-    db.add(prediction_history)
-    db.commit()
-    db.refresh(prediction_history)
+    async def events():
+        last_update = None
+        while True:
+            job = await asyncio.to_thread(backend.get, job_id)
+            if job is None:
+                break
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield f"data: {json.dumps(job)}\n\n"
+            if job["status"] in jobs.TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(0.5)
     
-    return prediction_history
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,15 +1,16 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query
-import requests
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from pydantic import BaseModel
+import asyncio
 from datetime import datetime, timedelta
 import re
 import numpy as np
-from textblob import TextBlob
 
 from app.auth.jwt import get_current_active_user
 from app.db.database import get_db
-from app.models.user import User, PredictionHistory
-from app.routers.news import get_stock_news, get_market_news
+from app.models.user import User
+from app.routers.news import SymbolBatchResult, get_market_news, run_symbol_batch, stock_news
+from app.services import accuracy, headline_sentiment
 from sqlalchemy.orm import Session
 
 router = APIRouter()
@@ -18,107 +19,163 @@ router = APIRouter()
 sentiment_cache = {}
 cache_time = {}
 
-def analyze_text_sentiment(text):
-    """Analyze sentiment of text using TextBlob"""
-    blob = TextBlob(text)
-    sentiment = blob.sentiment
+# Realized mean absolute percentage error at which prediction confidence reaches 0
+CONFIDENCE_ZERO_MAPE = 0.10
+
+# Headlines analyzed per stock
+SENTIMENT_NEWS_LIMIT = 20
+
+class SentimentBatchRequest(BaseModel):
+    symbols: List[str]
+    include_articles: bool = False
+    include_confidence: bool = True
+
+def score_articles(news_articles: List[Dict]) -> List[Dict]:
+    """Sentiment of every titled article (each distinct headline is only ever scored once)"""
+    titled = [article for article in news_articles if article.get("title", "")]
+    scores = headline_sentiment.score([article["title"] for article in titled])
+    return [
+        {
+            "title": article["title"],
+            "source": article.get("source", "Unknown"),
+            "published": article.get("published", "Unknown"),
+            "url": article.get("url", ""),
+            "sentiment": sentiment
+        }
+        for article, sentiment in zip(titled, scores)
+    ]
+
+def summarize_sentiment(sentiments: List[Dict]) -> Dict:
+    """Average polarity/subjectivity, category counts and the overall call"""
+    polarities = [s["sentiment"]["polarity"] for s in sentiments]
+    subjectivities = [s["sentiment"]["subjectivity"] for s in sentiments]
+    
+    avg_polarity = sum(polarities) / len(polarities)
+    avg_subjectivity = sum(subjectivities) / len(subjectivities)
     
-    # Map polarity (-1 to 1) to sentiment category
-    if sentiment.polarity > 0.2:
-        category = "positive"
-    elif sentiment.polarity < -0.2:
-        category = "negative"
+    # Count sentiment categories
+    categories = [s["sentiment"]["category"] for s in sentiments]
+    category_counts = {
+        "positive": categories.count("positive"),
+        "neutral": categories.count("neutral"),
+        "negative": categories.count("negative")
+    }
+    
+    # Determine overall sentiment
+    if avg_polarity > 0.1:
+        overall = "bullish"
+    elif avg_polarity < -0.1:
+        overall = "bearish"
     else:
-        category = "neutral"
+        overall = "neutral"
     
     return {
-        "polarity": sentiment.polarity,
-        "subjectivity": sentiment.subjectivity,
-        "category": category
+        "overall_sentiment": overall,
+        "average_polarity": avg_polarity,
+        "average_subjectivity": avg_subjectivity,
+        "sentiment_distribution": category_counts
     }
 
-@router.get("/stock/{symbol}")
-async def get_stock_sentiment(
-    symbol: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    """Get sentiment analysis for a specific stock based on news"""
+def cached_sentiment(symbol: str) -> Optional[Dict]:
+    """A stock's cached sentiment if it is fresh (less than 6 hours old)"""
     cache_key = f"sentiment_{symbol}"
-    
-    # Return cached results if available and fresh (less than 6 hours old)
     if cache_key in sentiment_cache and (datetime.now() - cache_time[cache_key]).seconds < 21600:
         return sentiment_cache[cache_key]
+    return None
+
+async def stock_sentiment(symbol: str) -> Dict:
+    """Sentiment of one stock's news, served from the shared cache when fresh"""
+    cache_key = f"sentiment_{symbol}"
+    
+    # Return cached results if available and fresh
+    cached = cached_sentiment(symbol)
+    if cached is not None:
+        return cached
     
     try:
         # Get news for the stock
-        news_data = await get_stock_news(symbol=symbol, limit=20, current_user=current_user)
+        news_data = await stock_news(symbol, limit=SENTIMENT_NEWS_LIMIT)
         news_articles = news_data.get("news", [])
         
         if not news_articles:
             raise HTTPException(status_code=404, detail=f"No news found for {symbol}")
         
-        # Analyze sentiment for each article
-        sentiments = []
-        for article in news_articles:
-            title = article.get("title", "")
-            if title:
-                sentiment = analyze_text_sentiment(title)
-                sentiments.append({
-                    "title": title,
-                    "source": article.get("source", "Unknown"),
-                    "published": article.get("published", "Unknown"),
-                    "url": article.get("url", ""),
-                    "sentiment": sentiment
-                })
+        # Analyze sentiment for each article (CPU work, kept off the event loop)
+        sentiments = await asyncio.to_thread(score_articles, news_articles)
         
-        # Calculate overall sentiment
-        if sentiments:
-            polarities = [s["sentiment"]["polarity"] for s in sentiments]
-            subjectivities = [s["sentiment"]["subjectivity"] for s in sentiments]
-            
-            avg_polarity = sum(polarities) / len(polarities)
-            avg_subjectivity = sum(subjectivities) / len(subjectivities)
-            
-            # Count sentiment categories
-            categories = [s["sentiment"]["category"] for s in sentiments]
-            category_counts = {
-                "positive": categories.count("positive"),
-                "neutral": categories.count("neutral"),
-                "negative": categories.count("negative")
-            }
-            
-            # Determine overall sentiment
-            if avg_polarity > 0.1:
-                overall = "bullish"
-            elif avg_polarity < -0.1:
-                overall = "bearish"
-            else:
-                overall = "neutral"
-                
-            result = {
-                "symbol": symbol,
-                "overall_sentiment": overall,
-                "average_polarity": avg_polarity,
-                "average_subjectivity": avg_subjectivity,
-                "sentiment_distribution": category_counts,
-                "analysis_time": datetime.now().isoformat(),
-                "articles": sentiments
-            }
-            
-            # Cache results
-            sentiment_cache[cache_key] = result
-            cache_time[cache_key] = datetime.now()
-            
-            return result
-        else:
+        if not sentiments:
             raise HTTPException(status_code=404, detail=f"Could not analyze sentiment for {symbol}")
+        
+        result = {
+            "symbol": symbol,
+            **summarize_sentiment(sentiments),
+            "analysis_time": datetime.now().isoformat(),
+            "articles": sentiments
+        }
+        
+        # Cache results
+        sentiment_cache[cache_key] = result
+        cache_time[cache_key] = datetime.now()
+        
+        return result
             
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=f"Error analyzing sentiment: {str(e)}")
 
+@router.get("/stock/{symbol}")
+async def get_stock_sentiment(
+    symbol: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get sentiment analysis for a specific stock based on news"""
+    return await stock_sentiment(symbol)
+
+@router.post("/batch", response_model=List[SymbolBatchResult])
+async def get_sentiment_batch(
+    request: SentimentBatchRequest = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    News sentiment (and prediction confidence) for a whole watchlist in one
+    request. Symbols are scored concurrently and share the per-symbol caches;
+    each result carries its own status.
+    """
+    confidence_rows = accuracy.lookup_many(db, request.symbols) if request.include_confidence else {}
+    
+    # Fetch the news of every stale symbol first and score all their headlines
+    # together, so the whole batch costs one headline lookup query
+    async def fetch_news(symbol: str) -> Dict:
+        if cached_sentiment(symbol) is not None:
+            return {"news": []}
+        return await stock_news(symbol, limit=SENTIMENT_NEWS_LIMIT)
+    
+    news_results = await run_symbol_batch(request.symbols, fetch_news)
+    titles = [
+        article["title"]
+        for item in news_results if item.status == "ok"
+        for article in item.data["news"] if article.get("title")
+    ]
+    if titles:
+        await asyncio.to_thread(headline_sentiment.score, titles)
+    news_errors = {item.symbol: item for item in news_results if item.status != "ok"}
+    
+    async def fetch(symbol: str) -> Dict:
+        if symbol in news_errors:
+            raise HTTPException(status_code=500, detail=news_errors[symbol].error)
+        result = await stock_sentiment(symbol)
+        if not request.include_articles:
+            result = {key: value for key, value in result.items() if key != "articles"}
+        if request.include_confidence:
+            rows = confidence_rows.get(symbol)
+            result = {**result, "confidence": prediction_confidence(symbol, rows) if rows else None}
+        return result
+    
+    return await run_symbol_batch(request.symbols, fetch)
+
 @router.get("/market")
 async def get_market_sentiment(
     current_user: User = Depends(get_current_active_user)
@@ -138,49 +195,13 @@ async def get_market_sentiment(
         if not news_articles:
             raise HTTPException(status_code=404, detail="No market news found")
         
-        # Analyze sentiment for each article
-        sentiments = []
-        for article in news_articles:
-            title = article.get("title", "")
-            if title:
-                sentiment = analyze_text_sentiment(title)
-                sentiments.append({
-                    "title": title,
-                    "source": article.get("source", "Unknown"),
-                    "published": article.get("published", "Unknown"),
-                    "url": article.get("url", ""),
-                    "sentiment": sentiment
-                })
+        # Analyze sentiment for each article (CPU work, kept off the event loop)
+        sentiments = await asyncio.to_thread(score_articles, news_articles)
         
         # Calculate overall sentiment
         if sentiments:
-            polarities = [s["sentiment"]["polarity"] for s in sentiments]
-            subjectivities = [s["sentiment"]["subjectivity"] for s in sentiments]
-            
-            avg_polarity = sum(polarities) / len(polarities)
-            avg_subjectivity = sum(subjectivities) / len(subjectivities)
-            
-            # Count sentiment categories
-            categories = [s["sentiment"]["category"] for s in sentiments]
-            category_counts = {
-                "positive": categories.count("positive"),
-                "neutral": categories.count("neutral"),
-                "negative": categories.count("negative")
-            }
-            
-            # Determine overall sentiment
-            if avg_polarity > 0.1:
-                overall = "bullish"
-            elif avg_polarity < -0.1:
-                overall = "bearish"
-            else:
-                overall = "neutral"
-                
             result = {
-                "overall_sentiment": overall,
-                "average_polarity": avg_polarity,
-                "average_subjectivity": avg_subjectivity,
-                "sentiment_distribution": category_counts,
+                **summarize_sentiment(sentiments),
                 "analysis_time": datetime.now().isoformat(),
                 "articles": sentiments[:10]  # Limit to top 10 articles in response
             }
@@ -199,78 +220,65 @@ async def get_market_sentiment(
         raise HTTPException(status_code=500, detail=f"Error analyzing market sentiment: {str(e)}")
 
 @router.get("/prediction-confidence/{symbol}")
-async def get_prediction_confidence(
+def get_prediction_confidence(
     symbol: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Calculate prediction confidence based on model performance and sentiment"""
-    try:
-        # Get recent predictions for this symbol
-        predictions = (
-            db.query(PredictionHistory)
-            .filter(PredictionHistory.user_id == current_user.id, 
-                    PredictionHistory.symbol == symbol)
-            .order_by(PredictionHistory.created_at.desc())
-            .limit(5)
-            .all()
-        )
-        
-        if not predictions:
-            raise HTTPException(status_code=404, detail=f"No prediction history found for {symbol}")
-        
-        # Get sentiment data
-        sentiment_data = await get_stock_sentiment(symbol=symbol, db=db, current_user=current_user)
-        sentiment_score = sentiment_data.get("average_polarity", 0)
-        
-        # Calculate average R2 score from predictions
-        r2_scores = []
-        for pred in predictions:
-            try:
-                r2 = float(pred.r2_score)
-                r2_scores.append(r2)
-            except:
-                pass
-        
-        avg_r2 = sum(r2_scores) / len(r2_scores) if r2_scores else 0
-        
-        # Calculate confidence score (0-100%)
-        # 50% based on model performance, 50% based on sentiment alignment
-        model_confidence = min(avg_r2 * 100, 100) * 0.5
-        
-        # Convert sentiment to 0-100 range (From -1 to 1 scale)
-        sentiment_confidence = (sentiment_score + 1) * 50
-        
-        # Calculate combined confidence
-        combined_confidence = model_confidence + (sentiment_confidence * 0.5)
-        
-        # Generate confidence assessment
+    """Prediction confidence from the realized error of this symbol's matured forecasts"""
+    rows = accuracy.lookup(db, symbol)
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"No matured forecasts evaluated for {symbol} yet")
+    return prediction_confidence(symbol, rows)
+
+def prediction_confidence(symbol: str, rows: List) -> Dict:
+    """Confidence score and per-model realized errors from a symbol's forecast_accuracy rows"""
+    # Pool the per-model sums so models with more evaluated points weigh more
+    points = sum(row.points_evaluated for row in rows)
+    mape = sum(row.sum_abs_pct_error for row in rows) / points
+    interval_points = sum(row.interval_points for row in rows)
+    coverage = sum(row.interval_hits for row in rows) / interval_points if interval_points else None
+    
+    # 0% realized error maps to 100, CONFIDENCE_ZERO_MAPE or worse maps to 0
+    combined_confidence = max(0.0, 1 - mape / CONFIDENCE_ZERO_MAPE) * 100
+    
+    # Generate confidence assessment
+    assessment = "Low"
+    color = "red"
+    if combined_confidence >= 75:
+        assessment = "Very High"
+        color = "green"
+    elif combined_confidence >= 60:
+        assessment = "High"
+        color = "lightgreen"
+    elif combined_confidence >= 40:
+        assessment = "Moderate"
+        color = "yellow"
+    elif combined_confidence >= 25:
         assessment = "Low"
-        color = "red"
-        if combined_confidence >= 75:
-            assessment = "Very High"
-            color = "green"
-        elif combined_confidence >= 60:
-            assessment = "High"
-            color = "lightgreen"
-        elif combined_confidence >= 40:
-            assessment = "Moderate"
-            color = "yellow"
-        elif combined_confidence >= 25:
-            assessment = "Low"
-            color = "orange"
-            
-        return {
-            "symbol": symbol,
-            "confidence_score": combined_confidence,
-            "confidence_assessment": assessment,
-            "confidence_color": color,
-            "model_performance": avg_r2,
-            "sentiment_alignment": sentiment_score,
-            "analysis_time": datetime.now().isoformat()
-        }
+        color = "orange"
         
-    except Exception as e:
-        if isinstance(e, HTTPException):
-            raise e
-        raise HTTPException(status_code=500, detail=f"Error calculating prediction confidence: {str(e)}")
+    return {
+        "symbol": symbol.upper(),
+        "confidence_score": combined_confidence,
+        "confidence_assessment": assessment,
+        "confidence_color": color,
+        "realized_mape": mape,
+        "interval_coverage_80": coverage,
+        "points_evaluated": points,
+        "models": [
+            {
+                "model": row.model_name,
+                "predictions_evaluated": row.predictions_evaluated,
+                "points_evaluated": row.points_evaluated,
+                "mae": row.mae,
+                "mape": row.mape,
+                "rmse": row.rmse,
+                "bias": row.bias,
+                "interval_coverage_80": row.interval_coverage,
+                "updated_at": row.updated_at
+            }
+            for row in sorted(rows, key=lambda row: row.mape)
+        ],
+        "analysis_time": datetime.now().isoformat()
+    }
@@ -0,0 +1,188 @@
+"""
+Realized accuracy tracker.
+
+Joins every matured forecast in prediction_history against the closes that
+actually printed and folds the errors into forecast_accuracy. Rows are marked
+evaluated, so each daily run only touches forecasts that matured since the last
+one. Run with `python -m app.services.accuracy` (the precompute worker also runs
+it before each nightly precompute).
+"""
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.models.accuracy import ForecastAccuracy
+from app.models.user import PredictionHistory, PredictionResult
+from app.services.prediction import get_bulk_stock_data
+
+UPDATE_CHUNK = 500
+
+def _forecast_points(rows: List, first_rows: Dict[int, int], today: date) -> pd.DataFrame:
+    # One row per forecast day of every matured prediction. A shared result is
+    # counted only through the first history row that references it
+    records = []
+    for row_id, symbol, model_name, result_id, own_json, shared_json in rows:
+        if result_id is not None and first_rows.get(result_id) != row_id:
+            records.append((row_id, None, None, None, None, None, None))
+            continue
+        try:
+            predictions = json.loads(own_json or shared_json)["predictions"]
+        except (TypeError, ValueError, KeyError):
+            records.append((row_id, None, None, None, None, None, None))
+            continue
+        for point in predictions:
+            records.append((
+                row_id, symbol.upper(), model_name, point["date"], point["price"],
+                point.get("lower_80"), point.get("upper_80")
+            ))
+
+    points = pd.DataFrame.from_records(
+        records, columns=["row_id", "symbol", "model_name", "date", "price", "lower_80", "upper_80"]
+    )
+    points["date"] = pd.to_datetime(points["date"]).astype("datetime64[ns]")
+    # A prediction is matured once its last forecast day is in the past
+    last_day = points.groupby("row_id")["date"].transform("max")
+    return points[last_day.isna() | (last_day.dt.date < today)]
+
+def _realized_closes(symbols: List[str], start: date, end: date) -> pd.DataFrame:
+    frames = get_bulk_stock_data(symbols, start, end + timedelta(days=1))
+    closes = [
+        pd.DataFrame({
+            "symbol": symbol,
+            "date": pd.DatetimeIndex(frame.index).normalize().astype("datetime64[ns]"),
+            "close": np.asarray(frame["Close"], dtype=np.float64).reshape(-1)
+        })
+        for symbol, frame in frames.items()
+    ]
+    return pd.concat(closes, ignore_index=True) if closes else pd.DataFrame(columns=["symbol", "date", "close"])
+
+def update(db: Session, today: date = None) -> Dict:
+    """Fold every newly matured forecast into forecast_accuracy; returns counts"""
+    started = time.monotonic()
+    today = today or date.today()
+    rows = (
+        db.query(
+            PredictionHistory.id, PredictionHistory.symbol, PredictionHistory.model_used,
+            PredictionHistory.result_id, PredictionHistory.own_result_json, PredictionResult.result_json
+        )
+        .outerjoin(PredictionResult, PredictionHistory.result_id == PredictionResult.id)
+        .filter(PredictionHistory.evaluated_at.is_(None), PredictionHistory.created_at < datetime.combine(today, datetime.min.time()))
+        .all()
+    )
+    result_ids = list({row.result_id for row in rows if row.result_id is not None})
+    first_rows = {}
+    for start in range(0, len(result_ids), UPDATE_CHUNK):
+        first_rows.update(
+            db.query(PredictionHistory.result_id, func.min(PredictionHistory.id))
+            .filter(PredictionHistory.result_id.in_(result_ids[start:start + UPDATE_CHUNK]))
+            .group_by(PredictionHistory.result_id)
+            .all()
+        )
+    points = _forecast_points(rows, first_rows, today) if rows else pd.DataFrame()
+    if points.empty:
+        return {"predictions": 0, "points": 0, "pairs": 0}
+
+    # Duplicates of a shared result and unreadable rows carry no points but are marked done
+    valid = points.dropna(subset=["symbol"])
+    closes = _realized_closes(sorted(valid["symbol"].unique()), valid["date"].min().date(), today) if not valid.empty else None
+
+    if closes is not None and not closes.empty:
+        # Weekend and holiday forecast days have no close and drop out of the join
+        joined = valid.merge(closes, on=["symbol", "date"], how="inner")
+        joined = joined[joined["close"] > 0]
+    else:
+        joined = valid.iloc[0:0].assign(close=np.nan)
+
+    error = joined["price"] - joined["close"]
+    has_interval = joined["lower_80"].notna() & joined["upper_80"].notna()
+    joined = joined.assign(
+        abs_error=error.abs(),
+        abs_pct_error=(error / joined["close"]).abs(),
+        sq_error=error ** 2,
+        error=error,
+        interval_point=has_interval.astype(int),
+        interval_hit=(has_interval & (joined["close"] >= joined["lower_80"]) & (joined["close"] <= joined["upper_80"])).astype(int),
+    )
+    sums = joined.groupby(["symbol", "model_name"]).agg(
+        predictions=("row_id", "nunique"),
+        points=("abs_error", "size"),
+        sum_abs_error=("abs_error", "sum"),
+        sum_abs_pct_error=("abs_pct_error", "sum"),
+        sum_sq_error=("sq_error", "sum"),
+        sum_error=("error", "sum"),
+        interval_points=("interval_point", "sum"),
+        interval_hits=("interval_hit", "sum"),
+    )
+
+    existing = {}
+    if not sums.empty:
+        existing = {
+            (row.symbol, row.model_name): row
+            for row in db.query(ForecastAccuracy).filter(ForecastAccuracy.symbol.in_(sums.index.get_level_values(0).unique().tolist()))
+        }
+    for (symbol, model_name), agg in sums.iterrows():
+        row = existing.get((symbol, model_name))
+        if row is None:
+            row = ForecastAccuracy(
+                symbol=symbol, model_name=model_name, predictions_evaluated=0, points_evaluated=0,
+                sum_abs_error=0.0, sum_abs_pct_error=0.0, sum_sq_error=0.0, sum_error=0.0,
+                interval_points=0, interval_hits=0
+            )
+            db.add(row)
+        row.predictions_evaluated += int(agg["predictions"])
+        row.points_evaluated += int(agg["points"])
+        row.sum_abs_error += float(agg["sum_abs_error"])
+        row.sum_abs_pct_error += float(agg["sum_abs_pct_error"])
+        row.sum_sq_error += float(agg["sum_sq_error"])
+        row.sum_error += float(agg["sum_error"])
+        row.interval_points += int(agg["interval_points"])
+        row.interval_hits += int(agg["interval_hits"])
+        n = row.points_evaluated
+        row.mae = row.sum_abs_error / n
+        row.mape = row.sum_abs_pct_error / n
+        row.rmse = float(np.sqrt(row.sum_sq_error / n))
+        row.bias = row.sum_error / n
+        row.interval_coverage = row.interval_hits / row.interval_points if row.interval_points else None
+        row.updated_at = datetime.utcnow()
+
+    # Mark done: everything evaluated, plus points-free rows; rows of symbols without data are retried
+    fetched = set(closes["symbol"].unique()) if closes is not None and not closes.empty else set()
+    done = points[points["symbol"].isna() | points["symbol"].isin(fetched)]["row_id"].unique().tolist()
+    now = datetime.utcnow()
+    for start in range(0, len(done), UPDATE_CHUNK):
+        db.query(PredictionHistory).filter(PredictionHistory.id.in_(done[start:start + UPDATE_CHUNK])).update(
+            {PredictionHistory.evaluated_at: now}, synchronize_session=False
+        )
+    db.commit()
+
+    summary = {"predictions": len(done), "points": int(len(joined)), "pairs": int(len(sums))}
+    metrics.observe("accuracy", "update_seconds", time.monotonic() - started)
+    metrics.increment("accuracy", "points", summary["points"])
+    return summary
+
+def lookup(db: Session, symbol: str) -> List[ForecastAccuracy]:
+    """Realized accuracy rows for symbol (one indexed lookup)"""
+    return db.query(ForecastAccuracy).filter(ForecastAccuracy.symbol == symbol.upper()).all()
+
+def lookup_many(db: Session, symbols: List[str]) -> Dict[str, List[ForecastAccuracy]]:
+    """Realized accuracy rows for many symbols in one query, keyed by upper-cased symbol"""
+    rows = {symbol.upper(): [] for symbol in symbols}
+    for row in db.query(ForecastAccuracy).filter(ForecastAccuracy.symbol.in_(list(rows))):
+        rows[row.symbol].append(row)
+    return rows
+
+if __name__ == "__main__":
+    from app.db.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(update(session))
+    finally:
+        session.close()
@@ -0,0 +1,193 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.services import snapshots, training_pool
+from app.services.prediction import build_model, build_xy
+
+preprocessing = lazy_import("sklearn.preprocessing")
+sklearn_metrics = lazy_import("sklearn.metrics")
+
+def walk_forward_splits(
+    n_rows: int,
+    n_folds: int,
+    gap: int,
+    expanding: bool = True,
+    min_train: int = 20
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Chronological (train_start, train_end, test_start, test_end) index ranges.
+    Test blocks are contiguous and in order; training rows stop `gap` rows before
+    each test block so shifted targets never overlap the test period.
+    """
+    # Same sizing as sklearn's TimeSeriesSplit: the first training block is one test block long
+    test_size = (n_rows - gap) // (n_folds + 1)
+    if test_size < 2 or n_rows - n_folds * test_size - gap < min_train:
+        raise HTTPException(status_code=400, detail="Not enough history for the requested number of folds")
+
+    # Rolling windows keep the first fold's training length, expanding windows grow
+    train_length = n_rows - n_folds * test_size - gap
+    splits = []
+    for fold in range(n_folds):
+        test_start = n_rows - (n_folds - fold) * test_size
+        test_end = test_start + test_size
+        train_end = test_start - gap
+        train_start = 0 if expanding else max(0, train_end - train_length)
+        splits.append((train_start, train_end, test_start, test_end))
+    return splits
+
+def _run_fold(model_names: List[str], x_train, y_train, x_test, y_test, deadline: float) -> Dict:
+    # Runs in a training pool worker: fit one scaler per fold and reuse it for every model.
+    # Models not started by the deadline (wall clock) are left out of the results
+    scaler = preprocessing.StandardScaler().fit(x_train)
+    x_train = scaler.transform(x_train)
+    x_test = scaler.transform(x_test)
+
+    results = {}
+    for name in model_names:
+        if time.time() >= deadline:
+            break
+        started = time.perf_counter()
+        model = build_model(name)
+        model.fit(x_train, y_train)
+        preds = model.predict(x_test)
+        results[name] = {
+            "r2_score": float(sklearn_metrics.r2_score(y_test, preds)),
+            "mae": float(sklearn_metrics.mean_absolute_error(y_test, preds)),
+            "rmse": float(np.sqrt(sklearn_metrics.mean_squared_error(y_test, preds))),
+            "direction_accuracy": float(np.mean(np.sign(np.diff(preds)) == np.sign(np.diff(y_test)))) if len(y_test) > 1 else None,
+            "fit_seconds": time.perf_counter() - started,
+            "predictions": preds.tolist(),
+        }
+    return results
+
+def _train_fold(deadline: float, tier: str, *args) -> Optional[Dict]:
+    # Folds still queued at the deadline never take a training slot
+    if time.time() >= deadline:
+        return None
+    return training_pool.run(_run_fold, *args, deadline, tier=tier)
+
+def run_backtest(
+    data: pd.DataFrame,
+    symbol: str,
+    model_names: List[str],
+    days_forecast: int,
+    n_folds: int,
+    time_budget: float,
+    feature_set: str = "close",
+    expanding: bool = True,
+    tier: str = "free"
+) -> Dict:
+    """
+    Walk-forward backtest of model_names on data, training folds in parallel.
+    Folds still running when time_budget seconds elapse are reported as skipped;
+    they stop before their next model, so no training outlives the budget by
+    more than one fit.
+    """
+    started = time.monotonic()
+    x, target = build_xy(data, days_forecast, feature_set, symbol)
+    # The last days_forecast rows have no realized target yet
+    x, y = x[:-days_forecast], target[:-days_forecast]
+    dates = data.index[-len(target):][:-days_forecast]
+
+    splits = walk_forward_splits(len(x), n_folds, gap=days_forecast, expanding=expanding)
+
+    deadline = time.time() + time_budget
+    executor = ThreadPoolExecutor(max_workers=max(1, min(n_folds, settings.TRAINING_CONCURRENCY.get(tier, 1))))
+    futures = [
+        executor.submit(
+            _train_fold, deadline, tier, model_names,
+            x[train_start:train_end], y[train_start:train_end],
+            x[test_start:test_end], y[test_start:test_end]
+        )
+        for train_start, train_end, test_start, test_end in splits
+    ]
+    wait(futures, timeout=time_budget)
+    # Do not block on folds past the budget; queued ones are cancelled and running
+    # ones stop at their next model
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    folds = []
+    pooled = {name: {"y": [], "preds": []} for name in model_names}
+    for fold, ((train_start, train_end, test_start, test_end), future) in enumerate(zip(splits, futures)):
+        fold_info = {
+            "fold": fold,
+            "train_start": str(dates[train_start].date()),
+            "train_end": str(dates[train_end - 1].date()),
+            "test_start": str(dates[test_start].date()),
+            "test_end": str(dates[test_end - 1].date()),
+            "train_rows": train_end - train_start,
+            "test_rows": test_end - test_start,
+        }
+        if not future.done() or future.cancelled():
+            fold_info["status"] = "skipped"
+            folds.append(fold_info)
+            continue
+        try:
+            fold_results = future.result()
+        except Exception as e:
+            fold_info["status"] = "error"
+            fold_info["error"] = e.detail if isinstance(e, HTTPException) else str(e)
+            folds.append(fold_info)
+            continue
+        if not fold_results:
+            fold_info["status"] = "skipped"
+            folds.append(fold_info)
+            continue
+
+        skipped_models = [name for name in model_names if name not in fold_results]
+        fold_info["status"] = "partial" if skipped_models else "ok"
+        if skipped_models:
+            fold_info["skipped_models"] = skipped_models
+        fold_info["models"] = {}
+        for name, result in fold_results.items():
+            pooled[name]["y"].extend(y[test_start:test_end].tolist())
+            pooled[name]["preds"].extend(result.pop("predictions"))
+            fold_info["models"][name] = result
+        folds.append(fold_info)
+
+    summary = {}
+    for name in model_names:
+        fold_metrics = [f["models"][name] for f in folds if name in f.get("models", {})]
+        if not fold_metrics:
+            summary[name] = {"folds_completed": 0}
+            continue
+        y_all, preds_all = np.asarray(pooled[name]["y"]), np.asarray(pooled[name]["preds"])
+        summary[name] = {
+            "folds_completed": len(fold_metrics),
+            "mean_r2_score": float(np.mean([m["r2_score"] for m in fold_metrics])),
+            "mean_mae": float(np.mean([m["mae"] for m in fold_metrics])),
+            "mean_rmse": float(np.mean([m["rmse"] for m in fold_metrics])),
+            "pooled_r2_score": float(sklearn_metrics.r2_score(y_all, preds_all)),
+            "pooled_mae": float(sklearn_metrics.mean_absolute_error(y_all, preds_all)),
+        }
+
+    ranking = sorted(
+        (name for name in model_names if summary[name]["folds_completed"]),
+        key=lambda name: summary[name]["pooled_mae"]
+    )
+
+    elapsed = time.monotonic() - started
+    metrics.observe("backtest", "run_seconds", elapsed)
+
+    return {
+        "symbol": symbol,
+        "days_forecast": days_forecast,
+        "feature_set": feature_set,
+        "window": "expanding" if expanding else "rolling",
+        "snapshot": snapshots.save_snapshot(data),
+        "n_folds": n_folds,
+        "time_budget": time_budget,
+        "elapsed_seconds": elapsed,
+        "completed": all(f["status"] == "ok" for f in folds),
+        "ranking": ranking,
+        "summary": summary,
+        "folds": folds
+    }
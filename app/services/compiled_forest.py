@@ -0,0 +1,118 @@
+import time
+from typing import Any
+
+import numpy as np
+
+from app.core.lazy import lazy_import
+
+ensemble = lazy_import("sklearn.ensemble")
+
+# Ensembles whose trees can be flattened into node arrays
+COMPILABLE_MODELS = ("RandomForestRegressor", "ExtraTreesRegressor")
+
+def _compilable_classes() -> tuple:
+    return tuple(getattr(ensemble, name) for name in COMPILABLE_MODELS)
+
+class CompiledForest:
+    """
+    Fitted RandomForest/ExtraTrees regressor flattened into contiguous node arrays
+    (feature, threshold, left, right, value) for all trees. predict walks every
+    tree for every row at once, one tree level per NumPy step.
+
+    Leaves point to themselves with threshold +inf, so rows that reach a leaf
+    early simply stay there while deeper trees finish.
+    """
+
+    def __init__(self, estimator: Any):
+        trees = [tree.tree_ for tree in estimator.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+
+        self.estimator = estimator
+        self.n_outputs = estimator.n_outputs_
+        self.n_trees = len(trees)
+        self.roots = offsets.astype(np.intp)
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left < 0
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            value.append(tree.value[:, :, 0])
+
+        self.feature = np.ascontiguousarray(np.concatenate(feature), dtype=np.intp)
+        self.threshold = np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64)
+        self.left = np.ascontiguousarray(np.concatenate(left), dtype=np.intp)
+        self.right = np.ascontiguousarray(np.concatenate(right), dtype=np.intp)
+        self.value = np.ascontiguousarray(np.concatenate(value), dtype=np.float64)
+        self.is_leaf = self.left == np.arange(len(self.left))
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        """Leaf node index reached by every row in every tree, shape (n_rows, n_trees)"""
+        # sklearn compares float32 features against float64 thresholds
+        x = np.asarray(x, dtype=np.float32)
+        rows = np.arange(len(x))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(x), self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            go_left = x[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            if self.is_leaf[nodes].all():
+                break
+        return nodes
+
+    def predict_trees(self, x: np.ndarray) -> np.ndarray:
+        """Per-tree predictions, shape (n_rows, n_trees) or (n_rows, n_trees, n_outputs)"""
+        values = self.value[self.apply(x)]
+        return values[:, :, 0] if self.n_outputs == 1 else values
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """Ensemble mean, matching the wrapped estimator's predict"""
+        return self.predict_trees(x).mean(axis=1)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything not compiled (get_params, feature_importances_, ...) comes from the estimator
+        estimator = self.__dict__.get("estimator")
+        if estimator is None:
+            raise AttributeError(name)
+        return getattr(estimator, name)
+
+    def __getstate__(self):
+        # Persist only the sklearn model; node arrays are rebuilt on load
+        return {"estimator": self.estimator}
+
+    def __setstate__(self, state):
+        self.__init__(state["estimator"])
+
+def compile_model(model: Any) -> Any:
+    """Return a CompiledForest for supported fitted ensembles, otherwise the model itself"""
+    if type(model).__name__ in COMPILABLE_MODELS and isinstance(model, _compilable_classes()) and hasattr(model, "estimators_"):
+        return CompiledForest(model)
+    return model
+
+def _benchmark(n_train: int = 500, n_predict: int = 30, n_features: int = 19, repeat: int = 200) -> None:
+    """Predict latency against sklearn for each supported ensemble (parity is covered by the tests)"""
+    rng = np.random.default_rng(7)
+    x = rng.normal(size=(n_train, n_features))
+    y = x[:, 0] * 3 + np.sin(x[:, 1]) + rng.normal(scale=0.1, size=n_train)
+    x_new = rng.normal(size=(n_predict, n_features))
+
+    for model_class in _compilable_classes():
+        model = model_class(random_state=7, n_jobs=1).fit(x, y)
+        compiled = CompiledForest(model)
+        timings = {}
+        for name, predict in (("sklearn", model.predict), ("compiled", compiled.predict)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                predict(x_new)
+            timings[name] = (time.perf_counter() - started) / repeat * 1000
+        print(
+            f"{model_class.__name__}: predict {n_predict} rows "
+            f"sklearn {timings['sklearn']:.3f} ms, compiled {timings['compiled']:.3f} ms "
+            f"({timings['sklearn'] / timings['compiled']:.1f}x)"
+        )
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core import metrics
+
+FEATURE_SETS = ["close", "engineered"]
+
+# Feature construction parameters
+CLOSE_LAGS = 5
+RETURN_LAGS = 5
+VOLATILITY_WINDOW = 10
+VOLUME_WINDOW = 20
+RSI_WINDOW = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_WINDOW, BB_DEV = 20, 2
+
+# Rows needed before every feature is defined
+WARMUP = max(CLOSE_LAGS, RETURN_LAGS + 1, VOLATILITY_WINDOW + 1, VOLUME_WINDOW, RSI_WINDOW, MACD_SLOW + MACD_SIGNAL, BB_WINDOW) - 1
+
+FEATURE_CACHE_SIZE = 256
+_feature_cache: "OrderedDict[Tuple, Tuple[np.ndarray, List[str]]]" = OrderedDict()
+_lock = threading.Lock()
+
+def _column(data: pd.DataFrame, name: str) -> np.ndarray:
+    # yfinance may return a single-ticker MultiIndex frame, so flatten to 1-D
+    return np.asarray(data[name], dtype=np.float64).reshape(-1)
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+def _rsi(close: np.ndarray, window: int) -> np.ndarray:
+    # Wilder smoothing, matching ta.momentum.RSIIndicator
+    diff = np.diff(close, prepend=np.nan)
+    gain = pd.Series(np.where(diff > 0, diff, 0.0))
+    loss = pd.Series(np.where(diff < 0, -diff, 0.0))
+    avg_gain = gain.ewm(alpha=1 / window, min_periods=window, adjust=False).mean().to_numpy()
+    avg_loss = loss.ewm(alpha=1 / window, min_periods=window, adjust=False).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        rsi = 100 - 100 / (1 + rs)
+    return np.where(avg_loss == 0, 100.0, rsi)
+
+def _trailing_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """(n, window) strided view where row t holds values[t-window+1 .. t], NaN padded"""
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    return sliding_window_view(padded, window)
+
+def compute_features(data: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+    """
+    Build the engineered feature matrix for every bar in data.
+    Returns a C-contiguous float32 (n_bars - WARMUP, n_features) array and the column names.
+    """
+    close = _column(data, "Close")
+    volume = _column(data, "Volume") if "Volume" in data else np.ones_like(close)
+
+    log_close = np.log(close)
+    returns = np.diff(log_close, prepend=np.nan)
+
+    close_lags = _trailing_windows(close, CLOSE_LAGS)[:, ::-1]  # close_t, close_t-1, ...
+    return_lags = _trailing_windows(returns, RETURN_LAGS)[:, ::-1]
+    volatility = np.std(_trailing_windows(returns, VOLATILITY_WINDOW), axis=1)
+
+    log_volume = np.log1p(volume)
+    volume_ratio = volume / np.mean(_trailing_windows(volume, VOLUME_WINDOW), axis=1)
+
+    macd = _ema(close, MACD_FAST) - _ema(close, MACD_SLOW)
+    macd_signal = _ema(macd, MACD_SIGNAL)
+
+    bb_windows = _trailing_windows(close, BB_WINDOW)
+    bb_mean = np.mean(bb_windows, axis=1)
+    bb_std = np.std(bb_windows, axis=1)
+    bb_high = bb_mean + BB_DEV * bb_std
+    bb_low = bb_mean - BB_DEV * bb_std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bb_percent = np.where(bb_high > bb_low, (close - bb_low) / (bb_high - bb_low), 0.5)
+        bb_width = (bb_high - bb_low) / bb_mean
+
+    columns = [
+        close_lags,
+        return_lags,
+        volatility[:, None],
+        log_volume[:, None],
+        volume_ratio[:, None],
+        _rsi(close, RSI_WINDOW)[:, None],
+        macd[:, None],
+        macd_signal[:, None],
+        (macd - macd_signal)[:, None],
+        bb_percent[:, None],
+        bb_width[:, None],
+    ]
+    names = (
+        [f"close_lag_{i}" for i in range(CLOSE_LAGS)]
+        + [f"log_return_lag_{i}" for i in range(RETURN_LAGS)]
+        + ["volatility", "log_volume", "volume_ratio", "rsi", "macd", "macd_signal", "macd_diff", "bb_percent", "bb_width"]
+    )
+
+    matrix = np.hstack(columns)[WARMUP:]
+    matrix = np.ascontiguousarray(np.nan_to_num(matrix, nan=0.0, posinf=0.0, neginf=0.0), dtype=np.float32)
+    return matrix, names
+
+def get_features(symbol: Optional[str], data: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+    """Return the engineered feature matrix, cached per (symbol, first bar, last bar, bar count)"""
+    if symbol is None or data.empty:
+        return compute_features(data)
+
+    key = (symbol.upper(), data.index[0], data.index[-1], len(data))
+    with _lock:
+        cached = _feature_cache.get(key)
+        if cached is not None:
+            _feature_cache.move_to_end(key)
+            metrics.increment("features", "cache_hits")
+            return cached
+
+    metrics.increment("features", "cache_misses")
+    features = compute_features(data)
+    with _lock:
+        _feature_cache[key] = features
+        while len(_feature_cache) > FEATURE_CACHE_SIZE:
+            _feature_cache.popitem(last=False)
+    return features
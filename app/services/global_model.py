@@ -0,0 +1,235 @@
+"""
+Global cross-symbol forecaster.
+
+One multi-output model is trained offline on scale-free return features pooled
+across a symbol universe and saved as a versioned artifact. Serving it is
+inference only, so any ticker (including ones never seen) gets a forecast
+without training.
+
+Train a new version with:
+
+    python -m app.services.global_model --symbols AAPL MSFT ... --years 5
+"""
+import argparse
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.services.model_registry import GLOBAL_MODEL_NAME
+
+joblib = lazy_import("joblib")
+linear_model = lazy_import("sklearn.linear_model")
+sklearn_metrics = lazy_import("sklearn.metrics")
+
+# Daily log returns in the input window, and the longest horizon served
+RETURN_LAGS = 20
+MAX_HORIZON = 60
+
+# Default training universe (large, liquid US names and ETFs)
+DEFAULT_UNIVERSE = [
+    "AAPL", "MSFT", "AMZN", "GOOGL", "META", "NVDA", "TSLA", "JPM", "V", "JNJ",
+    "WMT", "PG", "XOM", "UNH", "HD", "MA", "BAC", "KO", "PEP", "DIS",
+    "CSCO", "INTC", "ORCL", "NFLX", "ADBE", "CRM", "T", "VZ", "SPY", "QQQ",
+]
+
+_loaded: Optional[Dict] = None
+_loaded_from: Optional[Tuple[str, float]] = None
+_lock = threading.Lock()
+
+def build_features(close: np.ndarray, lags: int = RETURN_LAGS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row t holds the `lags` daily log returns ending at bar t divided by their
+    standard deviation, plus the log of that volatility. Returns (x, volatility),
+    aligned to bars lags .. len(close) - 1.
+    """
+    returns = np.diff(np.log(close))
+    windows = sliding_window_view(returns, lags)
+    volatility = windows.std(axis=1) + 1e-8
+    x = np.column_stack([windows / volatility[:, None], np.log(volatility)])
+    return np.ascontiguousarray(x, dtype=np.float64), volatility
+
+def build_targets(close: np.ndarray, volatility: np.ndarray, lags: int = RETURN_LAGS, horizon: int = MAX_HORIZON) -> np.ndarray:
+    """Forward log returns for horizons 1..horizon in volatility units, for rows that have them"""
+    log_close = np.log(close)[lags:]
+    future = sliding_window_view(log_close[1:], horizon)
+    return (future - log_close[:len(future), None]) / volatility[:len(future), None]
+
+def _close(data: pd.DataFrame) -> np.ndarray:
+    close = np.asarray(data["Close"], dtype=np.float64).reshape(-1)
+    return close[~np.isnan(close)]
+
+def _version_dir() -> str:
+    return os.path.join(settings.MODEL_CACHE_DIR, "global")
+
+def _artifact_path(version: str) -> str:
+    return os.path.join(_version_dir(), f"global-{version}.joblib")
+
+def _latest_path() -> str:
+    return os.path.join(_version_dir(), "LATEST")
+
+def train(frames: Dict[str, pd.DataFrame], holdout: float = 0.2, alpha: float = 10.0) -> Dict:
+    """
+    Fit the global model on every symbol in frames. The last `holdout` share of
+    each symbol's rows is held out (chronologically) for the reported metrics,
+    then the model is refit on all rows.
+    """
+    x_train, y_train, x_test, y_test = [], [], [], []
+    for symbol, data in frames.items():
+        close = _close(data)
+        if len(close) <= RETURN_LAGS + MAX_HORIZON + 10:
+            continue
+        x, volatility = build_features(close)
+        y = build_targets(close, volatility)
+        x = x[:len(y)]
+        split = int(len(y) * (1 - holdout))
+        # Drop rows whose targets reach into the holdout period
+        x_train.append(x[:max(0, split - MAX_HORIZON)])
+        y_train.append(y[:max(0, split - MAX_HORIZON)])
+        x_test.append(x[split:])
+        y_test.append(y[split:])
+    if not x_train:
+        raise ValueError("No symbol has enough history to train the global model")
+
+    x_train, y_train = np.concatenate(x_train), np.concatenate(y_train)
+    x_test, y_test = np.concatenate(x_test), np.concatenate(y_test)
+
+    model = linear_model.Ridge(alpha=alpha).fit(x_train, y_train)
+    preds = model.predict(x_test)
+    holdout_metrics = {
+        "r2_by_horizon": sklearn_metrics.r2_score(y_test, preds, multioutput="raw_values").tolist(),
+        "mae_by_horizon": sklearn_metrics.mean_absolute_error(y_test, preds, multioutput="raw_values").tolist(),
+        "train_rows": int(len(x_train)),
+        "test_rows": int(len(x_test)),
+    }
+
+    model = linear_model.Ridge(alpha=alpha).fit(np.concatenate([x_train, x_test]), np.concatenate([y_train, y_test]))
+    return {
+        "model": model,
+        "version": datetime.utcnow().strftime("%Y%m%d%H%M%S"),
+        "trained_at": datetime.utcnow().isoformat(),
+        "symbols": sorted(frames),
+        "return_lags": RETURN_LAGS,
+        "max_horizon": MAX_HORIZON,
+        "metrics": holdout_metrics,
+    }
+
+def save(artifact: Dict) -> str:
+    """Write a versioned artifact and point LATEST at it"""
+    os.makedirs(_version_dir(), exist_ok=True)
+    path = _artifact_path(artifact["version"])
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, path)
+
+    tmp_latest = f"{_latest_path()}.{os.getpid()}.tmp"
+    with open(tmp_latest, "w") as f:
+        f.write(artifact["version"])
+    os.replace(tmp_latest, _latest_path())
+    return path
+
+def load() -> Dict:
+    """
+    The served artifact: GLOBAL_MODEL_VERSION when pinned, otherwise the one
+    LATEST points to. Reloaded only when that file changes.
+    """
+    global _loaded, _loaded_from
+    version = settings.GLOBAL_MODEL_VERSION
+    if not version:
+        try:
+            with open(_latest_path()) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            raise HTTPException(status_code=503, detail="No global model has been trained yet")
+
+    path = _artifact_path(version)
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail=f"Global model version {version} not found")
+
+    with _lock:
+        if _loaded is None or _loaded_from != (path, mtime):
+            _loaded = joblib.load(path)
+            _loaded_from = (path, mtime)
+            metrics.increment("global_model", "loads")
+        return _loaded
+
+def predict(
+    data: pd.DataFrame,
+    symbol: str,
+    days_forecast: int,
+    end_date: datetime
+) -> Dict:
+    """
+    Forecast the next days_forecast days for any symbol with the global model
+    (inference only). r2/mae are measured on this symbol's own recent bars.
+    """
+    started = time.perf_counter()
+    artifact = load()
+    if days_forecast > artifact["max_horizon"]:
+        raise HTTPException(status_code=400, detail=f"The global model forecasts at most {artifact['max_horizon']} days")
+
+    close = _close(data)
+    if len(close) <= artifact["return_lags"] + days_forecast + 1:
+        raise HTTPException(status_code=400, detail="Not enough history for the global model, increase training_days")
+
+    lags = artifact["return_lags"]
+    x, volatility = build_features(close, lags)
+    preds = artifact["model"].predict(x)[:, :days_forecast]
+
+    # Price path from the latest bar
+    latest = close[-1] * np.exp(preds[-1] * volatility[-1])
+
+    # Check on this symbol's window: realized price days_forecast ahead vs the forecast for it
+    log_close = np.log(close)[lags:]
+    realized = np.exp(log_close[days_forecast:])
+    forecast = np.exp(log_close[:-days_forecast] + preds[:-days_forecast, -1] * volatility[:-days_forecast])
+    r2 = float(sklearn_metrics.r2_score(realized, forecast)) if len(realized) > 1 else None
+    mae = float(sklearn_metrics.mean_absolute_error(realized, forecast))
+
+    metrics.observe("global_model", "predict_seconds", time.perf_counter() - started)
+
+    prediction_dates = [(end_date + timedelta(days=i+1)).strftime("%Y-%m-%d") for i in range(days_forecast)]
+    return {
+        "symbol": symbol,
+        "model": GLOBAL_MODEL_NAME,
+        "model_version": artifact["version"],
+        "days_forecast": days_forecast,
+        "feature_set": "normalized_returns",
+        "params": {},
+        "predictions": [{"date": date, "price": float(price)} for date, price in zip(prediction_dates, latest)],
+        "r2_score": r2,
+        "mae": mae
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a new global model version")
+    parser.add_argument("--symbols", nargs="+", default=DEFAULT_UNIVERSE, help="Training universe")
+    parser.add_argument("--years", type=int, default=5, help="Years of daily bars per symbol")
+    parser.add_argument("--alpha", type=float, default=10.0, help="Ridge regularization strength")
+    args = parser.parse_args()
+
+    from app.services.prediction import get_bulk_stock_data
+
+    end_date = datetime.now()
+    frames = get_bulk_stock_data([s.upper() for s in args.symbols], end_date - timedelta(days=365 * args.years), end_date)
+    print(f"Downloaded {len(frames)} of {len(args.symbols)} symbols")
+
+    artifact = train(frames, alpha=args.alpha)
+    path = save(artifact)
+    r2 = artifact["metrics"]["r2_by_horizon"]
+    print(f"Saved global model {artifact['version']} to {path}")
+    print(f"Holdout r2 at 1/5/20 days: {r2[0]:.4f} / {r2[4]:.4f} / {r2[19]:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import threading
+from typing import Any, Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+# Environment variables read by BLAS/OpenMP runtimes when they are first loaded
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+_lock = threading.Lock()
+_allocated = 0
+# Threads granted to the training task running on this thread, if any
+_task = threading.local()
+
+def set_thread_env() -> None:
+    """Cap BLAS/OpenMP threads for processes started after this call (e.g. pool workers)"""
+    for name in THREAD_ENV_VARS:
+        os.environ.setdefault(name, str(settings.BLAS_THREADS))
+
+def apply_process_limits() -> None:
+    """Cap BLAS/OpenMP threads in the current, already running process"""
+    set_thread_env()
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(limits=settings.BLAS_THREADS)
+
+def cpu_budget() -> int:
+    """Total threads training may use on this node"""
+    return settings.CPU_BUDGET or os.cpu_count() or 1
+
+def acquire_threads(tier: str, limit: Optional[int] = None) -> int:
+    """
+    Reserve threads for one training run: the tier's cap (or limit, if lower, for
+    single-threaded models), reduced to what is left of the node's CPU budget
+    (never less than one)
+    """
+    global _allocated
+    cap = settings.TRAINING_THREAD_CAPS.get(tier, 1)
+    if limit is not None:
+        cap = min(cap, limit)
+    with _lock:
+        available = max(1, cpu_budget() - _allocated)
+        threads = max(1, min(cap, available))
+        _allocated += threads
+        allocated = _allocated
+    metrics.observe("governor", f"{tier}_threads", threads)
+    metrics.observe("governor", "allocated_threads", allocated)
+    return threads
+
+def release_threads(threads: int) -> None:
+    """Return threads reserved by acquire_threads"""
+    global _allocated
+    with _lock:
+        _allocated = max(0, _allocated - threads)
+
+def allocated_threads() -> int:
+    """Threads currently reserved by running trainings"""
+    with _lock:
+        return _allocated
+
+def configure_threads(model: Any, threads: int) -> Any:
+    """Set n_jobs (sklearn, XGBoost's nthread alias) on estimators that support it"""
+    if hasattr(model, "get_params") and "n_jobs" in model.get_params():
+        model.set_params(n_jobs=threads)
+    return model
+
+def task_threads():
+    """Threads granted to the task running on the current thread, or None outside a task"""
+    return getattr(_task, "threads", None)
+
+def run_with_threads(threads: int, func, *args) -> Any:
+    """
+    Run func(*args) limited to threads: BLAS/OpenMP pools are capped, estimator
+    arguments get n_jobs=threads, and build_model applies it to models created inside
+    """
+    _task.threads = threads
+    try:
+        for arg in args:
+            configure_threads(arg, threads)
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            return func(*args)
+        with threadpool_limits(limits=threads):
+            return func(*args)
+    finally:
+        _task.threads = None
@@ -0,0 +1,110 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.sentiment import HeadlineSentiment
+from app.services import lexicon_sentiment
+
+# Identifies how scores were produced; stored scores from another scorer are not reused.
+# The compiled lexicon reproduces TextBlob's scores, so its rows stay valid.
+SCORER = "textblob"
+
+# Most recently used headline scores, in front of the headline_sentiments table
+_memory: "OrderedDict[str, Dict]" = OrderedDict()
+_lock = threading.Lock()
+
+def text_hash(text: str) -> str:
+    """Key of a headline: SHA-256 of its stripped text"""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+def category(polarity: float) -> str:
+    """Map polarity (-1 to 1) to a sentiment category"""
+    if polarity > 0.2:
+        return "positive"
+    if polarity < -0.2:
+        return "negative"
+    return "neutral"
+
+def analyze(texts: List[str]) -> List[Dict]:
+    """Analyze sentiment of texts in one batch with the compiled TextBlob lexicon"""
+    polarity, subjectivity = lexicon_sentiment.score(texts)
+    return [
+        {"polarity": p, "subjectivity": s, "category": category(p)}
+        for p, s in zip(polarity.tolist(), subjectivity.tolist())
+    ]
+
+def _remember(scores: Dict[str, Dict]) -> None:
+    with _lock:
+        for key, score in scores.items():
+            _memory[key] = score
+            _memory.move_to_end(key)
+        while len(_memory) > settings.SENTIMENT_MEMORY_ITEMS:
+            _memory.popitem(last=False)
+
+def _store(db, scores: Dict[str, Dict]) -> None:
+    rows = [HeadlineSentiment(text_hash=key, scorer=SCORER, **score) for key, score in scores.items()]
+    try:
+        with db.begin_nested():
+            db.add_all(rows)
+    except IntegrityError:
+        # Another worker stored some of them first; keep theirs and add the rest
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.add(HeadlineSentiment(
+                        text_hash=row.text_hash, scorer=SCORER, polarity=row.polarity,
+                        subjectivity=row.subjectivity, category=row.category
+                    ))
+            except IntegrityError:
+                pass
+    db.commit()
+
+def score(texts: List[str]) -> List[Dict]:
+    """
+    Sentiment of every text, in order. Texts are looked up in memory first,
+    then in headline_sentiments with a single query; only texts never seen
+    before are scored, and those are stored for every later request and worker.
+    """
+    keys = [text_hash(text) for text in texts]
+    found = {}
+    with _lock:
+        for key in keys:
+            cached = _memory.get(key)
+            if cached is not None:
+                _memory.move_to_end(key)
+                found[key] = cached
+    missing = {key: text for key, text in zip(keys, texts) if key not in found}
+    metrics.increment("headline_sentiment", "memory_hits", len(found))
+
+    if missing:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(HeadlineSentiment)
+                .filter(HeadlineSentiment.scorer == SCORER, HeadlineSentiment.text_hash.in_(list(missing)))
+                .all()
+            )
+            loaded = {
+                row.text_hash: {"polarity": row.polarity, "subjectivity": row.subjectivity, "category": row.category}
+                for row in rows
+            }
+            unseen = {key: text for key, text in missing.items() if key not in loaded}
+            scored = dict(zip(unseen, analyze(list(unseen.values()))))
+            if scored:
+                _store(db, scored)
+        finally:
+            db.close()
+        metrics.increment("headline_sentiment", "db_hits", len(loaded))
+        metrics.increment("headline_sentiment", "scored", len(scored))
+        found.update(loaded)
+        found.update(scored)
+        _remember({**loaded, **scored})
+
+    # Copies, so callers cannot change the remembered scores
+    return [dict(found[key]) for key in keys]
@@ -0,0 +1,105 @@
+"""
+Shared async HTTP client for outbound scraping (news pages).
+
+One httpx.AsyncClient per process keeps connections (and TLS sessions) alive
+between requests and negotiates HTTP/2 when the h2 package is installed.
+Requests to the same host are limited to HTTP_PER_HOST_LIMIT at a time, and
+transport errors and 429/5xx responses are retried with jittered exponential
+backoff. The API opens the client at startup and closes it at shutdown.
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core import metrics
+from app.core.config import settings
+
+# Statuses worth retrying: rate limited or a temporarily unavailable upstream
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+_client: Optional[httpx.AsyncClient] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=_http2_available(),
+        headers=BROWSER_HEADERS,
+        timeout=settings.HTTP_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+async def start() -> None:
+    """Open the shared client"""
+    global _client
+    if _client is None:
+        _client = _create_client()
+
+async def close() -> None:
+    """Close the shared client and its pooled connections"""
+    global _client
+    client, _client = _client, None
+    _host_slots.clear()
+    if client is not None:
+        await client.aclose()
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client (opened on first use outside the API, e.g. in scripts)"""
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+def _host_slot(host: str) -> asyncio.Semaphore:
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(settings.HTTP_PER_HOST_LIMIT)
+    return slot
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    """
+    GET url through the shared client. Retries up to HTTP_RETRIES times on
+    transport errors and retryable statuses, sleeping a random 0..backoff*2^attempt
+    seconds between attempts; raises httpx.HTTPError when every attempt fails.
+    """
+    client = get_client()
+    host = urlsplit(url).netloc
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        try:
+            async with _host_slot(host):
+                response = await client.get(url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt >= settings.HTTP_RETRIES:
+                response.raise_for_status()
+                metrics.observe("http_client", "request_seconds", time.perf_counter() - started)
+                return response
+        except httpx.TransportError:
+            if attempt >= settings.HTTP_RETRIES:
+                metrics.increment("http_client", "failures")
+                raise
+        except httpx.HTTPStatusError:
+            metrics.increment("http_client", "failures")
+            raise
+        attempt += 1
+        metrics.increment("http_client", "retries")
+        await asyncio.sleep(random.uniform(0, settings.HTTP_RETRY_BACKOFF * 2 ** attempt))
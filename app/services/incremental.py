@@ -0,0 +1,207 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.services import model_registry, snapshots, training_pool
+from app.services.prediction import build_model, build_xy
+
+joblib = lazy_import("joblib")
+linear_model = lazy_import("sklearn.linear_model")
+preprocessing = lazy_import("sklearn.preprocessing")
+sklearn_metrics = lazy_import("sklearn.metrics")
+
+# Models with an incremental update path. LinearRegression is served by an
+# SGD regressor with squared loss (same model family, trainable with partial_fit).
+INCREMENTAL_MODELS = model_registry.incremental_models()
+
+INITIAL_SGD_EPOCHS = 50
+XGB_INITIAL_TREES = 100
+# New bars are boosted in batches of at least XGB_UPDATE_MIN_ROWS, one round per
+# row up to XGB_UPDATE_TREES; past XGB_MAX_TREES the booster is refitted from scratch
+XGB_UPDATE_MIN_ROWS = 5
+XGB_UPDATE_TREES = 10
+XGB_MAX_TREES = 200
+
+_key_locks: Dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+def _state_key(symbol: str, model_name: str, days_forecast: int, feature_set: str) -> str:
+    raw = f"{symbol.upper()}|{model_name}|{days_forecast}|{feature_set}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def _state_path(key: str) -> str:
+    return os.path.join(settings.MODEL_CACHE_DIR, "incremental", f"{key}.joblib")
+
+def _lock_for(key: str) -> threading.Lock:
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
+
+def load_state(key: str) -> Optional[Dict]:
+    path = _state_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path)
+    except Exception:
+        metrics.increment("incremental", "state_errors")
+        return None
+
+def save_state(key: str, state: Dict) -> None:
+    path = _state_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+def _initial_fit(model_name: str, x: np.ndarray, y: np.ndarray) -> Dict:
+    x_scaler = preprocessing.StandardScaler().fit(x)
+    y_scaler = preprocessing.StandardScaler().fit(y.reshape(-1, 1))
+    xs = x_scaler.transform(x)
+    ys = y_scaler.transform(y.reshape(-1, 1)).ravel()
+
+    if model_name == "XGBRegressor":
+        model = build_model("XGBRegressor", {"n_estimators": XGB_INITIAL_TREES})
+        model.fit(xs, ys)
+    else:
+        model = linear_model.SGDRegressor(loss="squared_error", penalty="l2", alpha=1e-4, learning_rate="invscaling")
+        for _ in range(INITIAL_SGD_EPOCHS):
+            model.partial_fit(xs, ys)
+
+    return {"model": model, "x_scaler": x_scaler, "y_scaler": y_scaler}
+
+def _update(model_name: str, state: Dict, x: np.ndarray, y: np.ndarray) -> Dict:
+    """State after learning the new rows x, y"""
+    if model_name == "XGBRegressor":
+        # Trees are split on the original scaling, so the scalers stay frozen;
+        # new rows are fitted as extra boosting rounds (one per row) on the stored booster
+        xs = state["x_scaler"].transform(x)
+        ys = state["y_scaler"].transform(y.reshape(-1, 1)).ravel()
+        model = build_model("XGBRegressor", {"n_estimators": min(XGB_UPDATE_TREES, len(y))})
+        model.fit(xs, ys, xgb_model=state["model"].get_booster())
+        state["model"] = model
+    else:
+        # Running mean/variance of the scalers follow the new rows
+        state["x_scaler"].partial_fit(x)
+        state["y_scaler"].partial_fit(y.reshape(-1, 1))
+        xs = state["x_scaler"].transform(x)
+        ys = state["y_scaler"].transform(y.reshape(-1, 1)).ravel()
+        state["model"].partial_fit(xs, ys)
+    return state
+
+def _learn(
+    model_name: str,
+    state: Dict,
+    x: np.ndarray,
+    y: np.ndarray,
+    x_window: np.ndarray,
+    y_window: np.ndarray,
+    tier: str
+) -> Dict:
+    """State after learning new rows x, y; fits run in the training pool (x_window, y_window: the labeled window)"""
+    threads = model_registry.get(model_name)["threads"]
+    if model_name != "XGBRegressor":
+        return training_pool.run(_update, model_name, state, x, y, tier=tier, threads=threads)
+
+    # Single bars are too few to boost on; hold them until a batch has accumulated
+    x = np.vstack([state.pop("pending_x", x[:0]), x])
+    y = np.concatenate([state.pop("pending_y", y[:0]), y])
+    if len(y) < XGB_UPDATE_MIN_ROWS:
+        state["pending_x"], state["pending_y"] = x, y
+        return state
+
+    rounds = min(XGB_UPDATE_TREES, len(y))
+    if state["model"].get_booster().num_boosted_rounds() + rounds > XGB_MAX_TREES:
+        # Keep the booster (and update latency) bounded: start over on the current window
+        metrics.increment("incremental", "xgb_refits")
+        refitted = training_pool.run(_initial_fit, model_name, x_window, y_window, tier=tier, threads=threads)
+        refitted["rows_seen"] = state.get("rows_seen", 0)
+        return refitted
+    return training_pool.run(_update, model_name, state, x, y, tier=tier, threads=threads)
+
+def _predict(state: Dict, x: np.ndarray) -> np.ndarray:
+    preds = state["model"].predict(state["x_scaler"].transform(x))
+    return state["y_scaler"].inverse_transform(np.asarray(preds).reshape(-1, 1)).ravel()
+
+def update_and_forecast(
+    data: pd.DataFrame,
+    symbol: str,
+    model_name: str,
+    days_forecast: int,
+    end_date: datetime,
+    feature_set: str = "close",
+    tier: str = "free"
+) -> Dict:
+    """
+    Bring the stored incremental model up to date with any bars newer than the
+    last one it has seen, then forecast. The first call trains on the full window.
+    Error on the new rows is measured before they are learned (prequential).
+    Fits and updates run in the training pool under the tier's concurrency and thread caps.
+    """
+    if model_name not in INCREMENTAL_MODELS:
+        raise HTTPException(status_code=400, detail=f"Incremental updates support {', '.join(INCREMENTAL_MODELS)}")
+
+    x, target = build_xy(data, days_forecast, feature_set, symbol)
+    dates = data.index[-len(target):]
+    labeled = len(target) - days_forecast
+    x_labeled, y_labeled, labeled_dates = x[:labeled], target[:labeled], dates[:labeled]
+
+    key = _state_key(symbol, model_name, days_forecast, feature_set)
+    started = time.perf_counter()
+    with _lock_for(key):
+        state = load_state(key)
+        r2, mae = None, None
+        if state is None:
+            state = training_pool.run(
+                _initial_fit, model_name, x_labeled, y_labeled,
+                tier=tier, threads=model_registry.get(model_name)["threads"]
+            )
+            new_rows = labeled
+            mode = "initial"
+        else:
+            new = labeled_dates > state["last_labeled_bar"]
+            new_rows = int(new.sum())
+            mode = "update"
+            if new_rows:
+                preds = _predict(state, x_labeled[new])
+                mae = float(sklearn_metrics.mean_absolute_error(y_labeled[new], preds))
+                r2 = float(sklearn_metrics.r2_score(y_labeled[new], preds)) if new_rows > 1 else None
+                state = _learn(model_name, state, x_labeled[new], y_labeled[new], x_labeled, y_labeled, tier)
+
+        if new_rows:
+            state["last_labeled_bar"] = labeled_dates[-1]
+            state["rows_seen"] = state.get("rows_seen", 0) + new_rows
+            state["updated_at"] = datetime.utcnow()
+            save_state(key, state)
+
+        forecast_pred = _predict(state, x[-days_forecast:])
+
+    metrics.observe("incremental", f"{mode}_seconds", time.perf_counter() - started)
+
+    prediction_dates = [(end_date + timedelta(days=i+1)).strftime("%Y-%m-%d") for i in range(days_forecast)]
+    predictions = [{"date": date, "price": float(price)} for date, price in zip(prediction_dates, forecast_pred)]
+
+    return {
+        "symbol": symbol,
+        "model": model_name,
+        "days_forecast": days_forecast,
+        "feature_set": feature_set,
+        "mode": f"incremental_{mode}",
+        "new_rows": new_rows,
+        "rows_seen": state["rows_seen"],
+        "pending_rows": len(state.get("pending_y", ())),
+        "last_labeled_bar": str(pd.Timestamp(state["last_labeled_bar"]).date()),
+        "snapshot": snapshots.save_snapshot(data),
+        "predictions": predictions,
+        "r2_score": r2,
+        "mae": mae
+    }
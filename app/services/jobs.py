@@ -0,0 +1,226 @@
+import json
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services import result_cache
+from app.services.prediction import get_stock_data, history_days, run_prediction
+from app.services.tuning import load_tuned_params
+
+# Job lifecycle: queued -> fetching -> training -> saving -> completed | failed
+JOB_STAGES = {"queued": 0, "fetching": 10, "training": 40, "saving": 90, "completed": 100, "failed": 100}
+TERMINAL_STATUSES = ("completed", "failed")
+
+class InMemoryJobBackend:
+    """Process-local queue and job store, used when Redis is not configured"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, job: Dict) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+        self._queue.put(job["id"])
+
+    def dequeue(self, timeout: float) -> Optional[Dict]:
+        try:
+            job_id = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def purge(self, older_than: datetime) -> None:
+        cutoff = older_than.isoformat()
+        with self._lock:
+            for job_id in [k for k, v in self._jobs.items()
+                           if v["status"] in TERMINAL_STATUSES and v["updated_at"] < cutoff]:
+                del self._jobs[job_id]
+
+class RedisJobBackend:
+    """Redis list queue with JSON job records, shared by API and worker processes"""
+
+    QUEUE_KEY = "prediction_jobs:queue"
+    JOB_KEY = "prediction_jobs:job:{}"
+
+    def __init__(self, url: str):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def enqueue(self, job: Dict) -> None:
+        self._redis.set(self.JOB_KEY.format(job["id"]), json.dumps(job), ex=settings.JOB_RESULT_TTL)
+        self._redis.lpush(self.QUEUE_KEY, job["id"])
+
+    def dequeue(self, timeout: float) -> Optional[Dict]:
+        item = self._redis.brpop(self.QUEUE_KEY, timeout=max(1, int(timeout)))
+        if item is None:
+            return None
+        return self.get(item[1].decode())
+
+    def update(self, job_id: str, **fields) -> None:
+        job = self.get(job_id)
+        if job is None:
+            return
+        job.update(fields)
+        self._redis.set(self.JOB_KEY.format(job_id), json.dumps(job), ex=settings.JOB_RESULT_TTL)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        raw = self._redis.get(self.JOB_KEY.format(job_id))
+        return json.loads(raw) if raw else None
+
+    def purge(self, older_than: datetime) -> None:
+        # Redis expires job records on its own (JOB_RESULT_TTL)
+        pass
+
+_backend = None
+_workers: List[threading.Thread] = []
+_stop = threading.Event()
+
+def get_backend():
+    """Return the configured job backend (Redis when JOB_BACKEND=redis, else in-memory)"""
+    global _backend
+    if _backend is None:
+        if settings.JOB_BACKEND == "redis" and settings.REDIS_URL:
+            _backend = RedisJobBackend(settings.REDIS_URL)
+        else:
+            _backend = InMemoryJobBackend()
+    return _backend
+
+def submit_prediction_job(
+    user_id: int,
+    tier: str,
+    symbol: str,
+    model_name: str,
+    days_forecast: int,
+    training_days: int,
+    feature_set: str = "close"
+) -> Dict:
+    """Queue a prediction and return its job record"""
+    now = datetime.utcnow().isoformat()
+    job = {
+        "id": uuid.uuid4().hex,
+        "user_id": user_id,
+        "tier": tier,
+        "params": {
+            "symbol": symbol,
+            "model_name": model_name,
+            "days_forecast": days_forecast,
+            "training_days": training_days,
+            "feature_set": feature_set
+        },
+        "status": "queued",
+        "progress": JOB_STAGES["queued"],
+        "created_at": now,
+        "updated_at": now,
+        "prediction_id": None,
+        "result": None,
+        "error": None
+    }
+    get_backend().enqueue(job)
+    metrics.increment("jobs", "submitted")
+    return job
+
+def _set_stage(backend, job_id: str, status: str, **fields) -> None:
+    backend.update(
+        job_id,
+        status=status,
+        progress=JOB_STAGES[status],
+        updated_at=datetime.utcnow().isoformat(),
+        **fields
+    )
+
+def execute_job(backend, job: Dict) -> None:
+    """Run one prediction job end to end, recording progress in the backend"""
+    job_id = job["id"]
+    params = job["params"]
+    started = time.monotonic()
+    queued_for = (datetime.utcnow() - datetime.fromisoformat(job["created_at"])).total_seconds()
+    metrics.observe("jobs", "queue_wait_seconds", queued_for)
+
+    try:
+        _set_stage(backend, job_id, "fetching")
+        end_date = datetime.now()
+        feature_set = params.get("feature_set", "close")
+        start_date = end_date - timedelta(days=history_days(params["training_days"], params["days_forecast"], feature_set))
+        data = get_stock_data(params["symbol"], start_date, end_date)
+
+        db = SessionLocal()
+        try:
+            tuned = load_tuned_params(db, [params["symbol"]], [params["model_name"]], [feature_set])
+            model_params = tuned.get((params["symbol"].upper(), params["model_name"], feature_set))
+            last_bar = result_cache.last_bar_date(data)
+            key = result_cache.request_key(
+                params["symbol"], params["model_name"], params["days_forecast"], params["training_days"],
+                feature_set, model_params, last_bar
+            )
+
+            def compute() -> Dict:
+                _set_stage(backend, job_id, "training")
+                result = run_prediction(
+                    data, params["symbol"], params["model_name"],
+                    params["days_forecast"], params["training_days"], end_date,
+                    tier=job.get("tier", "free"), feature_set=feature_set, params=model_params
+                )
+                _set_stage(backend, job_id, "saving")
+                return result
+
+            # Repeats of an earlier request on the same bars skip training entirely
+            prediction = result_cache.get_or_compute(db, job["user_id"], key, params["training_days"], last_bar, compute)
+        finally:
+            db.close()
+
+        _set_stage(backend, job_id, "completed", prediction_id=prediction.id, result=json.loads(prediction.result_json))
+        metrics.increment("jobs", "completed")
+    except HTTPException as e:
+        _set_stage(backend, job_id, "failed", error=e.detail)
+        metrics.increment("jobs", "failed")
+    except Exception as e:
+        _set_stage(backend, job_id, "failed", error=str(e))
+        metrics.increment("jobs", "failed")
+    finally:
+        metrics.observe("jobs", "run_seconds", time.monotonic() - started)
+
+def _worker_loop(backend) -> None:
+    last_purge = datetime.utcnow()
+    while not _stop.is_set():
+        job = backend.dequeue(timeout=1.0)
+        if job is not None:
+            execute_job(backend, job)
+        if datetime.utcnow() - last_purge > timedelta(minutes=5):
+            backend.purge(datetime.utcnow() - timedelta(seconds=settings.JOB_RESULT_TTL))
+            last_purge = datetime.utcnow()
+
+def start_workers(count: int) -> None:
+    """Start count worker threads consuming the job backend"""
+    backend = get_backend()
+    _stop.clear()
+    for i in range(count):
+        thread = threading.Thread(target=_worker_loop, args=(backend,), name=f"prediction-worker-{i}", daemon=True)
+        thread.start()
+        _workers.append(thread)
+
+def stop_workers(timeout: float = 5.0) -> None:
+    """Signal workers to stop and wait for in-flight jobs to finish"""
+    _stop.set()
+    for thread in _workers:
+        thread.join(timeout=timeout)
+    _workers.clear()
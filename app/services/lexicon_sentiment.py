@@ -0,0 +1,250 @@
+import re
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.lazy import lazy_import
+
+textblob = lazy_import("textblob")
+textblob_en = lazy_import("textblob.en")
+textblob_text = lazy_import("textblob._text")
+
+# Same negations as TextBlob's English analyzer ("n't" never survives its tokenizer)
+NEGATIONS = ("no", "not", "n't", "never")
+
+# Sarcasm mark, scored as its own neutral, fully subjective assessment
+IRONY = ("(!)", "( !)", "(! )", "( ! )")
+
+# TextBlob splits these off the start and end of words; "." is only split at the end
+_PUNCTUATION = ".,;:!?()[]{}`@#$^&*+-|=~_"
+_QUOTES = "'\"‘’“”"
+_SEPARATOR = "\x00"
+
+# Token kinds outside the lexicon
+_UNKNOWN, _EXCLAMATION, _SEPARATOR_ID, _NEGATION = -1, -2, -3, -4
+
+def _alternatives(items: List[str]) -> str:
+    return "|".join(re.escape(each) for each in sorted(items, key=len, reverse=True))
+
+def _token_pattern(emoticons: List[str]) -> "re.Pattern":
+    # One pass over the whole batch: the sarcasm mark, emoticons, words with leading and
+    # trailing punctuation stripped (a final period is kept for the abbreviation check),
+    # each "!" (boosts the previous assessment), "..." (ends a modifier/negation run)
+    # and the separator put between texts
+    edge = re.escape(_PUNCTUATION + _QUOTES)
+    body = f"[^\\s{edge}{_SEPARATOR}]"
+    inner = f"[^\\s{re.escape(_QUOTES)}{_SEPARATOR}]"
+    starts = re.escape("".join(sorted({emoticon[0] for emoticon in emoticons})))
+    return re.compile(
+        f"\\(\\s?!\\s?\\)"
+        f"|(?=[{starts}])(?:{_alternatives(emoticons)})(?=[\\s.,;:!?]|$)"
+        f"|{body}(?:{inner}*{body})?(?:\\.(?![.])(?=[{re.escape(_PUNCTUATION)}]*(?:\\s|$)))?"
+        f"|!|\\.\\.\\.|{_SEPARATOR}"
+    )
+
+def _abbreviation_pattern(abbreviations: List[str]) -> "re.Pattern":
+    # Words TextBlob leaves their period on: known abbreviations, "U.S.", "Mr."
+    return re.compile(f"(?:{_alternatives(abbreviations)}|(?:[A-Za-z]\\.)+|[A-Z][bcdfghjklmnpqrstvwxz|]+.)$")
+
+class CompiledLexicon:
+    """
+    TextBlob's English sentiment lexicon compiled into a word -> id dict and
+    per-word arrays (polarity, subjectivity, intensity, modifier flags), scoring
+    a whole batch of headlines with NumPy instead of one TextBlob per headline.
+
+    Follows TextBlob's pattern analyzer: known words become assessments; an
+    adverb modifies the next known word ("very good" = good x very's intensity,
+    kept across words of up to two letters); "no/not/never" negate the next
+    assessment (kept across one-letter words) to -0.5x its polarity and invert
+    its intensity; "!" boosts the previous assessment 1.25x; emoticons and "(!)"
+    are assessments of their own. Text scores are the mean of their assessments.
+    The sequential state of that scan is rebuilt from "index of the last event
+    before each token" running maxima.
+    """
+
+    def __init__(self, sentiment=None):
+        sentiment = sentiment if sentiment is not None else textblob_en.sentiment
+        # Single tokens only; phrases and quoted forms can never match a token
+        entries = [
+            (word, senses[None]) for word, senses in sentiment.items()
+            if word == word.strip(_PUNCTUATION) and not any(c.isspace() or c in _QUOTES for c in word)
+        ]
+        modifiers = {word for word, senses in sentiment.items() if "RB" in senses}
+        emoticons = [
+            emoticon for group in textblob_text.EMOTICONS.values() for emoticon in group
+            if not emoticon.lower().isalpha()
+        ]
+        moods = {
+            emoticon.lower(): (polarity, 1.0, 1.0)
+            for (_, polarity), group in textblob_text.EMOTICONS.items() for emoticon in group
+            if emoticon in emoticons
+        }
+        standalone = list(moods.items()) + [(mark, (0.0, 1.0, 1.0)) for mark in IRONY]
+        words = [word for word, _ in entries + standalone]
+
+        self.pattern = _token_pattern(emoticons)
+        self.abbreviation = _abbreviation_pattern(list(textblob_text.ABBREVIATIONS))
+        self.ids = {word: index for index, word in enumerate(words)}
+        self.ids["!"] = _EXCLAMATION
+        self.ids[_SEPARATOR] = _SEPARATOR_ID
+        for word in NEGATIONS:
+            self.ids.setdefault(word, _NEGATION)
+
+        scores = np.array([psi for _, psi in entries + standalone], dtype=np.float64).reshape(-1, 3)
+        self.polarity = scores[:, 0]
+        self.subjectivity = scores[:, 1]
+        self.intensity = scores[:, 2]
+        self.modifier = np.array([word in modifiers for word in words], dtype=bool)
+        self.ly_modifier = np.array([word.endswith("ly") for word in words], dtype=bool) & self.modifier
+        self.negation = np.array([word in NEGATIONS for word in words], dtype=bool)
+        # Emoticons and "(!)" are assessments of their own, never modified or negated
+        self.standalone = np.arange(len(words)) >= len(entries)
+        self.n_words = len(entries)
+
+    def __len__(self) -> int:
+        return self.n_words
+
+    def tokenize(self, texts: List[str]) -> List[str]:
+        """Lowercased tokens of every text, with a separator token after each"""
+        # Split before lowercasing, as TextBlob does: "n't" ("isn't" -> "is n ' t", "ISN'T"
+        # stays whole) and abbreviations ("Mr." keeps its period, "mr." does not)
+        joined = f" {_SEPARATOR} ".join(text.replace(_SEPARATOR, " ") for text in texts).replace("n't", " n't")
+        abbreviation = self.abbreviation.match
+        return [
+            token.lower() if token[-1] != "." or token == "..." or abbreviation(token) else token[:-1].lower()
+            for token in self.pattern.findall(joined)
+        ] + [_SEPARATOR]
+
+    def score(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(polarity, subjectivity) arrays for texts, in order"""
+        n_texts = len(texts)
+        if not n_texts:
+            return np.zeros(0), np.zeros(0)
+        tokens = self.tokenize(texts)
+        n = len(tokens)
+        ids = np.fromiter((self.ids.get(token, _UNKNOWN) for token in tokens), dtype=np.intp, count=n)
+        lengths = np.fromiter(map(len, tokens), dtype=np.intp, count=n)
+        index = np.arange(n)
+
+        separator = ids == _SEPARATOR_ID
+        known = ids >= 0
+        word = np.where(known, ids, 0)
+        unknown_negation = ids == _NEGATION
+        negation = unknown_negation | (known & self.negation[word])
+
+        def last(mask: np.ndarray) -> np.ndarray:
+            # Index of the last token before each position where mask holds (-1 if none)
+            positions = np.maximum.accumulate(np.where(mask, index, -1))
+            return np.concatenate(([-1], positions[:-1]))
+
+        text_start = last(separator)
+        previous = last(known)
+        previous = np.where(previous > text_start, previous, -1)
+        # Emoticons and "(!)" take part in the modifier run like unknown words
+        word_known = known & ~self.standalone[word]
+        previous_word = last(word_known)
+        previous_word = np.where(previous_word > text_start, previous_word, -1)
+        modifier_word = word[np.maximum(previous_word, 0)]
+
+        # A modifier stays active until a known word or an unknown word longer than
+        # two letters, except a negation right after an "-ly" modifier ("really not good")
+        has_modifier = (previous_word >= 0) & self.modifier[modifier_word]
+        ly_negation = unknown_negation & has_modifier & self.ly_modifier[modifier_word]
+        modifier_ends = separator | (~word_known & (lengths > 2) & ~ly_negation)
+        ly_negation &= last(modifier_ends) < previous_word
+        modified = word_known & has_modifier & (last(modifier_ends) < previous_word)
+
+        # A negation stays active until a known word or a longer unknown word; after an
+        # active "-ly" modifier it negates that modifier's assessment instead
+        negation_starts = negation & ~ly_negation
+        negation_ends = separator | ly_negation | (known & ~negation) | (~known & ~negation & (lengths > 1))
+        negated = word_known & (last(negation_starts) > last(negation_ends))
+
+        # Assessments: a known word starts one unless it is modified, then it joins the previous
+        known_index = index[known]
+        starts = ~modified[known]
+        assessment_of_known = np.cumsum(starts) - 1
+        n_assessments = int(starts.sum())
+        assessment = np.full(n, -1, dtype=np.intp)
+        assessment[known] = assessment_of_known
+
+        first = known_index[starts]
+        final = np.empty(n_assessments, dtype=np.intp)
+        final[assessment_of_known] = known_index
+        final_word = word[final]
+
+        intensity = np.where(negated, 1.0 / self.intensity[word], self.intensity[word])
+        modifier_intensity = np.where(modified[final], intensity[previous[final]], 1.0)
+        polarity = np.clip(self.polarity[final_word] * modifier_intensity, -1.0, 1.0)
+        subjectivity = np.clip(self.subjectivity[final_word] * modifier_intensity, -1.0, 1.0)
+
+        # "!" boosts the previous assessment only if no later word joins it
+        exclamation = (ids == _EXCLAMATION) & (previous >= 0)
+        boosts = np.bincount(previous[exclamation], minlength=n)[final]
+        polarity = np.clip(polarity * 1.25 ** boosts, -1.0, 1.0)
+
+        flipped = np.zeros(n_assessments, dtype=bool)
+        flipped[assessment[negated]] = True
+        flipped[assessment[previous[ly_negation]]] = True
+        polarity = np.where(flipped, polarity * -0.5, polarity)
+
+        text = np.cumsum(separator) - separator
+        counts = np.bincount(text[first], minlength=n_texts)
+        divisor = np.maximum(counts, 1)
+        return (
+            np.bincount(text[first], weights=polarity, minlength=n_texts) / divisor,
+            np.bincount(text[first], weights=subjectivity, minlength=n_texts) / divisor,
+        )
+
+_compiled: Optional[CompiledLexicon] = None
+_compile_lock = threading.Lock()
+
+def get_lexicon() -> CompiledLexicon:
+    """The compiled lexicon, built on first use"""
+    global _compiled
+    if _compiled is None:
+        with _compile_lock:
+            if _compiled is None:
+                _compiled = CompiledLexicon()
+    return _compiled
+
+def score(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(polarity, subjectivity) arrays for a batch of headlines"""
+    return get_lexicon().score(texts)
+
+# Scoring sample for the benchmark; parity with TextBlob is covered by the tests
+_BENCHMARK_HEADLINES = [
+    "Apple beats earnings expectations as iPhone sales surge",
+    "Nvidia stock is not very good value at these levels, analysts say",
+    "Very very good quarter for Meta as ad revenue rebounds!",
+    "Bank stocks fall sharply amid recession fears...",
+    "U.S. stocks close mixed after volatile session",
+    "\"Terrible\" quarter for chipmakers - but the worst may be over",
+    "Coinbase stock surges 20% as bitcoin tops $60,000",
+    "The most important chart for investors right now (!)",
+]
+
+def _benchmark(size: int = 1000, repeat: int = 20) -> None:
+    """Batch scoring latency against one TextBlob per headline"""
+    lexicon = get_lexicon()
+    # A watchlist worth of headlines: 50 symbols x 20 headlines (ish)
+    batch = (_BENCHMARK_HEADLINES * (size // len(_BENCHMARK_HEADLINES) + 1))[:size]
+    timings = {}
+    for name, run in (
+        ("textblob", lambda: [textblob.TextBlob(headline).sentiment for headline in batch]),
+        ("compiled", lambda: lexicon.score(batch)),
+    ):
+        runs = 1 if name == "textblob" else repeat
+        started = time.perf_counter()
+        for _ in range(runs):
+            run()
+        timings[name] = (time.perf_counter() - started) / runs * 1000
+    print(
+        f"Lexicon ({len(lexicon)} words): score {len(batch)} headlines textblob {timings['textblob']:.1f} ms, "
+        f"compiled {timings['compiled']:.1f} ms ({timings['textblob'] / timings['compiled']:.1f}x)"
+    )
+
+if __name__ == "__main__":
+    _benchmark()
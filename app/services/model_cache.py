@@ -0,0 +1,116 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.services.compiled_forest import compile_model
+
+joblib = lazy_import("joblib")
+
+# In-memory LRU of fitted models, backed by joblib artifacts on disk. Tree
+# ensembles are held in compiled form so cached predicts skip per-tree Python calls
+_memory_cache: "OrderedDict[str, Any]" = OrderedDict()
+_lock = threading.Lock()
+
+def fingerprint(*arrays: np.ndarray) -> str:
+    """Hash the contents (values, dtype and shape) of the training arrays"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str(array.dtype).encode())
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+def make_key(symbol: str, model_name: str, days_forecast: int, training_days: int, data_hash: str) -> str:
+    """Build the cache key for a trained model"""
+    raw = f"{symbol.upper()}|{model_name}|{days_forecast}|{training_days}|{data_hash}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def _artifact_path(key: str) -> str:
+    return os.path.join(settings.MODEL_CACHE_DIR, f"{key}.joblib")
+
+def _remember(key: str, model: Any) -> None:
+    with _lock:
+        _memory_cache[key] = model
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > settings.MODEL_CACHE_MEMORY_ITEMS:
+            _memory_cache.popitem(last=False)
+
+def get(key: str) -> Optional[Any]:
+    """Return a fitted model from memory or disk, or None on a miss"""
+    with _lock:
+        model = _memory_cache.get(key)
+        if model is not None:
+            _memory_cache.move_to_end(key)
+            metrics.increment("model_cache", "memory_hits")
+            return model
+
+    path = _artifact_path(key)
+    if os.path.exists(path):
+        try:
+            model = joblib.load(path)
+        except Exception:
+            # Corrupt or partially written artifact: treat as a miss
+            metrics.increment("model_cache", "disk_errors")
+            return None
+        # Touch the file so disk eviction stays least-recently-used
+        os.utime(path, None)
+        model = compile_model(model)
+        _remember(key, model)
+        metrics.increment("model_cache", "disk_hits")
+        return model
+
+    metrics.increment("model_cache", "misses")
+    return None
+
+def put(key: str, model: Any) -> None:
+    """Store a fitted model in memory and persist it to disk"""
+    _remember(key, compile_model(model))
+
+    os.makedirs(settings.MODEL_CACHE_DIR, exist_ok=True)
+    path = _artifact_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        joblib.dump(model, tmp_path, compress=3)
+        os.replace(tmp_path, path)
+    except Exception:
+        metrics.increment("model_cache", "disk_errors")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    evict()
+
+def evict() -> None:
+    """Delete the least recently used artifacts until the disk budget is met"""
+    max_bytes = settings.MODEL_CACHE_MAX_DISK_MB * 1024 * 1024
+    try:
+        entries = [
+            entry for entry in os.scandir(settings.MODEL_CACHE_DIR)
+            if entry.is_file() and entry.name.endswith(".joblib")
+        ]
+    except FileNotFoundError:
+        return
+
+    files = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            metrics.increment("model_cache", "evictions")
+        except FileNotFoundError:
+            pass
+
+def clear() -> None:
+    """Drop the in-memory cache (disk artifacts are kept)"""
+    with _lock:
+        _memory_cache.clear()
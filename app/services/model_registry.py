@@ -0,0 +1,176 @@
+"""
+Registry of forecasting models.
+
+Every model the API can serve is declared once in MODELS; tier checks, the API
+enums, tuning search spaces, the training scheduler and the Streamlit model
+picker all read from it, as do the subscription TIER_LIMITS. Adding an
+estimator means adding an entry here.
+
+Entry fields:
+    module, class   constructor, imported on first use (None for pretrained models)
+    params          default constructor kwargs (tuned params override them)
+    tier            lowest subscription tier that may use the model
+    threads         most threads one fit can use (None = whatever the tier is granted)
+    cacheable       whether fitted models go through the model cache
+    cost            expected training cost relative to LinearRegression
+    incremental     served by the incremental update path as well
+    param_space     hyperparameter search space for tuning (empty = not tunable)
+"""
+from typing import Any, Dict, List, Optional
+
+from app.core.lazy import lazy_import
+
+# No API-level imports here: the standalone Streamlit demo imports this module too
+
+# Pretrained cross-symbol model served by app.services.global_model
+GLOBAL_MODEL_NAME = "GlobalModel"
+
+# Subscription tiers, lowest first
+TIERS = ["free", "basic", "pro", "enterprise"]
+
+_TREE_SPACE = {
+    "n_estimators": [50, 100, 200, 400],
+    "max_depth": [None, 4, 8, 16],
+    "min_samples_leaf": [1, 2, 5, 10],
+    "max_features": [1.0, 0.5, "sqrt"],
+}
+
+MODELS = {
+    "LinearRegression": {
+        "module": "sklearn.linear_model", "class": "LinearRegression",
+        "params": {},
+        "tier": "free", "threads": 1, "cacheable": False, "cost": 1, "incremental": True,
+        "param_space": {
+            "fit_intercept": [True, False],
+        },
+    },
+    "RandomForestRegressor": {
+        "module": "sklearn.ensemble", "class": "RandomForestRegressor",
+        "params": {"n_estimators": 100},
+        "tier": "basic", "threads": None, "cacheable": True, "cost": 40, "incremental": False,
+        "param_space": _TREE_SPACE,
+    },
+    "KNeighborsRegressor": {
+        "module": "sklearn.neighbors", "class": "KNeighborsRegressor",
+        "params": {"n_neighbors": 5},
+        "tier": "pro", "threads": 1, "cacheable": False, "cost": 2, "incremental": False,
+        "param_space": {
+            "n_neighbors": [2, 3, 5, 8, 13, 21],
+            "weights": ["uniform", "distance"],
+            "p": [1, 2],
+        },
+    },
+    "ExtraTreesRegressor": {
+        "module": "sklearn.ensemble", "class": "ExtraTreesRegressor",
+        "params": {"n_estimators": 100},
+        "tier": "pro", "threads": None, "cacheable": True, "cost": 25, "incremental": False,
+        "param_space": _TREE_SPACE,
+    },
+    "XGBRegressor": {
+        "module": "xgboost", "class": "XGBRegressor",
+        "params": {"n_estimators": 100},
+        "tier": "enterprise", "threads": None, "cacheable": True, "cost": 15, "incremental": True,
+        "param_space": {
+            "n_estimators": [50, 100, 200, 400],
+            "max_depth": [2, 3, 4, 6, 8],
+            "learning_rate": [0.01, 0.03, 0.1, 0.3],
+            "subsample": [0.6, 0.8, 1.0],
+            "colsample_bytree": [0.6, 0.8, 1.0],
+            "min_child_weight": [1, 3, 10],
+        },
+    },
+    GLOBAL_MODEL_NAME: {
+        # Pretrained offline on a symbol universe and served inference only (app.services.global_model)
+        "module": None, "class": None,
+        "params": {},
+        "tier": "free", "threads": 1, "cacheable": False, "cost": 0.5, "incremental": False,
+        "param_space": {},
+    },
+}
+
+def models_for_tier(tier: str) -> List[str]:
+    """Models available to a subscription tier (its own and every lower tier's)"""
+    rank = TIERS.index(tier)
+    return [name for name, spec in MODELS.items() if TIERS.index(spec["tier"]) <= rank]
+
+# Subscription tier limits; the models of each tier come from MODELS
+TIER_LIMITS = {
+    "free": {
+        "predictions_per_day": 5, "max_days_forecast": 7, "max_batch_items": 5,
+        "tuning_candidates": 0, "tuning_seconds": 0,
+        "models": models_for_tier("free")
+    },
+    "basic": {
+        "predictions_per_day": 20, "max_days_forecast": 14, "max_batch_items": 20,
+        "tuning_candidates": 9, "tuning_seconds": 30,
+        "models": models_for_tier("basic")
+    },
+    "pro": {
+        "predictions_per_day": 50, "max_days_forecast": 30, "max_batch_items": 50,
+        "tuning_candidates": 27, "tuning_seconds": 60,
+        "models": models_for_tier("pro")
+    },
+    "enterprise": {
+        "predictions_per_day": 200, "max_days_forecast": 60, "max_batch_items": 500,
+        "tuning_candidates": 81, "tuning_seconds": 120,
+        "models": models_for_tier("enterprise")
+    }
+}
+
+def _bad_request(detail: str) -> Exception:
+    # fastapi is only needed once a request is rejected
+    from fastapi import HTTPException
+    return HTTPException(status_code=400, detail=detail)
+
+def get(model_name: str) -> Dict:
+    """Registry entry for model_name; 400 for unknown models"""
+    spec = MODELS.get(model_name)
+    if spec is None:
+        raise _bad_request("Invalid model name")
+    return spec
+
+def model_names() -> List[str]:
+    """Every model a forecast can be requested from"""
+    return list(MODELS)
+
+def trainable_models() -> List[str]:
+    """Models trained per request (everything except pretrained models)"""
+    return [name for name, spec in MODELS.items() if spec["module"] is not None]
+
+def incremental_models() -> List[str]:
+    """Models with an incremental update path"""
+    return [name for name, spec in MODELS.items() if spec["incremental"]]
+
+def tunable_models() -> List[str]:
+    """Models with a hyperparameter search space"""
+    return [name for name, spec in MODELS.items() if spec["param_space"]]
+
+def create(model_name: str, params: Optional[Dict] = None) -> Any:
+    """Untrained estimator for model_name: default params overridden by params"""
+    spec = get(model_name)
+    if spec["module"] is None:
+        raise _bad_request(f"{model_name} is pretrained and cannot be trained per request")
+    model_class = getattr(lazy_import(spec["module"]), spec["class"])
+    return model_class(**{**spec["params"], **(params or {})})
+
+def by_cost(model_names: List[str]) -> List[str]:
+    """model_names ordered most expensive first, so parallel runs finish together"""
+    return sorted(model_names, key=lambda name: get(name)["cost"], reverse=True)
+
+def describe(tier: str) -> List[Dict]:
+    """Public view of the registry for a tier (served to the UI)"""
+    available = set(models_for_tier(tier))
+    return [
+        {
+            "name": name,
+            "tier": spec["tier"],
+            "available": name in available,
+            "trainable": spec["module"] is not None,
+            "incremental": spec["incremental"],
+            "tunable": bool(spec["param_space"]),
+            "cacheable": spec["cacheable"],
+            "cost": spec["cost"],
+            "default_params": spec["params"],
+        }
+        for name, spec in MODELS.items()
+    ]
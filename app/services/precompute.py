@@ -0,0 +1,191 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.precomputed import PrecomputedForecast
+from app.models.user import PredictionHistory, PredictionResult
+from app.services import result_cache
+from app.services.prediction import compare_models, get_bulk_stock_data, history_days
+from app.services.tuning import load_tuned_params
+
+# Precomputed forecasts are trained with the top tier's budget
+PRECOMPUTE_TIER = "enterprise"
+
+def popular_symbols(db: Session, lookback_days: int, limit: int) -> List[str]:
+    """Symbols with the most prediction requests in the last lookback_days, busiest first"""
+    since = datetime.utcnow() - timedelta(days=lookback_days)
+    symbol = func.upper(PredictionHistory.symbol)
+    requests = func.count(PredictionHistory.id)
+    rows = (
+        db.query(symbol, requests)
+        .filter(PredictionHistory.created_at >= since)
+        .group_by(symbol)
+        .order_by(requests.desc())
+        .limit(limit)
+        .all()
+    )
+    return [row[0] for row in rows]
+
+def allowed_horizons(tier_limits: Dict, model_names: List[str]) -> Dict[str, int]:
+    """Longest forecast horizon any tier may request for each trainable model"""
+    horizons = {}
+    for limits in tier_limits.values():
+        for model_name in limits["models"]:
+            if model_name in model_names:
+                horizons[model_name] = max(horizons.get(model_name, 0), limits["max_days_forecast"])
+    return horizons
+
+def find_fresh(
+    db: Session,
+    symbol: str,
+    model_name: str,
+    days_forecast: int,
+    training_days: int,
+    feature_set: str,
+    params: Optional[Dict]
+) -> Optional[PredictionResult]:
+    """The precomputed result for this request if it is recent enough and used the same params"""
+    cutoff = datetime.utcnow() - timedelta(hours=settings.PRECOMPUTE_MAX_AGE_HOURS)
+    row = (
+        db.query(PrecomputedForecast)
+        .filter(
+            PrecomputedForecast.symbol == symbol.upper(),
+            PrecomputedForecast.model_name == model_name,
+            PrecomputedForecast.days_forecast == days_forecast,
+            PrecomputedForecast.training_days == training_days,
+            PrecomputedForecast.feature_set == feature_set,
+            PrecomputedForecast.computed_at >= cutoff
+        )
+        .first()
+    )
+    if row is None or json.loads(row.result.result_json).get("params", {}) != (params or {}):
+        metrics.increment("precompute", "misses")
+        return None
+    metrics.increment("precompute", "hits")
+    return row.result
+
+def _store(
+    db: Session,
+    symbol: str,
+    training_days: int,
+    feature_set: str,
+    last_bar,
+    results: List[Dict]
+) -> None:
+    # Shared results first (so identical interactive requests hit them too), then the index rows
+    entries = [
+        (
+            result_cache.request_key(
+                symbol, result["model"], result["days_forecast"], training_days,
+                feature_set, result["params"] or None, last_bar
+            ),
+            result, training_days, last_bar
+        )
+        for result in results
+    ]
+    stored = result_cache.store_results(db, entries)
+
+    existing = {
+        (row.model_name, row.days_forecast): row
+        for row in db.query(PrecomputedForecast).filter(
+            PrecomputedForecast.symbol == symbol,
+            PrecomputedForecast.training_days == training_days,
+            PrecomputedForecast.feature_set == feature_set
+        )
+    }
+    now = datetime.utcnow()
+    for key, result, _, _ in entries:
+        row = existing.get((result["model"], result["days_forecast"]))
+        if row is None:
+            row = PrecomputedForecast(
+                symbol=symbol, model_name=result["model"], days_forecast=result["days_forecast"],
+                training_days=training_days, feature_set=feature_set
+            )
+            db.add(row)
+        row.last_bar_date = last_bar
+        row.result_id = stored[key].id
+        row.computed_at = now
+    db.commit()
+
+def precompute_symbol(
+    symbol: str,
+    data: pd.DataFrame,
+    horizons: Dict[str, int],
+    days_forecasts: List[int],
+    training_days: int,
+    feature_set: str,
+    end_date: datetime
+) -> int:
+    """Train every allowed (model, horizon) for one symbol and store the forecasts"""
+    db = SessionLocal()
+    try:
+        tuned = load_tuned_params(db, [symbol], list(horizons), [feature_set])
+        tuned_params = {model_name: params for (_, model_name, _), params in tuned.items()}
+        last_bar = result_cache.last_bar_date(data)
+
+        stored = 0
+        for days_forecast in days_forecasts:
+            model_names = [name for name, longest in horizons.items() if days_forecast <= longest]
+            # Same window an interactive request for this horizon would download
+            window_start = end_date - timedelta(days=history_days(training_days, days_forecast, feature_set))
+            window = data[data.index >= pd.Timestamp(window_start.date())]
+            results = compare_models(
+                window, symbol, model_names, days_forecast, training_days, end_date,
+                tier=PRECOMPUTE_TIER, feature_set=feature_set, tuned_params=tuned_params
+            )
+            _store(db, symbol, training_days, feature_set, last_bar, results)
+            stored += len(results)
+        return stored
+    finally:
+        db.close()
+
+def run(
+    symbols: List[str],
+    tier_limits: Dict,
+    model_names: List[str],
+    workers: int,
+    training_days: Optional[int] = None,
+    feature_set: str = "close"
+) -> Dict:
+    """Precompute forecasts for symbols, processing `workers` symbols at a time"""
+    started = time.monotonic()
+    training_days = training_days or settings.PRECOMPUTE_TRAINING_DAYS
+    horizons = allowed_horizons(tier_limits, model_names)
+    longest = max(horizons.values())
+    days_forecasts = [days for days in settings.PRECOMPUTE_HORIZONS if days <= longest] or list(range(1, longest + 1))
+
+    end_date = datetime.now()
+    frames = get_bulk_stock_data(symbols, end_date - timedelta(days=history_days(training_days, longest, feature_set)), end_date)
+
+    summary = {"symbols": {}, "forecasts": 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            symbol: executor.submit(
+                precompute_symbol, symbol, frames[symbol], horizons, days_forecasts, training_days, feature_set, end_date
+            )
+            for symbol in symbols if symbol in frames
+        }
+        for symbol in symbols:
+            if symbol not in futures:
+                summary["symbols"][symbol] = "no data"
+                continue
+            try:
+                count = futures[symbol].result()
+                summary["symbols"][symbol] = "ok"
+                summary["forecasts"] += count
+            except Exception as e:
+                summary["symbols"][symbol] = f"error: {getattr(e, 'detail', e)}"
+                metrics.increment("precompute", "errors")
+
+    summary["elapsed_seconds"] = time.monotonic() - started
+    metrics.observe("precompute", "run_seconds", summary["elapsed_seconds"])
+    return summary
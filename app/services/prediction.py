@@ -0,0 +1,343 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import pandas as pd
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.models.user import PredictionHistory
+from app.schemas.user import PredictionHistory as PredictionHistorySchema
+from app.services import features, global_model, governor, intervals, model_cache, model_registry, snapshots, training_pool
+
+# Imported on first use so the API starts without loading them
+yf = lazy_import("yfinance")
+model_selection = lazy_import("sklearn.model_selection")
+preprocessing = lazy_import("sklearn.preprocessing")
+sklearn_metrics = lazy_import("sklearn.metrics")
+
+def get_stock_data(symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """Get stock data from Yahoo Finance API"""
+    try:
+        df = yf.download(symbol, start=start_date, end=end_date, progress=False)
+        if df.empty:
+            raise HTTPException(status_code=404, detail=f"No data found for symbol {symbol}")
+        return df
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching data: {str(e)}")
+
+def get_bulk_stock_data(symbols: List[str], start_date: datetime, end_date: datetime) -> Dict[str, pd.DataFrame]:
+    """Download bars for many symbols in one Yahoo Finance request"""
+    symbols = sorted(set(symbols))
+    try:
+        df = yf.download(symbols, start=start_date, end=end_date, progress=False, group_by="ticker")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching data: {str(e)}")
+
+    frames = {}
+    for symbol in symbols:
+        if df is None or df.empty or symbol not in df.columns.get_level_values(0):
+            continue
+        frame = df[symbol].dropna(how="all")
+        if not frame.empty:
+            frames[symbol] = frame
+    return frames
+
+def build_model(model_name: str, params: Optional[Dict] = None) -> Any:
+    """Instantiate an untrained estimator by name, optionally with tuned hyperparameters"""
+    model = model_registry.create(model_name, params)
+
+    # Inside a training task, use the thread count granted by the governor;
+    # otherwise one thread so ad-hoc models never grab every core
+    return governor.configure_threads(model, governor.task_threads() or 1)
+
+def history_days(training_days: int, days_forecast: int, feature_set: str = "close") -> int:
+    """Calendar days of bars to download for a training window"""
+    days = training_days + days_forecast
+    if feature_set == "engineered":
+        # Indicator warmup rows are dropped, so fetch roughly that many extra trading days
+        days += int(features.WARMUP * 7 / 5) + 7
+    return days
+
+def build_xy(
+    data: pd.DataFrame,
+    days_forecast: int,
+    feature_set: str = "close",
+    symbol: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Unscaled feature matrix and Close shifted by days_forecast (NaN for the last days_forecast rows)"""
+    if feature_set == "engineered":
+        # Lagged closes, returns, volatility, volume and indicators (cached per symbol and window)
+        x, _ = features.get_features(symbol, data)
+        close = np.asarray(data["Close"], dtype=np.float64).reshape(-1)[features.WARMUP:]
+        if len(x) <= days_forecast + 5:
+            raise HTTPException(status_code=400, detail="Not enough history for engineered features, increase training_days")
+        target = np.full(len(close), np.nan)
+        target[:-days_forecast] = close[days_forecast:]
+    else:
+        # Prepare data for prediction
+        df = data[["Close"]].copy()
+        df["preds"] = data.Close.shift(-days_forecast)
+        x = df.drop(["preds"], axis=1).values
+        target = df.preds.values
+    return x, target
+
+def prepare_training_data(
+    data: pd.DataFrame,
+    days_forecast: int,
+    feature_set: str = "close",
+    symbol: Optional[str] = None
+) -> Dict:
+    """Build features, shift the target by days_forecast and split train/test once"""
+    x, target = build_xy(data, days_forecast, feature_set, symbol)
+
+    # Scale the data
+    scaler = preprocessing.StandardScaler()
+    x = scaler.fit_transform(x)
+
+    # Store last days_forecast data for prediction
+    x_forecast = x[-days_forecast:]
+
+    # Select data for training
+    x = x[:-days_forecast]
+    y = target[:-days_forecast]
+
+    # Split data
+    x_train, x_test, y_train, y_test = model_selection.train_test_split(x, y, test_size=.2, random_state=7)
+
+    return {
+        "x_train": x_train,
+        "x_test": x_test,
+        "y_train": y_train,
+        "y_test": y_test,
+        "x_forecast": x_forecast,
+        "feature_set": feature_set,
+        "fingerprint": model_cache.fingerprint(x_train, y_train)
+    }
+
+def train_and_forecast(
+    prepared: Dict,
+    symbol: str,
+    model_name: str,
+    days_forecast: int,
+    training_days: int,
+    end_date: datetime,
+    tier: str = "free",
+    params: Optional[Dict] = None
+) -> Dict:
+    """Train (or reuse a cached) model on prepared data and forecast the next days_forecast days"""
+    spec = model_registry.get(model_name)
+    model = build_model(model_name, params)
+
+    # Reuse an identical model trained on identical bars, otherwise train and cache it.
+    # Models that refit faster than a cache load skip the cache
+    cached_model = None
+    if spec["cacheable"]:
+        cache_name = f"{model_name}:{json.dumps(params, sort_keys=True)}" if params else model_name
+        cache_key = model_cache.make_key(symbol, cache_name, days_forecast, training_days, prepared["fingerprint"])
+        cached_model = model_cache.get(cache_key)
+    if cached_model is not None:
+        model = cached_model
+    else:
+        model = training_pool.fit(model, prepared["x_train"], prepared["y_train"], tier=tier, threads=spec["threads"])
+        if spec["cacheable"]:
+            model_cache.put(cache_key, model)
+
+    # Evaluate model
+    preds = model.predict(prepared["x_test"])
+    r2 = sklearn_metrics.r2_score(prepared["y_test"], preds)
+    mae = sklearn_metrics.mean_absolute_error(prepared["y_test"], preds)
+
+    # Predict future prices
+    forecast_pred = model.predict(prepared["x_forecast"])
+
+    # Format predictions
+    prediction_dates = [(end_date + timedelta(days=i+1)).strftime("%Y-%m-%d") for i in range(days_forecast)]
+    predictions = [{"date": date, "price": float(price)} for date, price in zip(prediction_dates, forecast_pred)]
+
+    # Forecast intervals from held-out residuals (and tree spread for forests)
+    bootstrap = intervals.forecast_intervals(model, prepared["x_forecast"], prepared["y_test"] - preds, tier=tier)
+
+    return {
+        "symbol": symbol,
+        "model": model_name,
+        "days_forecast": days_forecast,
+        "feature_set": prepared["feature_set"],
+        "params": params or {},
+        "predictions": predictions,
+        "intervals": intervals.attach_intervals(predictions, bootstrap),
+        "r2_score": r2,
+        "mae": mae
+    }
+
+def run_prediction(
+    data: pd.DataFrame,
+    symbol: str,
+    model_name: str,
+    days_forecast: int,
+    training_days: int,
+    end_date: datetime,
+    tier: str = "free",
+    feature_set: str = "close",
+    params: Optional[Dict] = None
+) -> Dict:
+    """Train (or reuse a cached) model on data and forecast the next days_forecast days"""
+    if model_name == global_model.GLOBAL_MODEL_NAME:
+        # Pretrained on the whole universe: inference only
+        result = global_model.predict(data, symbol, days_forecast, end_date)
+        result["snapshot"] = snapshots.save_snapshot(data)
+        return result
+
+    prepared = prepare_training_data(data, days_forecast, feature_set, symbol)
+    result = train_and_forecast(prepared, symbol, model_name, days_forecast, training_days, end_date, tier=tier, params=params)
+    # Record the exact bars so the prediction can be re-evaluated offline
+    result["snapshot"] = snapshots.save_snapshot(data)
+    return result
+
+def compare_models(
+    data: pd.DataFrame,
+    symbol: str,
+    model_names: List[str],
+    days_forecast: int,
+    training_days: int,
+    end_date: datetime,
+    tier: str = "free",
+    feature_set: str = "close",
+    tuned_params: Optional[Dict[str, Dict]] = None
+) -> List[Dict]:
+    """
+    Train several models on one shared feature matrix and split, in parallel.
+    Returns results sorted by r2 (best first).
+    """
+    prepared = prepare_training_data(data, days_forecast, feature_set, symbol)
+
+    def run_model(name: str) -> Dict:
+        if name == global_model.GLOBAL_MODEL_NAME:
+            return global_model.predict(data, symbol, days_forecast, end_date)
+        return train_and_forecast(
+            prepared, symbol, name, days_forecast, training_days, end_date,
+            tier=tier, params=(tuned_params or {}).get(name)
+        )
+
+    max_workers = max(1, min(len(model_names), settings.TRAINING_CONCURRENCY.get(tier, 1)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Costliest first so the cheap fits fill in around them
+        results = list(executor.map(run_model, model_registry.by_cost(model_names)))
+
+    snapshot = snapshots.save_snapshot(data)
+    for result in results:
+        result["snapshot"] = snapshot
+
+    return sorted(results, key=lambda result: result["r2_score"] if result["r2_score"] is not None else float("-inf"), reverse=True)
+
+def run_multi_horizon_prediction(
+    data: pd.DataFrame,
+    symbol: str,
+    model_name: str,
+    max_horizon: int,
+    training_days: int,
+    end_date: datetime,
+    tier: str = "free",
+    feature_set: str = "close"
+) -> Dict:
+    """
+    Forecast every horizon 1..max_horizon from a single multi-output fit.
+    Row t is trained against the target vector close[t+1 .. t+max_horizon].
+    """
+    x, _ = build_xy(data, 1, feature_set, symbol)
+    close = np.asarray(data["Close"], dtype=np.float64).reshape(-1)[-len(x):]
+    if len(x) <= max_horizon + 10:
+        raise HTTPException(status_code=400, detail="Not enough history for this horizon, increase training_days")
+
+    x = preprocessing.StandardScaler().fit_transform(x)
+    targets = sliding_window_view(close[1:], max_horizon)
+    x_last = x[-1:]
+    x = x[:len(targets)]
+
+    # Chronological holdout so every horizon is evaluated on unseen future rows
+    x_train, x_test, y_train, y_test = model_selection.train_test_split(x, targets, test_size=.2, shuffle=False)
+
+    spec = model_registry.get(model_name)
+    model = None
+    if spec["cacheable"]:
+        cache_key = model_cache.make_key(
+            symbol, f"{model_name}:multi", max_horizon, training_days,
+            model_cache.fingerprint(x_train, y_train)
+        )
+        model = model_cache.get(cache_key)
+    if model is None:
+        model = training_pool.fit(build_model(model_name), x_train, y_train, tier=tier, threads=spec["threads"])
+        if spec["cacheable"]:
+            model_cache.put(cache_key, model)
+
+    preds = np.asarray(model.predict(x_test)).reshape(len(x_test), max_horizon)
+    r2_by_horizon = sklearn_metrics.r2_score(y_test, preds, multioutput="raw_values")
+    mae_by_horizon = sklearn_metrics.mean_absolute_error(y_test, preds, multioutput="raw_values")
+
+    curve = np.asarray(model.predict(x_last)).reshape(-1)
+    prediction_dates = [(end_date + timedelta(days=i+1)).strftime("%Y-%m-%d") for i in range(max_horizon)]
+    predictions = [
+        {"date": date, "horizon": i + 1, "price": float(price), "r2_score": float(r2), "mae": float(mae)}
+        for i, (date, price, r2, mae) in enumerate(zip(prediction_dates, curve, r2_by_horizon, mae_by_horizon))
+    ]
+
+    return {
+        "symbol": symbol,
+        "model": model_name,
+        "days_forecast": max_horizon,
+        "feature_set": feature_set,
+        "mode": "multi_horizon",
+        "snapshot": snapshots.save_snapshot(data),
+        "predictions": predictions,
+        "r2_score": float(np.mean(r2_by_horizon)),
+        "mae": float(np.mean(mae_by_horizon))
+    }
+
+def save_prediction(db: Session, user_id: int, result: Dict) -> PredictionHistory:
+    """Persist a prediction result as a PredictionHistory row"""
+    prediction_history = PredictionHistory(
+        user_id=user_id,
+        symbol=result["symbol"],
+        model_used=result["model"],
+        days_forecasted=result["days_forecast"],
+        result_json=json.dumps(result),
+        r2_score=str(result["r2_score"]) if result["r2_score"] is not None else None,
+        mae=str(result["mae"]) if result["mae"] is not None else None,
+        snapshot_hash=result.get("snapshot")
+    )
+
+    db.add(prediction_history)
+    db.commit()
+    db.refresh(prediction_history)
+
+    return prediction_history
+
+def save_predictions(db: Session, user_id: int, results: List[Dict]) -> List[PredictionHistorySchema]:
+    """Persist many prediction results in a single bulk insert"""
+    rows = [
+        PredictionHistory(
+            user_id=user_id,
+            symbol=result["symbol"],
+            model_used=result["model"],
+            days_forecasted=result["days_forecast"],
+            result_json=json.dumps(result),
+            r2_score=str(result["r2_score"]) if result["r2_score"] is not None else None,
+            mae=str(result["mae"]) if result["mae"] is not None else None,
+            snapshot_hash=result.get("snapshot")
+        )
+        for result in results
+    ]
+
+    db.add_all(rows)
+    # Flush assigns primary keys and defaults in one batched INSERT; serialize
+    # before commit so the rows are not reloaded one SELECT at a time
+    db.flush()
+    saved = [PredictionHistorySchema.model_validate(row) for row in rows]
+    db.commit()
+
+    return saved
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.models.user import PredictionHistory, PredictionResult
+from app.schemas.user import PredictionHistory as PredictionHistorySchema
+
+# One lock per in-flight request key (with its waiter count), dropped when the last holder leaves,
+# so only identical requests wait on each other
+_key_locks: Dict[str, List] = {}
+_key_locks_guard = threading.Lock()
+
+@contextmanager
+def _locked(key: str):
+    with _key_locks_guard:
+        entry = _key_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _key_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _key_locks[key]
+
+def last_bar_date(data: pd.DataFrame) -> date:
+    """Trading day of the most recent bar in data"""
+    return pd.Timestamp(data.index[-1]).date()
+
+def request_key(
+    symbol: str,
+    model_name: str,
+    days_forecast: int,
+    training_days: int,
+    feature_set: str,
+    params: Optional[Dict],
+    last_bar: date
+) -> str:
+    """
+    Identity of a prediction request: requests with the same key train on the same
+    bars with the same configuration, so they produce the same result
+    """
+    raw = json.dumps(
+        [symbol.upper(), model_name, days_forecast, training_days, feature_set, params or {}, str(last_bar)],
+        sort_keys=True
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def find_user_predictions(db: Session, user_id: int, keys: Iterable[str]) -> Dict[str, PredictionHistory]:
+    """The user's existing history rows for any of keys, in one query"""
+    keys = set(keys)
+    if not keys:
+        return {}
+    rows = (
+        db.query(PredictionHistory)
+        .filter(PredictionHistory.user_id == user_id, PredictionHistory.request_key.in_(keys))
+        .order_by(PredictionHistory.created_at)
+        .all()
+    )
+    return {row.request_key: row for row in rows}
+
+def find_results(db: Session, keys: Iterable[str]) -> Dict[str, PredictionResult]:
+    """Shared results for any of keys, in one query"""
+    keys = set(keys)
+    if not keys:
+        return {}
+    rows = db.query(PredictionResult).filter(PredictionResult.request_key.in_(keys)).all()
+    return {row.request_key: row for row in rows}
+
+def store_results(db: Session, entries: List[Tuple[str, Dict, int, date]]) -> Dict[str, PredictionResult]:
+    """
+    Store computed results shared across users. entries are (key, result,
+    training_days, last_bar). A result stored concurrently by another request wins.
+    """
+    stored = {}
+    for key, result, training_days, last_bar in entries:
+        row = PredictionResult(
+            request_key=key,
+            symbol=result["symbol"],
+            model_used=result["model"],
+            days_forecasted=result["days_forecast"],
+            training_days=training_days,
+            feature_set=result.get("feature_set", "close"),
+            last_bar_date=last_bar,
+            snapshot_hash=result.get("snapshot"),
+            result_json=json.dumps(result),
+            r2_score=str(result["r2_score"]) if result["r2_score"] is not None else None,
+            mae=str(result["mae"]) if result["mae"] is not None else None
+        )
+        try:
+            with db.begin_nested():
+                db.add(row)
+            stored[key] = row
+        except IntegrityError:
+            stored[key] = db.query(PredictionResult).filter(PredictionResult.request_key == key).one()
+    return stored
+
+def save_references(
+    db: Session,
+    user_id: int,
+    results: List[PredictionResult]
+) -> List[PredictionHistorySchema]:
+    """Add history rows pointing at shared results (no copy of the result JSON)"""
+    rows = [
+        PredictionHistory(
+            user_id=user_id,
+            symbol=result.symbol,
+            model_used=result.model_used,
+            days_forecasted=result.days_forecasted,
+            r2_score=result.r2_score,
+            mae=result.mae,
+            request_key=result.request_key,
+            snapshot_hash=result.snapshot_hash,
+            result=result
+        )
+        for result in results
+    ]
+    db.add_all(rows)
+    db.flush()
+    saved = [PredictionHistorySchema.model_validate(row) for row in rows]
+    db.commit()
+    return saved
+
+def resolve(
+    db: Session,
+    user_id: int,
+    keys: List[str]
+) -> Tuple[Dict[str, PredictionHistorySchema], Dict[str, PredictionResult]]:
+    """
+    Look up keys for user: history rows the user already has (returned as is)
+    and shared results computed for other requests (to be referenced).
+    Keys in neither mapping need to be computed.
+    """
+    existing = {
+        key: PredictionHistorySchema.model_validate(row)
+        for key, row in find_user_predictions(db, user_id, keys).items()
+    }
+    shared = find_results(db, [key for key in keys if key not in existing])
+    metrics.increment("result_cache", "user_hits", len(existing))
+    metrics.increment("result_cache", "shared_hits", len(shared))
+    metrics.increment("result_cache", "misses", len(set(keys)) - len(existing) - len(shared))
+    return existing, shared
+
+def get_or_compute(
+    db: Session,
+    user_id: int,
+    key: str,
+    training_days: int,
+    last_bar: date,
+    compute: Callable[[], Dict]
+) -> PredictionHistorySchema:
+    """
+    Idempotent prediction: the user's existing row for key, else a new row
+    referencing the shared result, computing and storing it only if needed.
+    Identical concurrent requests in this process wait for the first one.
+    """
+    with _locked(key):
+        existing, shared = resolve(db, user_id, [key])
+        if key in existing:
+            return existing[key]
+        result = shared.get(key)
+        if result is None:
+            result = store_results(db, [(key, compute(), training_days, last_bar)])[key]
+        return save_references(db, user_id, [result])[0]
+
+def get_or_reference(db: Session, user_id: int, result: PredictionResult) -> PredictionHistorySchema:
+    """The user's existing row for an already computed result, else a new row referencing it"""
+    existing = find_user_predictions(db, user_id, [result.request_key])
+    if result.request_key in existing:
+        return PredictionHistorySchema.model_validate(existing[result.request_key])
+    return save_references(db, user_id, [result])[0]
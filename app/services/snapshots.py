@@ -0,0 +1,74 @@
+import hashlib
+import io
+import os
+import threading
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+
+from app.core import metrics
+from app.core.config import settings
+
+# Content-addressed store of training bar windows: one compressed .npz per
+# distinct window, one array per column, named by the hash of its contents
+_known = set()
+_lock = threading.Lock()
+
+def _columns(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    columns = {"__index__": np.asarray(data.index, dtype="datetime64[ns]").view(np.int64)}
+    for column in data.columns:
+        # Single-ticker yfinance frames have (field, ticker) column tuples
+        name = column[0] if isinstance(column, tuple) else column
+        columns[str(name)] = np.asarray(data[column], dtype=np.float64).reshape(-1)
+    return columns
+
+def _snapshot_path(snapshot_hash: str) -> str:
+    return os.path.join(settings.SNAPSHOT_DIR, snapshot_hash[:2], f"{snapshot_hash}.npz")
+
+def snapshot_hash(data: pd.DataFrame) -> str:
+    """Hash of the bars' dates, column names and values"""
+    digest = hashlib.sha256()
+    for name, values in _columns(data).items():
+        digest.update(name.encode())
+        digest.update(str(values.dtype).encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+def save_snapshot(data: pd.DataFrame) -> str:
+    """Store the bars once and return their content hash"""
+    key = snapshot_hash(data)
+    with _lock:
+        if key in _known:
+            metrics.increment("snapshots", "dedup_hits")
+            return key
+
+    path = _snapshot_path(key)
+    if os.path.exists(path):
+        metrics.increment("snapshots", "dedup_hits")
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **_columns(data))
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+        metrics.increment("snapshots", "written")
+        metrics.observe("snapshots", "bytes", buffer.tell())
+
+    with _lock:
+        _known.add(key)
+    return key
+
+def load_snapshot(snapshot_hash: str) -> pd.DataFrame:
+    """Bars stored under snapshot_hash, as the DataFrame they were saved from"""
+    if len(snapshot_hash) != 64 or not all(c in "0123456789abcdef" for c in snapshot_hash):
+        raise HTTPException(status_code=400, detail="Invalid snapshot hash")
+    path = _snapshot_path(snapshot_hash)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    with np.load(path) as stored:
+        index = pd.DatetimeIndex(stored["__index__"].view("datetime64[ns]"), name="Date")
+        return pd.DataFrame({name: stored[name] for name in stored.files if name != "__index__"}, index=index)
@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core import metrics
+from app.core.config import settings
+from app.services import governor
+
+# Modules imported once in the fork server so every worker starts warm
+PRELOAD_MODULES = [
+    "numpy",
+    "sklearn.linear_model",
+    "sklearn.neighbors",
+    "sklearn.ensemble",
+    "xgboost",
+]
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_tier_slots: Dict[str, threading.BoundedSemaphore] = {}
+_waiting = 0
+_waiting_lock = threading.Lock()
+
+def _preload() -> None:
+    governor.apply_process_limits()
+    for module in PRELOAD_MODULES:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+def _noop() -> int:
+    return os.getpid()
+
+def _fit(model: Any, x, y) -> Any:
+    model.fit(x, y)
+    return model
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the shared training pool, or None when training runs inline"""
+    global _executor
+    if settings.TRAINING_POOL_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # Workers inherit the BLAS/OpenMP caps before numpy is imported
+            governor.set_thread_env()
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(PRELOAD_MODULES)
+            else:
+                context = multiprocessing.get_context("spawn")
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.TRAINING_POOL_WORKERS,
+                mp_context=context,
+                initializer=_preload
+            )
+        return _executor
+
+def start() -> None:
+    """Create the pool and pre-fork all workers so the first request does not pay for it"""
+    executor = get_executor()
+    if executor is None:
+        return
+    for future in [executor.submit(_noop) for _ in range(settings.TRAINING_POOL_WORKERS)]:
+        future.result()
+
+def shutdown() -> None:
+    """Stop the training pool"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+def _tier_slot(tier: str) -> threading.BoundedSemaphore:
+    with _waiting_lock:
+        if tier not in _tier_slots:
+            limit = settings.TRAINING_CONCURRENCY.get(tier, 1)
+            _tier_slots[tier] = threading.BoundedSemaphore(limit)
+        return _tier_slots[tier]
+
+def run(func: Callable, *args, tier: str = "free", threads: Optional[int] = None) -> Any:
+    """
+    Run func(*args) in the training pool, respecting the per tier concurrency
+    cap and the thread allocation from the governor (at most `threads` when the
+    work cannot use more). Raises 503 when the wait queue is full or the wait
+    times out.
+    """
+    global _waiting
+    with _waiting_lock:
+        if _waiting >= settings.TRAINING_MAX_QUEUE:
+            metrics.increment("training_pool", "rejected")
+            raise HTTPException(status_code=503, detail="Training capacity exhausted, please retry shortly")
+        _waiting += 1
+
+    slot = _tier_slot(tier)
+    queued_at = time.monotonic()
+    try:
+        acquired = slot.acquire(timeout=settings.TRAINING_QUEUE_TIMEOUT)
+    finally:
+        with _waiting_lock:
+            _waiting -= 1
+    if not acquired:
+        metrics.increment("training_pool", "timeouts")
+        raise HTTPException(status_code=503, detail="Timed out waiting for training capacity, please retry shortly")
+
+    metrics.observe("training_pool", f"{tier}_queue_wait_seconds", time.monotonic() - queued_at)
+    threads = governor.acquire_threads(tier, limit=threads)
+    started = time.monotonic()
+    try:
+        executor = get_executor()
+        if executor is None:
+            return governor.run_with_threads(threads, func, *args)
+        return executor.submit(governor.run_with_threads, threads, func, *args).result()
+    finally:
+        governor.release_threads(threads)
+        slot.release()
+        metrics.observe("training_pool", f"{tier}_compute_seconds", time.monotonic() - started)
+
+def fit(model: Any, x, y, tier: str = "free", threads: Optional[int] = None) -> Any:
+    """Fit model in a pool worker and return the fitted copy"""
+    return run(_fit, model, x, y, tier=tier, threads=threads)
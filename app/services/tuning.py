@@ -0,0 +1,170 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.models.tuning import ModelTuning
+from app.services import model_registry, training_pool
+from app.services.prediction import build_model
+
+model_selection = lazy_import("sklearn.model_selection")
+preprocessing = lazy_import("sklearn.preprocessing")
+sklearn_metrics = lazy_import("sklearn.metrics")
+
+# Search spaces per model (constructor kwargs)
+PARAM_SPACES = {name: model_registry.get(name)["param_space"] for name in model_registry.tunable_models()}
+
+HALVING_FACTOR = 3
+CV_SPLITS = 3
+
+def _evaluate(model_name: str, params: Dict, x: np.ndarray, y: np.ndarray, n_splits: int) -> float:
+    # Runs in a training pool worker: mean MAE over chronological CV folds
+    errors = []
+    for train_index, test_index in model_selection.TimeSeriesSplit(n_splits=n_splits).split(x):
+        scaler = preprocessing.StandardScaler().fit(x[train_index])
+        model = build_model(model_name, params)
+        model.fit(scaler.transform(x[train_index]), y[train_index])
+        preds = model.predict(scaler.transform(x[test_index]))
+        errors.append(sklearn_metrics.mean_absolute_error(y[test_index], preds))
+    return float(np.mean(errors))
+
+def successive_halving(
+    x: np.ndarray,
+    y: np.ndarray,
+    model_name: str,
+    n_candidates: int,
+    time_budget: float,
+    tier: str = "free",
+    random_state: int = 7
+) -> Dict:
+    """
+    Successive halving over PARAM_SPACES[model_name]: every round scores the
+    surviving candidates with time-series CV on the most recent rows, then keeps
+    the best 1/HALVING_FACTOR and grows the rows used by HALVING_FACTOR.
+    """
+    space = PARAM_SPACES[model_name]
+    total = int(np.prod([len(v) for v in space.values()]))
+    candidates = list(model_selection.ParameterSampler(space, n_iter=min(n_candidates, total), random_state=random_state))
+
+    n_rounds = max(1, int(np.ceil(np.log(len(candidates)) / np.log(HALVING_FACTOR))) + 1) if len(candidates) > 1 else 1
+    min_rows = (CV_SPLITS + 1) * 10
+    resources = len(x)
+    started = time.monotonic()
+    rounds = []
+    evaluated = 0
+    scores: List[Tuple[float, Dict]] = []
+
+    max_workers = max(1, settings.TRAINING_CONCURRENCY.get(tier, 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for round_index in range(n_rounds):
+            # Later rounds see more (and always the most recent) rows
+            rows = max(min_rows, int(resources / HALVING_FACTOR ** (n_rounds - 1 - round_index)))
+            rows = min(rows, resources)
+            x_round, y_round = x[-rows:], y[-rows:]
+
+            futures = [
+                executor.submit(
+                    training_pool.run, _evaluate, model_name, params, x_round, y_round, CV_SPLITS,
+                    tier=tier, threads=model_registry.get(model_name)["threads"]
+                )
+                for params in candidates
+            ]
+            scores = []
+            for params, future in zip(candidates, futures):
+                try:
+                    scores.append((future.result(), params))
+                except HTTPException:
+                    raise
+                except Exception:
+                    # Invalid parameter combinations simply drop out
+                    continue
+            evaluated += len(candidates)
+            if not scores:
+                raise HTTPException(status_code=500, detail="No tuning candidate could be evaluated")
+
+            scores.sort(key=lambda item: item[0])
+            rounds.append({"round": round_index, "rows": rows, "candidates": len(candidates), "best_mae": scores[0][0]})
+
+            keep = max(1, len(scores) // HALVING_FACTOR)
+            candidates = [params for _, params in scores[:keep]]
+            if len(candidates) == 1 or time.monotonic() - started > time_budget:
+                break
+
+    best_score, best_params = scores[0]
+    metrics.observe("tuning", "search_seconds", time.monotonic() - started)
+    return {
+        "best_params": best_params,
+        "best_mae": best_score,
+        "candidates_evaluated": evaluated,
+        "rounds": rounds,
+        "elapsed_seconds": time.monotonic() - started
+    }
+
+def save_best_params(
+    db: Session,
+    symbol: str,
+    model_name: str,
+    params: Dict,
+    score: float,
+    feature_set: str,
+    candidates_evaluated: int
+) -> ModelTuning:
+    """Insert or update the tuned configuration for (symbol, model_name, feature_set)"""
+    symbol = symbol.upper()
+    tuning = (
+        db.query(ModelTuning)
+        .filter(
+            ModelTuning.symbol == symbol,
+            ModelTuning.model_name == model_name,
+            ModelTuning.feature_set == feature_set
+        )
+        .first()
+    )
+    if tuning is None:
+        tuning = ModelTuning(symbol=symbol, model_name=model_name, feature_set=feature_set)
+        db.add(tuning)
+    tuning.params_json = json.dumps(params)
+    tuning.score = score
+    tuning.candidates_evaluated = candidates_evaluated
+    tuning.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(tuning)
+    return tuning
+
+def load_tuned_params(
+    db: Session,
+    symbols: Iterable[str],
+    model_names: Iterable[str],
+    feature_sets: Iterable[str]
+) -> Dict[Tuple[str, str, str], Dict]:
+    """
+    Tuned params for every (symbol, model, feature set) combination in one query,
+    keyed by (SYMBOL, model_name, feature_set). Params tuned on one feature set
+    are never used for another.
+    """
+    symbols = {symbol.upper() for symbol in symbols}
+    model_names = set(model_names)
+    feature_sets = set(feature_sets)
+    if not symbols or not model_names or not feature_sets:
+        return {}
+    rows = (
+        db.query(ModelTuning.symbol, ModelTuning.model_name, ModelTuning.feature_set, ModelTuning.params_json)
+        .filter(
+            ModelTuning.symbol.in_(symbols),
+            ModelTuning.model_name.in_(model_names),
+            ModelTuning.feature_set.in_(feature_sets)
+        )
+        .all()
+    )
+    return {
+        (symbol, model_name, feature_set): json.loads(params_json)
+        for symbol, model_name, feature_set, params_json in rows
+    }
@@ -205,6 +205,21 @@ def get_technical_indicators(symbol, indicator, days=60):
         st.error(f"Error fetching indicators: {str(e)}")
         return None
 
+def get_available_models():
+    try:
+        response = requests.get(
+            f"{API_URL}/predictions/models",
+            headers={"Authorization": f"Bearer {st.session_state.token}"}
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Error fetching models: {response.json().get('detail', 'Unknown error')}")
+            return None
+    except Exception as e:
+        st.error(f"Error fetching models: {str(e)}")
+        return None
+
 def predict_stock_price(symbol, model_name, days_forecast, training_days):
     try:
         response = requests.post(
@@ -380,7 +395,7 @@ def news_sentiment_tab():
     st.markdown("<h2 class='sub-header'>Market News & Sentiment Analysis</h2>", unsafe_allow_html=True)
     
     # Choose between market news and stock-specific news
-    news_type = st.radio("Select news type", ["Market News", "Stock News"])
+    news_type = st.radio("Select news type", ["Market News", "Stock News", "Watchlist"])
     
     if news_type == "Market News":
         # Get market news
@@ -491,6 +506,42 @@ def news_sentiment_tab():
                     st.error(f"Error fetching market news: {response.text}")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
+    elif news_type == "Watchlist":
+        # Sentiment and prediction confidence for every saved stock in one request
+        saved_stocks = get_saved_stocks()
+        default_symbols = ", ".join(stock["symbol"] for stock in saved_stocks) or "AAPL, MSFT, GOOGL"
+        symbols_text = st.text_input("Symbols (comma separated)", value=default_symbols)
+        
+        if st.button("Get Watchlist Sentiment"):
+            symbols = [s.strip().upper() for s in symbols_text.split(",") if s.strip()]
+            with st.spinner(f"Analyzing {len(symbols)} symbols..."):
+                try:
+                    response = requests.post(
+                        f"{API_URL}/sentiment/batch",
+                        json={"symbols": symbols},
+                        headers={"Authorization": f"Bearer {st.session_state.token}"},
+                        timeout=60
+                    )
+                    
+                    if response.status_code == 200:
+                        rows = []
+                        for item in response.json():
+                            data = item.get("data") or {}
+                            confidence = data.get("confidence") or {}
+                            rows.append({
+                                "Symbol": item["symbol"],
+                                "Sentiment": data.get("overall_sentiment", "").title() if item["status"] == "ok" else "Error",
+                                "Polarity": data.get("average_polarity"),
+                                "Positive": data.get("sentiment_distribution", {}).get("positive"),
+                                "Negative": data.get("sentiment_distribution", {}).get("negative"),
+                                "Prediction Confidence": confidence.get("confidence_score"),
+                                "Note": item.get("error") or ""
+                            })
+                        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+                    else:
+                        st.error(f"Error fetching watchlist sentiment: {response.text}")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
     else:
         # Stock-specific news
         symbol = st.text_input("Enter Stock Symbol for News", value="AAPL").upper()
@@ -786,24 +837,10 @@ def stock_analysis_tab():
 def predictions_tab():
     st.markdown("<h2 class='sub-header'>Stock Price Predictions</h2>", unsafe_allow_html=True)
     
-    # Get user's subscription tier to determine available models
-    user_tier = st.session_state.user.get("subscription_tier", "free")
-    
-    # Define available models based on tier
-    model_options = {
-        "free": ["LinearRegression"],
-        "basic": ["LinearRegression", "RandomForestRegressor"],
-        "pro": ["LinearRegression", "RandomForestRegressor", "KNeighborsRegressor", "ExtraTreesRegressor"],
-        "enterprise": ["LinearRegression", "RandomForestRegressor", "KNeighborsRegressor", "ExtraTreesRegressor", "XGBRegressor"]
-    }
-    
-    # Define max forecast days based on tier
-    max_days = {
-        "free": 7,
-        "basic": 14,
-        "pro": 30,
-        "enterprise": 60
-    }
+    # Models and forecast limit for the user's subscription tier, from the API's model registry
+    model_info = get_available_models() or {}
+    available_models = [m["name"] for m in model_info.get("models", []) if m["available"]] or ["LinearRegression"]
+    max_days = model_info.get("max_days_forecast", 7)
     
     col1, col2 = st.columns([3, 1])
     
@@ -811,13 +848,12 @@ def predictions_tab():
         symbol = st.text_input("Enter Stock Symbol for Prediction", value="AAPL").upper()
     
     with col2:
-        available_models = model_options.get(user_tier, ["LinearRegression"])
         model = st.selectbox("Select Prediction Model", available_models)
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        days_forecast = st.slider("Forecast Days", min_value=1, max_value=max_days.get(user_tier, 7), value=5)
+        days_forecast = st.slider("Forecast Days", min_value=1, max_value=max_days, value=5)
     
     with col2:
         training_days = st.slider("Training Period (days)", min_value=30, max_value=365, value=100)
@@ -0,0 +1,34 @@
+"""
+Standalone prediction job worker.
+
+Run with `python -m app.worker` next to API replicas started with
+JOB_BACKEND=redis and JOB_WORKERS=0 to scale training independently.
+"""
+import argparse
+import signal
+import threading
+
+from app.core.config import settings
+from app.services import jobs
+
+def main():
+    parser = argparse.ArgumentParser(description="Run prediction job workers")
+    parser.add_argument("--threads", type=int, default=max(settings.JOB_WORKERS, 1),
+                        help="Number of worker threads in this process")
+    args = parser.parse_args()
+
+    if settings.JOB_BACKEND != "redis" or not settings.REDIS_URL:
+        parser.error("Standalone workers need JOB_BACKEND=redis and REDIS_URL")
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+
+    print(f"Starting {args.threads} prediction worker thread(s)...")
+    jobs.start_workers(args.threads)
+    stopped.wait()
+    print("Stopping prediction workers...")
+    jobs.stop_workers()
+
+if __name__ == "__main__":
+    main()
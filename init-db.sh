@@ -26,8 +26,12 @@ echo "PostgreSQL is available!"
 echo "Creating database tables..."
 python <<EOF
 from app.db.database import Base, engine
-from app.models.user import User, ApiKey, SavedStock, PredictionHistory, UserSubscription
+from app.models.user import User, ApiKey, SavedStock, PredictionHistory, PredictionResult, UserSubscription
 from app.models.portfolio import Portfolio, PortfolioStock
+from app.models.tuning import ModelTuning
+from app.models.precomputed import PrecomputedForecast
+from app.models.accuracy import ForecastAccuracy
+from app.models.sentiment import HeadlineSentiment
 from app.models.alerts import PriceAlert
 import sqlalchemy as sa
 
@@ -50,6 +54,29 @@ try:
             print("Adding created_at column to users table")
             conn.execute(sa.text("ALTER TABLE users ADD COLUMN created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP"))
             
+        # Columns linking prediction history rows to shared prediction results
+        history_columns = [col['name'] for col in inspector.get_columns('prediction_history')]
+        if 'request_key' not in history_columns:
+            print("Adding request_key column to prediction_history table")
+            conn.execute(sa.text("ALTER TABLE prediction_history ADD COLUMN request_key VARCHAR"))
+            conn.execute(sa.text("CREATE INDEX ix_prediction_history_request_key ON prediction_history (request_key)"))
+        if 'result_id' not in history_columns:
+            print("Adding result_id column to prediction_history table")
+            conn.execute(sa.text("ALTER TABLE prediction_history ADD COLUMN result_id INTEGER REFERENCES prediction_results(id)"))
+            conn.execute(sa.text("CREATE INDEX ix_prediction_history_result_id ON prediction_history (result_id)"))
+        if 'snapshot_hash' not in history_columns:
+            print("Adding snapshot_hash column to prediction_history table")
+            conn.execute(sa.text("ALTER TABLE prediction_history ADD COLUMN snapshot_hash VARCHAR"))
+            conn.execute(sa.text("CREATE INDEX ix_prediction_history_snapshot_hash ON prediction_history (snapshot_hash)"))
+        if 'evaluated_at' not in history_columns:
+            print("Adding evaluated_at column to prediction_history table")
+            conn.execute(sa.text("ALTER TABLE prediction_history ADD COLUMN evaluated_at TIMESTAMP"))
+            conn.execute(sa.text("CREATE INDEX ix_prediction_history_evaluated_at ON prediction_history (evaluated_at)"))
+        result_columns = [col['name'] for col in inspector.get_columns('prediction_results')]
+        if 'snapshot_hash' not in result_columns:
+            print("Adding snapshot_hash column to prediction_results table")
+            conn.execute(sa.text("ALTER TABLE prediction_results ADD COLUMN snapshot_hash VARCHAR"))
+            
         conn.commit()
 except Exception as e:
     print(f"Error during schema check: {e}")
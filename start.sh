@@ -14,6 +14,12 @@ fi
 if [ "$CONTAINER_TYPE" = "api" ]; then
     echo "Starting FastAPI backend service..."
     exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+elif [ "$CONTAINER_TYPE" = "worker" ]; then
+    echo "Starting prediction job worker..."
+    exec python -m app.worker
+elif [ "$CONTAINER_TYPE" = "precompute" ]; then
+    echo "Starting nightly forecast precompute worker..."
+    exec python -m app.precompute --daily
 elif [ "$CONTAINER_TYPE" = "streamlit" ]; then
     echo "Starting Streamlit frontend service..."
     exec streamlit run app/streamlit_app.py --server.port 8501 --server.address 0.0.0.0
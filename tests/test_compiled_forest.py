@@ -0,0 +1,66 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from app.services.compiled_forest import CompiledForest, compile_model
+
+N_FEATURES = 19
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(7)
+    x = rng.normal(size=(500, N_FEATURES))
+    y = x[:, 0] * 3 + np.sin(x[:, 1]) + rng.normal(scale=0.1, size=len(x))
+    x_new = rng.normal(size=(30, N_FEATURES))
+    return x, y, x_new
+
+MODELS = [RandomForestRegressor, ExtraTreesRegressor]
+PARAMS = [{}, {"max_depth": 8}, {"n_estimators": 300, "min_samples_leaf": 3}]
+
+@pytest.mark.parametrize("model_class", MODELS)
+@pytest.mark.parametrize("params", PARAMS)
+@pytest.mark.parametrize("multi_output", [False, True])
+def test_predict_matches_sklearn(data, model_class, params, multi_output):
+    x, y, x_new = data
+    target = np.column_stack([y, y * 2, -y]) if multi_output else y
+    model = model_class(random_state=7, **params).fit(x, target)
+    compiled = CompiledForest(model)
+
+    # Batch input
+    expected, actual = model.predict(x_new), compiled.predict(x_new)
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+    # Single row
+    expected, actual = model.predict(x_new[:1]), compiled.predict(x_new[:1])
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+@pytest.mark.parametrize("model_class", MODELS)
+def test_apply_matches_sklearn(data, model_class):
+    x, y, x_new = data
+    model = model_class(n_estimators=50, random_state=7).fit(x, y)
+    compiled = CompiledForest(model)
+
+    # Compiled node ids are global; subtracting each tree's root gives sklearn's per-tree ids
+    np.testing.assert_array_equal(compiled.apply(x_new) - compiled.roots, model.apply(x_new))
+    np.testing.assert_array_equal(compiled.apply(x_new[:1]) - compiled.roots, model.apply(x_new[:1]))
+
+@pytest.mark.parametrize("model_class", MODELS)
+def test_pickle_rebuilds_node_arrays(data, model_class):
+    x, y, x_new = data
+    compiled = CompiledForest(model_class(n_estimators=20, random_state=7).fit(x, y))
+    restored = pickle.loads(pickle.dumps(compiled))
+    np.testing.assert_array_equal(restored.predict(x_new), compiled.predict(x_new))
+
+def test_compile_model_leaves_other_models_alone(data):
+    x, y, _ = data
+    linear = LinearRegression().fit(x, y)
+    assert compile_model(linear) is linear
+    assert isinstance(compile_model(RandomForestRegressor(n_estimators=5).fit(x, y)), CompiledForest)
+    # Unfitted ensembles have no trees to compile
+    unfitted = RandomForestRegressor()
+    assert compile_model(unfitted) is unfitted
@@ -0,0 +1,95 @@
+import pytest
+from textblob import TextBlob
+
+from app.services.lexicon_sentiment import score
+
+TOLERANCE = 1e-9
+
+# Plain, modified, negated and punctuated headlines
+FIXTURE_HEADLINES = [
+    "Apple beats earnings expectations as iPhone sales surge",
+    "Tesla shares plunge after disappointing delivery numbers",
+    "Microsoft reports strong cloud growth, stock hits record high",
+    "Amazon faces antitrust lawsuit from FTC",
+    "Nvidia stock is not very good value at these levels, analysts say",
+    "Really not good: retailer warns of weak holiday season",
+    "Very very good quarter for Meta as ad revenue rebounds!",
+    "Bank stocks fall sharply amid recession fears...",
+    "Oil prices rise as OPEC+ extends output cuts",
+    "Fed holds rates steady; markets react calmly",
+    "Never a dull moment: crypto market swings wildly",
+    "Netflix subscriber growth isn't bad, but guidance disappoints",
+    "No good news for Boeing as FAA expands probe",
+    "Why this beaten-down stock could be a great buy now!!",
+    "U.S. stocks close mixed after volatile session",
+    "Is the AI boom over? Experts aren't so sure",
+    "Intel's turnaround plan: ambitious, risky and expensive",
+    "Alphabet posts solid results; cloud unit profitable for the first time",
+    "Disney shares drop as streaming losses widen",
+    "Walmart raises full-year outlook on resilient consumer spending",
+    "\"Terrible\" quarter for chipmakers - but the worst may be over",
+    "Small caps rally; Russell 2000 up 3% on the week",
+    "Coinbase stock surges 20% as bitcoin tops $60,000",
+    "Pfizer cuts costs after COVID sales collapse",
+    "The most important chart for investors right now (!)",
+    "Not bad at all: JPMorgan earnings impress",
+    "Ford recalls 500,000 vehicles over faulty brakes",
+    "Gold hits all-time high as dollar weakens",
+    "Evergrande liquidation ordered by Hong Kong court",
+    "Stocks extremely cheap? Not really, says strategist",
+]
+
+NEGATIONS = [
+    "not good",
+    "Not bad",
+    "never good results",
+    "no great quarter",
+    "not a good quarter",
+    "not very good",
+    "good, not great",
+    "not good... but improving",
+]
+
+INTENSIFIERS = [
+    "very good",
+    "very very good",
+    "extremely bad",
+    "really strong growth",
+    "very good!",
+    "good!!!",
+    "very, good",
+]
+
+EMPTY = ["", "   ", "!!!", "...", "(!)"]
+
+def _assert_matches_textblob(headlines):
+    polarity, subjectivity = score(headlines)
+    assert len(polarity) == len(subjectivity) == len(headlines)
+    for headline, p, s in zip(headlines, polarity, subjectivity):
+        expected = TextBlob(headline).sentiment
+        assert abs(expected.polarity - p) <= TOLERANCE, (headline, expected.polarity, p)
+        assert abs(expected.subjectivity - s) <= TOLERANCE, (headline, expected.subjectivity, s)
+
+@pytest.mark.parametrize("headline", FIXTURE_HEADLINES)
+def test_fixture_headline_matches_textblob(headline):
+    _assert_matches_textblob([headline])
+
+@pytest.mark.parametrize("headline", NEGATIONS)
+def test_negation_matches_textblob(headline):
+    _assert_matches_textblob([headline])
+
+@pytest.mark.parametrize("headline", INTENSIFIERS)
+def test_intensifier_matches_textblob(headline):
+    _assert_matches_textblob([headline])
+
+@pytest.mark.parametrize("headline", EMPTY)
+def test_empty_matches_textblob(headline):
+    _assert_matches_textblob([headline])
+
+def test_batch_matches_textblob():
+    # Modifiers, negations and "!" must not leak across headlines in one batch
+    _assert_matches_textblob(FIXTURE_HEADLINES + NEGATIONS + INTENSIFIERS + EMPTY)
+
+def test_empty_batch():
+    polarity, subjectivity = score([])
+    assert len(polarity) == len(subjectivity) == 0
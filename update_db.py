@@ -37,6 +37,68 @@ def update_database():
             print("Adding stripe_customer_id column to users table...")
             cursor.execute("ALTER TABLE users ADD COLUMN stripe_customer_id TEXT")
         
+        # Columns linking prediction history rows to shared prediction results
+        cursor.execute("PRAGMA table_info(prediction_history)")
+        history_columns = [info[1] for info in cursor.fetchall()]
+        
+        if "request_key" not in history_columns:
+            print("Adding request_key column to prediction_history table...")
+            cursor.execute("ALTER TABLE prediction_history ADD COLUMN request_key TEXT")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_prediction_history_request_key ON prediction_history (request_key)")
+        
+        if "result_id" not in history_columns:
+            print("Adding result_id column to prediction_history table...")
+            cursor.execute("ALTER TABLE prediction_history ADD COLUMN result_id INTEGER REFERENCES prediction_results(id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_prediction_history_result_id ON prediction_history (result_id)")
+        
+        if "snapshot_hash" not in history_columns:
+            print("Adding snapshot_hash column to prediction_history table...")
+            cursor.execute("ALTER TABLE prediction_history ADD COLUMN snapshot_hash TEXT")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_prediction_history_snapshot_hash ON prediction_history (snapshot_hash)")
+        
+        if "evaluated_at" not in history_columns:
+            print("Adding evaluated_at column to prediction_history table...")
+            cursor.execute("ALTER TABLE prediction_history ADD COLUMN evaluated_at TIMESTAMP")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_prediction_history_evaluated_at ON prediction_history (evaluated_at)")
+        
+        # prediction_results is created complete by the API when it does not exist yet
+        cursor.execute("PRAGMA table_info(prediction_results)")
+        result_columns = [info[1] for info in cursor.fetchall()]
+        
+        if result_columns and "snapshot_hash" not in result_columns:
+            print("Adding snapshot_hash column to prediction_results table...")
+            cursor.execute("ALTER TABLE prediction_results ADD COLUMN snapshot_hash TEXT")
+
+        # Tuned params are keyed by feature set; sqlite cannot alter a constraint, so rebuild the table
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'model_tuning'")
+        tuning_table = cursor.fetchone()
+        if tuning_table and "uq_model_tuning_symbol_model UNIQUE" in tuning_table[0]:
+            print("Keying model_tuning table by feature set...")
+            cursor.execute("""
+            CREATE TABLE model_tuning_new (
+                id INTEGER NOT NULL PRIMARY KEY,
+                symbol TEXT,
+                model_name TEXT,
+                params_json TEXT,
+                score REAL,
+                feature_set TEXT,
+                candidates_evaluated INTEGER,
+                created_at TIMESTAMP,
+                updated_at TIMESTAMP,
+                CONSTRAINT uq_model_tuning_symbol_model_features UNIQUE (symbol, model_name, feature_set)
+            )
+            """)
+            cursor.execute("""
+            INSERT INTO model_tuning_new
+            SELECT id, symbol, model_name, params_json, score, COALESCE(feature_set, 'close'),
+                   candidates_evaluated, created_at, updated_at
+            FROM model_tuning
+            """)
+            cursor.execute("DROP TABLE model_tuning")
+            cursor.execute("ALTER TABLE model_tuning_new RENAME TO model_tuning")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_model_tuning_id ON model_tuning (id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_model_tuning_symbol ON model_tuning (symbol)")
+
         # Create new tables for alerts
         print("Creating price_alerts table if not exists...")
         cursor.execute("""